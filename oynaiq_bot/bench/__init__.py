@@ -0,0 +1,7 @@
+"""
+Benchmarks for OynaIQ.bot.
+
+Each module is runnable on its own, e.g.
+``python -m oynaiq_bot.bench.scheduler``, and prints a short report.
+"""
+
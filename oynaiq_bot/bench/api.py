@@ -0,0 +1,83 @@
+"""
+Polling benchmark for the match API (:mod:`oynaiq_bot.runtime.api_server`).
+
+Fills the store with generated matches of one sport, starts the API on a
+local port and lets clients poll a list page the way the mini-app does:
+
+* ``cold`` – every poll finds the sport changed, so the page is rendered
+  and compressed again;
+* ``cached`` – the sport did not change and the client sends no tag; the
+  cached gzip body is sent;
+* ``revalidate`` – the client sends the tag of its copy and gets ``304``.
+
+Usage::
+
+    python -m oynaiq_bot.bench.api --matches 2000 --polls 2000 --limit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict
+
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
+from oynaiq_bot.bench.snapshots import build_matches
+from oynaiq_bot.data.matches import add_match, release_seat, take_seat
+from oynaiq_bot.runtime.api_server import build_api_app
+
+SPORT = "football"
+
+
+async def poll(args: argparse.Namespace) -> None:
+    matches = build_matches(args.matches, random.Random(args.seed))
+    for offset, match in enumerate(matches):
+        match.id += 1_000_000 + offset
+        match.sport = SPORT
+        add_match(match)
+    url_path = f"/api/sports/{SPORT}/matches?limit={args.limit}"
+
+    async with TestServer(build_api_app()) as server, ClientSession() as session:
+        url = str(server.make_url(url_path))
+        async with session.get(url) as response:
+            tag = response.headers["ETag"]
+            await response.read()
+            size = int(response.headers["Content-Length"])
+        print(
+            f"{args.matches} matches, page of {args.limit}: {size:,} bytes gzipped on the wire, "
+            f"{args.polls} polls per mode\n"
+        )
+        print(f"{'mode':<11} {'polls/s':>9} {'µs/poll':>9}")
+
+        for mode in ("cold", "cached", "revalidate"):
+            headers: Dict[str, str] = {"If-None-Match": tag} if mode == "revalidate" else {}
+            started = time.perf_counter()
+            for index in range(args.polls):
+                if mode == "cold":
+                    match = matches[index % len(matches)]
+                    take_seat(match) or release_seat(match)
+                async with session.get(url, headers=headers) as response:
+                    await response.read()
+                    if mode == "revalidate" and response.status != 304:
+                        raise AssertionError(f"expected 304, got {response.status}")
+            seconds = time.perf_counter() - started
+            print(f"{mode:<11} {args.polls / seconds:>9,.0f} {seconds / args.polls * 1e6:>9.0f}")
+            async with session.get(url) as response:
+                tag = response.headers["ETag"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=2000)
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(poll(parse_args()))
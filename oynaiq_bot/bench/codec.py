@@ -0,0 +1,121 @@
+"""
+Round-trip check and throughput benchmark for :mod:`oynaiq_bot.data.codec`.
+
+Encodes and decodes a batch of synthetic matches with
+
+* ``asdict+json`` – :func:`dataclasses.asdict` and :func:`json.dumps`,
+  decoded with :func:`json.loads` and ``Match(**...)`` (the baseline);
+* ``codec json`` – :meth:`MatchCodec.dumps` / :meth:`MatchCodec.loads`;
+* ``codec binary`` – :meth:`MatchCodec.encode_into` into one buffer and
+  :meth:`MatchCodec.iter_decode` over a :class:`memoryview` of it.
+
+Every strategy must return matches equal to the originals before it is
+timed.
+
+Usage::
+
+    python -m oynaiq_bot.bench.codec --matches 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+from zoneinfo import ZoneInfo
+
+from oynaiq_bot.bench.recommend import build_matches
+from oynaiq_bot.data.codec import MATCH_CODEC
+from oynaiq_bot.data.matches import Match, MatchStatus
+
+
+def with_start_times(matches: List[Match], rng: random.Random) -> List[Match]:
+    base = datetime(2026, 10, 19, tzinfo=ZoneInfo("Asia/Almaty"))
+    return [
+        replace(match, starts_at=base + timedelta(minutes=rng.randrange(7 * 24 * 60)))
+        if rng.random() < 0.5
+        else match
+        for match in matches
+    ]
+
+
+def baseline_encode(matches: List[Match]) -> List[str]:
+    return [json.dumps(asdict(match), ensure_ascii=False, default=str) for match in matches]
+
+
+def baseline_decode(lines: List[str]) -> List[Match]:
+    matches = []
+    for line in lines:
+        data = json.loads(line)
+        data["status"] = MatchStatus(data["status"])
+        if data["starts_at"] is not None:
+            data["starts_at"] = datetime.fromisoformat(data["starts_at"])
+        matches.append(Match(**data))
+    return matches
+
+
+def binary_encode(matches: List[Match]) -> bytearray:
+    out = bytearray()
+    for match in matches:
+        MATCH_CODEC.encode_into(out, match)
+    return out
+
+
+def timed(run: Callable[[], object]) -> Tuple[object, float]:
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    matches = with_start_times(build_matches(args.matches, 200, rng), rng)
+
+    strategies = [
+        (
+            "asdict+json",
+            lambda: baseline_encode(matches),
+            baseline_decode,
+            lambda lines: sum(len(line.encode("utf-8")) for line in lines),
+        ),
+        (
+            "codec json",
+            lambda: [MATCH_CODEC.dumps(match) for match in matches],
+            lambda lines: [MATCH_CODEC.loads(line) for line in lines],
+            lambda lines: sum(len(line.encode("utf-8")) for line in lines),
+        ),
+        (
+            "codec binary",
+            lambda: binary_encode(matches),
+            lambda buffer: list(MATCH_CODEC.iter_decode(memoryview(buffer))),
+            len,
+        ),
+    ]
+
+    print(f"{args.matches} matches, best of {args.repeat}\n")
+    print(f"{'strategy':<13} {'bytes/match':>11} {'encode/s':>11} {'decode/s':>11}")
+    for name, encode, decode, size in strategies:
+        encoded = encode()
+        assert decode(encoded) == matches, f"{name} does not round-trip"
+        encode_seconds = min(timed(encode)[1] for _ in range(args.repeat))
+        decode_seconds = min(timed(lambda: decode(encoded))[1] for _ in range(args.repeat))
+        print(
+            f"{name:<13} {size(encoded) / len(matches):>11.0f} "
+            f"{len(matches) / encode_seconds:>11,.0f} {len(matches) / decode_seconds:>11,.0f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,93 @@
+"""
+Throughput benchmark for :mod:`oynaiq_bot.utils.dates`.
+
+Generates a corpus of date phrases the way users type them (Russian and
+Kazakh days and weekdays, ``19:00`` / ``19.00`` / ``в 19`` times, random
+case and spacing, a share of invalid input) and parses it with
+
+* ``cold`` – :func:`parse_phrase` with its memo cache cleared before every
+  call, i.e. the regular expressions alone;
+* ``cached`` – :func:`parse_datetime` as the wizard calls it, where
+  repeated phrases are answered from the cache.
+
+Usage::
+
+    python -m oynaiq_bot.bench.dates --phrases 200000 --distinct 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Callable, List
+from zoneinfo import ZoneInfo
+
+from oynaiq_bot.utils.dates import DAY_OFFSETS, WEEKDAYS, parse_datetime, parse_phrase
+
+INVALID = ["когда-нибудь", "на выходных", "вечером", "не знаю", "25:00", "завтра"]
+
+
+def build_phrase(rng: random.Random) -> str:
+    if rng.random() < 0.05:
+        return rng.choice(INVALID)
+    hour, minute = rng.randrange(7, 24), rng.choice([0, 15, 30, 45])
+    time_text = rng.choice([f"{hour}:{minute:02d}", f"{hour}.{minute:02d}", f"в {hour}"])
+    day = rng.choice([*DAY_OFFSETS, *WEEKDAYS, ""])
+    if day in WEEKDAYS and rng.random() < 0.5:
+        day = f"в {day}"
+    separator = rng.choice([" ", ", ", " в ", "  "]) if day else ""
+    phrase = f"{day}{separator}{time_text}"
+    return phrase.capitalize() if rng.random() < 0.3 else phrase
+
+
+def build_corpus(phrases: int, distinct: int, rng: random.Random) -> List[str]:
+    # Popular phrases repeat: draw from a fixed vocabulary with a skew
+    vocabulary = [build_phrase(rng) for _ in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(vocabulary, weights=weights, k=phrases)
+
+
+def measure(parse: Callable[[str], object], corpus: List[str]) -> float:
+    started = time.perf_counter()
+    for phrase in corpus:
+        parse(phrase)
+    return time.perf_counter() - started
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    corpus = build_corpus(args.phrases, args.distinct, rng)
+    now = datetime.now(ZoneInfo(args.timezone))
+
+    def cold(phrase: str) -> object:
+        parse_phrase.cache_clear()
+        return parse_phrase(" ".join(phrase.split()))
+
+    parse_phrase.cache_clear()
+    parsed = sum(parse_datetime(phrase, now) is not None for phrase in corpus)
+    print(
+        f"{args.phrases} phrases, {len(set(corpus))} distinct, "
+        f"{parsed / len(corpus):.1%} parsed to a future time\n"
+    )
+    print(f"{'mode':<8} {'phrases/s':>12} {'µs/phrase':>10}")
+    runs = [("cold", cold), ("cached", lambda phrase: parse_datetime(phrase, now))]
+    for name, parse in runs:
+        parse_phrase.cache_clear()
+        seconds = measure(parse, corpus)
+        print(f"{name:<8} {len(corpus) / seconds:>12,.0f} {seconds / len(corpus) * 1e6:>10.2f}")
+    print(f"\ncache: {parse_phrase.cache_info()}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--phrases", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=2000)
+    parser.add_argument("--timezone", default="Asia/Almaty")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
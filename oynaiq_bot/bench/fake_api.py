@@ -0,0 +1,370 @@
+"""
+Local stand-in for the Telegram Bot API used by load tests.
+
+:class:`FakeBotAPI` serves the subset of methods the bot relies on
+(``getMe``, ``getUpdates``, ``sendMessage``, ``editMessageText``,
+``answerCallbackQuery``; any other method answers ``true``) and lets a
+test play the user's side: :meth:`FakeBotAPI.send_text` and
+:meth:`FakeBotAPI.press_button` enqueue updates for ``getUpdates``, and
+every call the bot makes for a chat lands in that chat's inbox.
+
+Every method except ``getUpdates`` can be slowed down by a fixed latency
+plus random jitter and can fail with ``429 Too Many Requests`` at a given
+rate, like the real API under flood control.
+
+The server can also run on its own, so the real bot can be pointed at it
+with ``TELEGRAM_API_URL``::
+
+    python -m oynaiq_bot.bench.fake_api --port 8081 --latency-ms 30
+
+In that mode updates are injected with ``POST /fake/updates`` (a JSON
+update or a list of them, ``update_id`` is assigned by the server).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from aiohttp import web
+
+
+logger = logging.getLogger(__name__)
+
+BOT_USER = {"id": 42, "is_bot": True, "first_name": "OynaIQ", "username": "oynaiq_fake_bot"}
+
+# Methods whose result is the sent or edited message
+MESSAGE_METHODS = frozenset({"sendMessage", "editMessageText", "sendDocument", "sendPhoto"})
+
+
+class ApiCall(NamedTuple):
+    """
+    A Bot API call made by the bot.
+
+    Attributes:
+        method: Bot API method name.
+        params: Request parameters as sent by the bot (strings).
+        at: :func:`time.perf_counter` value when the call was received.
+        throttled: ``True`` if the call was rejected with ``429``.
+    """
+
+    method: str
+    params: Dict[str, str]
+    at: float
+    throttled: bool = False
+
+
+class FakeBotAPI:
+    """
+    In-process fake Bot API server.
+
+    Args:
+        latency: Base delay of every method call in seconds.
+        jitter: Extra random delay, uniformly from ``0`` to ``jitter`` seconds.
+        throttle_rate: Fraction of calls (``0``–``1``) rejected with ``429``.
+        retry_after: ``retry_after`` value reported in ``429`` responses.
+        seed: Seed for latency and throttling randomness.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.calls: Counter[str] = Counter()
+        self.throttled: Counter[str] = Counter()
+
+        self._random = random.Random(seed)
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+        self._updates: Deque[Dict[str, Any]] = deque()
+        self._last_pushed = 0
+        self._last_fetched = 0
+        self._new_updates = asyncio.Event()
+        self._inboxes: Dict[int, "asyncio.Queue[ApiCall]"] = {}
+        self._callback_chats: Dict[str, int] = {}
+        self._last_message: Dict[int, int] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    # User side -----------------------------------------------------------------
+
+    def push_update(self, update: Dict[str, Any]) -> int:
+        """
+        Queue an update for ``getUpdates``.
+
+        Args:
+            update: Update payload; its ``update_id`` is replaced so ids
+                stay increasing.
+
+        Returns:
+            Assigned ``update_id``.
+        """
+
+        update_id = self._last_pushed = next(self._update_ids)
+        self._updates.append({**update, "update_id": update_id})
+        callback = update.get("callback_query")
+        if callback and callback.get("message"):
+            self._callback_chats[callback["id"]] = callback["message"]["chat"]["id"]
+        self._new_updates.set()
+        return update_id
+
+    def send_text(self, chat_id: int, text: str) -> int:
+        """
+        Emulate a user sending a text message in a private chat.
+
+        Returns:
+            Assigned ``update_id``.
+        """
+
+        return self.push_update(
+            {
+                "message": {
+                    "message_id": next(self._message_ids),
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": _user(chat_id),
+                    "text": text,
+                }
+            }
+        )
+
+    def press_button(self, chat_id: int, data: str) -> str:
+        """
+        Emulate a tap on an inline button of the last bot message in a chat.
+
+        Returns:
+            Callback query id; the bot's ``answerCallbackQuery`` carries it.
+        """
+
+        callback_id = str(next(self._callback_ids))
+        self.push_update(
+            {
+                "callback_query": {
+                    "id": callback_id,
+                    "chat_instance": str(chat_id),
+                    "from": _user(chat_id),
+                    "data": data,
+                    "message": {
+                        "message_id": self._last_message.get(chat_id, 1),
+                        "date": int(time.time()),
+                        "chat": {"id": chat_id, "type": "private"},
+                        "from": BOT_USER,
+                        "text": "…",
+                    },
+                }
+            }
+        )
+        return callback_id
+
+    @property
+    def undelivered(self) -> int:
+        """
+        Number of pushed updates not yet returned by ``getUpdates``.
+        """
+
+        return self._last_pushed - self._last_fetched
+
+    def inbox(self, chat_id: int) -> "asyncio.Queue[ApiCall]":
+        """
+        Return the queue receiving every call the bot makes for ``chat_id``.
+
+        Calls are only collected after the inbox was requested.
+        """
+
+        queue = self._inboxes.get(chat_id)
+        if queue is None:
+            queue = self._inboxes[chat_id] = asyncio.Queue()
+        return queue
+
+    def close_inbox(self, chat_id: int) -> None:
+        """
+        Stop collecting calls for ``chat_id``.
+        """
+
+        self._inboxes.pop(chat_id, None)
+        self._last_message.pop(chat_id, None)
+
+    # Server side ---------------------------------------------------------------
+
+    def build_app(self) -> web.Application:
+        """
+        Create the aiohttp application serving ``/bot<token>/<method>``.
+        """
+
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_route("*", "/bot{token}/{method}", self._handle)
+        app.router.add_post("/fake/updates", self._handle_push)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving; ``port=0`` picks a free port.
+
+        Returns:
+            Base URL to use as ``TELEGRAM_API_URL``.
+        """
+
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        return f"http://{bound_host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """
+        Stop the server started with :meth:`start`.
+        """
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_push(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        updates = payload if isinstance(payload, list) else [payload]
+        ids = [self.push_update(update) for update in updates]
+        return web.json_response({"ok": True, "result": ids})
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        form = await request.post()
+        params: Dict[str, str] = {**request.query, **form}  # type: ignore[dict-item]
+        self.calls[method] += 1
+
+        if method == "getUpdates":
+            return _ok(await self._get_updates(params))
+        if method == "getMe":
+            return _ok(BOT_USER)
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        chat_id = self._chat_of(params)
+        if self.throttle_rate and self._random.random() < self.throttle_rate:
+            self.throttled[method] += 1
+            self._deliver(chat_id, ApiCall(method, params, time.perf_counter(), throttled=True))
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+
+        self._deliver(chat_id, ApiCall(method, params, time.perf_counter()))
+        if method not in MESSAGE_METHODS or chat_id is None:
+            return _ok(True)
+
+        if method == "editMessageText":
+            message_id = int(params.get("message_id") or 0)
+        else:
+            message_id = next(self._message_ids)
+            self._last_message[chat_id] = message_id
+        return _ok(
+            {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        )
+
+    async def _get_updates(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = float(params.get("timeout") or 0)
+
+        updates = self._updates
+        while updates and updates[0]["update_id"] < offset:
+            updates.popleft()
+        if not updates and timeout > 0:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        batch = list(itertools.islice(updates, limit))
+        if batch:
+            self._last_fetched = max(self._last_fetched, batch[-1]["update_id"])
+        return batch
+
+    def _chat_of(self, params: Dict[str, str]) -> Optional[int]:
+        chat_id = params.get("chat_id")
+        if chat_id is not None:
+            try:
+                return int(chat_id)
+            except ValueError:
+                return None
+        return self._callback_chats.pop(params.get("callback_query_id", ""), None)
+
+    def _deliver(self, chat_id: Optional[int], call: ApiCall) -> None:
+        if chat_id is None:
+            return
+        queue = self._inboxes.get(chat_id)
+        if queue is not None:
+            queue.put_nowait(call)
+
+
+def _user(user_id: int) -> Dict[str, Any]:
+    return {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "language_code": "ru"}
+
+
+def _ok(result: Any) -> web.Response:
+    return web.Response(
+        text=json.dumps({"ok": True, "result": result}, ensure_ascii=False),
+        content_type="application/json",
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    api = FakeBotAPI(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        throttle_rate=args.throttle,
+        retry_after=args.retry_after,
+    )
+    url = await api.start(args.host, args.port)
+    print(f"Fake Bot API listening on {url} (set TELEGRAM_API_URL={url})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--throttle", type=float, default=0.0, help="fraction of calls to 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
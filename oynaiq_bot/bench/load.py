@@ -0,0 +1,347 @@
+"""
+End-to-end load test of the bot against a local fake Bot API.
+
+Starts :class:`~oynaiq_bot.bench.fake_api.FakeBotAPI` in-process and runs
+the real bot on top of it: the dispatcher from
+:func:`oynaiq_bot.main.build_dispatcher`, the tuned HTTP session, long
+polling and :class:`~oynaiq_bot.runtime.scheduler.UpdateScheduler`. Then
+thousands of virtual users walk the real flows:
+
+* ``browse`` – ``/start`` → «Найти команду» → sport → match details;
+* ``book`` – the same, then deposit → «Я оплатил через Kaspi».
+
+A step's latency is measured from the moment the update is queued for
+``getUpdates`` until the bot makes the call that completes the step
+(``sendMessage`` for text messages, ``answerCallbackQuery`` for buttons,
+the confirmation message for payment). The report shows throughput and
+p50/p95/p99 latency per step and per flow; steps that got a ``429`` or
+never completed are counted as failed.
+
+Usage::
+
+    python -m oynaiq_bot.bench.load --users 2000 --concurrency 300 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from aiogram import Bot
+
+from oynaiq_bot.bench.fake_api import ApiCall, FakeBotAPI
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.matches import MOCK_MATCHES, Match
+from oynaiq_bot.main import build_dispatcher
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.scheduler import UpdateScheduler, poll_updates
+from oynaiq_bot.runtime.session import build_session
+from oynaiq_bot.utils.navigator import (
+    BookingCallback,
+    MatchCallback,
+    PaymentCallback,
+    SportCallback,
+)
+
+
+FIND_TEAM_BUTTON = "🧑‍🤝‍🧑 Найти команду"
+FIRST_CHAT_ID = 1_000_000
+
+Done = Callable[[ApiCall], bool]
+
+
+@dataclass
+class Step:
+    """
+    One user action and the bot call that completes it.
+
+    Attributes:
+        name: Step name used in the report.
+        send: Pushes the update into the fake API, returns the callback
+            query id for button taps.
+        done: Builds the completion predicate from the callback query id.
+    """
+
+    name: str
+    send: Callable[[FakeBotAPI, int], Optional[str]]
+    done: Callable[[int, Optional[str]], Done]
+
+
+def _text(text: str) -> Callable[[FakeBotAPI, int], Optional[str]]:
+    def send(api: FakeBotAPI, chat_id: int) -> Optional[str]:
+        api.send_text(chat_id, text)
+        return None
+
+    return send
+
+
+def _button(data: str) -> Callable[[FakeBotAPI, int], Optional[str]]:
+    return lambda api, chat_id: api.press_button(chat_id, data)
+
+
+def _message_sent(chat_id: int, _: Optional[str]) -> Done:
+    return lambda call: call.method == "sendMessage"
+
+
+def _callback_answered(_: int, callback_id: Optional[str]) -> Done:
+    return lambda call: (
+        call.method == "answerCallbackQuery"
+        and call.params.get("callback_query_id") == callback_id
+    )
+
+
+def build_flow(match: Match, book: bool) -> List[Step]:
+    """
+    Build the steps of one user session for ``match``.
+    """
+
+    steps = [
+        Step("start", _text("/start"), _message_sent),
+        Step("find_team", _text(FIND_TEAM_BUTTON), _message_sent),
+        Step("sport", _button(SportCallback(sport=match.sport).pack()), _callback_answered),
+        Step("match", _button(MatchCallback(match_id=match.id).pack()), _callback_answered),
+    ]
+    if book:
+        deposit = BookingCallback(match_id=match.id, action="deposit").pack()
+        pay = PaymentCallback(match_id=match.id, action="pay").pack()
+        steps += [
+            Step("deposit", _button(deposit), _callback_answered),
+            # The confirmation message follows the payment callback answer
+            Step("payment", _button(pay), _message_sent),
+        ]
+    return steps
+
+
+@dataclass
+class Stats:
+    """
+    Latency samples and failures keyed by step or flow name.
+    """
+
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    failed: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str, seconds: Optional[float]) -> None:
+        if seconds is None:
+            self.failed[name] = self.failed.get(name, 0) + 1
+        else:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def rows(self, names: Sequence[str], elapsed: float) -> List[str]:
+        lines = [
+            f"{'':<10} {'ok':>7} {'failed':>7} {'per s':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        ]
+        for name in names:
+            values = sorted(self.samples.get(name, []))
+            p50, p95, p99 = (percentile(values, q) * 1000 for q in (0.5, 0.95, 0.99))
+            lines.append(
+                f"{name:<10} {len(values):>7} {self.failed.get(name, 0):>7} "
+                f"{len(values) / elapsed:>8.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+            )
+        return lines
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of sorted ``values`` (``0`` for no values).
+    """
+
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))]
+
+
+async def wait_for_call(inbox: "asyncio.Queue[ApiCall]", done: Done) -> bool:
+    """
+    Consume calls from ``inbox`` until one satisfies ``done``.
+
+    Returns:
+        ``True`` when completed, ``False`` when a call was throttled (the
+        handler was aborted, so the completing call will never come).
+    """
+
+    while True:
+        call = await inbox.get()
+        if call.throttled:
+            return False
+        if done(call):
+            return True
+
+
+async def run_user(
+    api: FakeBotAPI,
+    chat_id: int,
+    flow_name: str,
+    steps: List[Step],
+    stats: Stats,
+    think: float,
+    step_timeout: float,
+) -> None:
+    inbox = api.inbox(chat_id)
+    flow_started = time.perf_counter()
+    try:
+        for step in steps:
+            started = time.perf_counter()
+            callback_id = step.send(api, chat_id)
+            try:
+                completed = await asyncio.wait_for(
+                    wait_for_call(inbox, step.done(chat_id, callback_id)), step_timeout
+                )
+            except asyncio.TimeoutError:
+                completed = False
+            stats.add(step.name, time.perf_counter() - started if completed else None)
+            if not completed:
+                stats.add(flow_name, None)
+                return
+            if think:
+                await asyncio.sleep(think * random.uniform(0.5, 1.5))
+        stats.add(flow_name, time.perf_counter() - flow_started)
+    finally:
+        api.close_inbox(chat_id)
+
+
+@asynccontextmanager
+async def running_bot(
+    api_url: str,
+    workers: int,
+    pending: int,
+    pool: int,
+    record_dir: Optional[str] = None,
+) -> AsyncIterator[UpdateScheduler]:
+    """
+    Run the real bot (dispatcher, session, polling, scheduler) against ``api_url``.
+
+    On exit polling stops, accepted updates are processed to the end,
+    flush hooks run and the session is closed. With ``record_dir`` the
+    update recorder is enabled, e.g. to produce input for
+    :mod:`oynaiq_bot.bench.replay`. Journals and idempotency keys are kept
+    in a temporary directory removed on exit, so runs do not share state.
+
+    Yields:
+        The running :class:`UpdateScheduler`.
+    """
+
+    with tempfile.TemporaryDirectory(prefix="oynaiq-bench-") as state_dir:
+        settings = Settings(
+            bot_token="42:LOADTEST",
+            api_base_url=api_url,
+            http_pool_limit=pool,
+            polling_timeout=1,
+            max_concurrent_updates=workers,
+            max_pending_updates=pending,
+            metrics_port=0,
+            record_dir=record_dir,
+            state_dir=state_dir,
+            payments_stub=True,
+        )
+        bot = Bot(token=settings.bot_token, session=build_session(settings), parse_mode="HTML")
+        dp = build_dispatcher(settings)
+        scheduler = UpdateScheduler(
+            dp,
+            bot,
+            max_workers=settings.max_concurrent_updates,
+            max_pending=settings.max_pending_updates,
+        )
+        await dp.emit_startup(bot=bot, **scheduler.workflow_data)
+        scheduler.start()
+        stop = asyncio.Event()
+        poller = asyncio.create_task(
+            poll_updates(bot, scheduler, stop, polling_timeout=settings.polling_timeout)
+        )
+        try:
+            yield scheduler
+        finally:
+            stop.set()
+            await poller
+            await scheduler.join()
+            await scheduler.stop()
+            await dp.emit_shutdown(bot=bot, **scheduler.workflow_data)
+            await SHUTDOWN_HOOKS.flush(settings.shutdown_timeout)
+            await bot.session.close()
+
+
+async def main(args: argparse.Namespace) -> None:
+    api = FakeBotAPI(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        throttle_rate=args.throttle,
+        seed=args.seed,
+    )
+    url = await api.start()
+
+    rng = random.Random(args.seed)
+    bookable = [m for m in MOCK_MATCHES if m.deposit > 0]
+    stats = Stats()
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def user(idx: int) -> None:
+        book = rng.random() < args.book_ratio
+        match = rng.choice(bookable if book else MOCK_MATCHES)
+        flow = "book" if book else "browse"
+        async with slots:
+            await run_user(
+                api,
+                FIRST_CHAT_ID + idx,
+                flow,
+                build_flow(match, book),
+                stats,
+                think=args.think_ms / 1000,
+                step_timeout=args.step_timeout,
+            )
+
+    print(
+        f"{args.users} users, {args.concurrency} concurrent, "
+        f"{args.book_ratio:.0%} booking; fake API latency {args.latency_ms:g}"
+        f"+{args.jitter_ms:g} ms, 429 rate {args.throttle:.1%}\n"
+    )
+    async with running_bot(url, args.workers, args.pending, args.pool, args.record_dir):
+        started = time.perf_counter()
+        await asyncio.gather(*(user(idx) for idx in range(args.users)))
+        elapsed = time.perf_counter() - started
+    await api.stop()
+
+    step_names = ("start", "find_team", "sport", "match", "deposit", "payment")
+    steps = sum(len(stats.samples.get(name, [])) for name in step_names)
+    print("\n".join(stats.rows(step_names, elapsed)))
+    print()
+    print("\n".join(stats.rows(("browse", "book"), elapsed)))
+    print(f"\n{steps} steps in {elapsed:.1f} s: {steps / elapsed:.0f} updates/s")
+    print("API calls: " + ", ".join(f"{m}={n}" for m, n in sorted(api.calls.items())))
+    if api.throttled:
+        print("429 sent: " + ", ".join(f"{m}={n}" for m, n in sorted(api.throttled.items())))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=300, help="users active at once")
+    parser.add_argument("--book-ratio", type=float, default=0.3, help="share of booking flows")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between steps")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake API latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--throttle", type=float, default=0.0, help="fraction of calls to 429")
+    parser.add_argument("--step-timeout", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--pending", type=int, default=1000)
+    parser.add_argument("--pool", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record-dir", help="record the generated updates for replay")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log handler errors")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    _args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if not _args.verbose:
+        # 429s abort handlers on purpose; their tracebacks are just noise here
+        logging.getLogger("oynaiq_bot.runtime.scheduler").setLevel(logging.CRITICAL)
+    asyncio.run(main(_args))
@@ -0,0 +1,150 @@
+"""
+Throughput benchmark for payment queueing and reconciliation.
+
+Two stages are measured separately:
+
+* ``enqueue`` – how many payments per second the handler path can put
+  into the fsync'ed :class:`~oynaiq_bot.payments.queue.PaymentQueue`,
+  waiting for each one to reach the disk like ``handle_payment`` does;
+* ``verify`` – how many payments per second the
+  :class:`~oynaiq_bot.payments.worker.ReconciliationWorker` settles for
+  each batch size, against the in-process stub provider or, with
+  ``--http``, the stub server from :mod:`oynaiq_bot.payments.stub_server`.
+
+Usage::
+
+    python -m oynaiq_bot.bench.payments --payments 5000 --batch-sizes 1,10,50,200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from oynaiq_bot.payments.models import Payment, PaymentState, payment_id
+from oynaiq_bot.payments.provider import (
+    HttpPaymentProvider,
+    PaymentProvider,
+    StubPaymentProvider,
+)
+from oynaiq_bot.payments.queue import PaymentQueue
+from oynaiq_bot.payments.stub_server import start_stub_server
+from oynaiq_bot.payments.worker import ReconciliationWorker
+from oynaiq_bot.runtime.metrics import MetricsRegistry
+
+
+def build_payments(count: int) -> List[Payment]:
+    now = time.time()
+    return [
+        Payment(
+            id=payment_id(user_id, 1),
+            user_id=user_id,
+            chat_id=user_id,
+            match_id=1,
+            amount=1000,
+            created=now,
+        )
+        for user_id in range(1, count + 1)
+    ]
+
+
+async def run_enqueue(path: Path, payments: List[Payment], concurrency: int) -> float:
+    """
+    Enqueue ``payments`` from ``concurrency`` concurrent "handlers".
+    """
+
+    queue = PaymentQueue()
+    queue.open(path)
+
+    async def handler(chunk: List[Payment]) -> None:
+        for payment in chunk:
+            queue.add(payment)
+            await queue.sync()
+
+    chunks = [payments[i::concurrency] for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(chunk) for chunk in chunks))
+    elapsed = time.perf_counter() - started
+    await queue.close()
+    return elapsed
+
+
+async def run_verify(
+    provider: PaymentProvider, payments: List[Payment], batch_size: int
+) -> float:
+    """
+    Settle all ``payments`` with one worker, batch by batch.
+    """
+
+    queue = PaymentQueue()
+    for payment in payments:
+        payment.next_check = 0.0
+        queue.add(payment)
+    settled = 0
+
+    async def settle(payment: Payment, state: PaymentState) -> None:
+        nonlocal settled
+        settled += 1
+
+    worker = ReconciliationWorker(
+        queue, provider, settle, batch_size=batch_size, registry=MetricsRegistry()
+    )
+    started = time.perf_counter()
+    while settled < len(payments):
+        if not await worker.run_once():
+            await asyncio.sleep(0)
+    return time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    payments = build_payments(args.payments)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed = await run_enqueue(Path(tmp) / "payments.jsonl", payments, args.concurrency)
+    print(
+        f"enqueue: {len(payments)} payments from {args.concurrency} handlers, "
+        f"{len(payments) / elapsed:.0f} payments/s (fsync'ed)\n"
+    )
+
+    runner = None
+    latency = args.latency_ms / 1000
+    if args.http:
+        ledger = StubPaymentProvider(pay_delay=0.0)
+        runner = await start_stub_server(ledger=ledger, latency=latency)
+        host, port = runner.addresses[0][:2]
+        provider: PaymentProvider = HttpPaymentProvider(f"http://{host}:{port}")
+    else:
+        provider = StubPaymentProvider(pay_delay=0.0, latency=latency)
+
+    mode = "http" if args.http else "in-process"
+    print(f"verify ({mode}, provider latency {args.latency_ms} ms)")
+    print(f"{'batch':>6} {'payments/s':>11}")
+    try:
+        for batch_size in batch_sizes:
+            elapsed = await run_verify(provider, build_payments(args.payments), batch_size)
+            print(f"{batch_size:>6} {args.payments / elapsed:>11.0f}")
+    finally:
+        await provider.close()
+        if runner is not None:
+            await runner.cleanup()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent enqueuers")
+    parser.add_argument("--batch-sizes", default="1,10,50,200")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="provider round trip")
+    parser.add_argument("--http", action="store_true", help="verify through the stub server")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,151 @@
+"""
+Latency benchmark for :class:`~oynaiq_bot.data.recommendations.Recommender`.
+
+Builds a synthetic catalog of one sport and a population of users with
+random confirmation histories, then compares two ways to get the top
+``k`` matches for a user:
+
+* ``sort`` – score every :class:`Match` object and sort the whole list;
+* ``heap`` – :meth:`Recommender.top` over precomputed feature columns.
+
+Usage::
+
+    python -m oynaiq_bot.bench.recommend --matches 5000 --k 9
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from oynaiq_bot.bench.load import percentile
+from oynaiq_bot.data.matches import Match, MatchStatus
+from oynaiq_bot.data.recommendations import (
+    DEFAULT_DEPOSIT,
+    DEFAULT_LEVEL,
+    DEPOSIT_SCALE,
+    HISTORY_CAP,
+    PREF_DEPOSIT,
+    PREF_LEVEL,
+    W_DEPOSIT,
+    W_HISTORY,
+    W_LEVEL,
+    Recommender,
+    parse_level,
+    start_hours,
+    static_score,
+)
+
+DATES = ["сегодня", "завтра", "послезавтра", "в субботу", "в воскресенье"]
+LEVELS = ["новички", "любители", "новички/любители", "продвинутые", "профи"]
+
+
+def build_matches(count: int, venues: int, rng: random.Random) -> List[Match]:
+    matches = []
+    for match_id in range(1, count + 1):
+        total = rng.choice([6, 10, 12, 14])
+        matches.append(
+            Match(
+                id=match_id,
+                sport="football",
+                title="Футбол 5×5",
+                location=f"Площадка {rng.randrange(venues)}",
+                date_human=rng.choice(DATES),
+                time_human=f"{rng.randrange(8, 23)}:{rng.choice(['00', '30'])}",
+                google_maps_url="",
+                players_current=rng.randrange(total + 1),
+                players_total=total,
+                deposit=rng.choice([0, 150, 200, 500, 1000]),
+                level=rng.choice(LEVELS),
+                organizer_username=f"org{rng.randrange(100)}",
+                rules="",
+                refund_policy="",
+                status=MatchStatus.ACTIVE,
+            )
+        )
+    return matches
+
+
+def sort_top(recommender: Recommender, user_id: int, matches: List[Match], k: int) -> List[Match]:
+    """
+    Baseline: score each match object from scratch and sort everything.
+    """
+
+    profiles = recommender.profiles
+    prefs = profiles.prefs(user_id)
+    pref_level = prefs[PREF_LEVEL] if prefs else DEFAULT_LEVEL
+    pref_deposit = prefs[PREF_DEPOSIT] if prefs else DEFAULT_DEPOSIT
+    history = profiles.history(user_id)
+
+    def score(match: Match) -> float:
+        free = max(match.players_total - match.players_current, 0)
+        value = static_score(free, start_hours(match))
+        value -= W_LEVEL * abs(parse_level(match.level) - pref_level)
+        value -= W_DEPOSIT * max(match.deposit - pref_deposit, 0) / DEPOSIT_SCALE
+        visits = history.get(profiles.venue_id(match.location), 0)
+        return value + W_HISTORY * min(visits, HISTORY_CAP) / HISTORY_CAP
+
+    return sorted(matches, key=score, reverse=True)[:k]
+
+
+def measure(run: Callable[[int], object], users: List[int]) -> List[float]:
+    samples = []
+    for user_id in users:
+        started = time.perf_counter()
+        run(user_id)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    matches = build_matches(args.matches, args.venues, rng)
+    started = time.perf_counter()
+    recommender = Recommender(matches)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    for user_id in range(args.users):
+        for match in rng.sample(matches, rng.randrange(args.history + 1)):
+            recommender.profiles.record_confirmation(user_id, match)
+    requests = [rng.randrange(args.users) for _ in range(args.requests)]
+
+    # Both strategies must agree before timing them
+    for user_id in requests[:20]:
+        heap = [m.id for m in recommender.top(user_id, "football", args.k)]
+        full = [m.id for m in sort_top(recommender, user_id, matches, args.k)]
+        assert heap == full, (user_id, heap, full)
+
+    print(
+        f"{args.matches} matches, {args.users} users, k={args.k}, "
+        f"columns built in {build_ms:.1f} ms\n"
+    )
+    print(f"{'strategy':<8} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9}")
+    runs = [
+        ("sort", lambda user_id: sort_top(recommender, user_id, matches, args.k)),
+        ("heap", lambda user_id: recommender.top(user_id, "football", args.k)),
+    ]
+    for name, run in runs:
+        samples = sorted(measure(run, requests))
+        print(
+            f"{name:<8} {statistics.fmean(samples):>9.0f} {percentile(samples, 0.5):>9.0f} "
+            f"{percentile(samples, 0.99):>9.0f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=5000)
+    parser.add_argument("--venues", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--history", type=int, default=10, help="max confirmations per user")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--k", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
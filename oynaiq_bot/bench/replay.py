@@ -0,0 +1,150 @@
+"""
+Deterministic replay of recorded updates against a fake Bot API.
+
+Reads files written by :mod:`oynaiq_bot.middlewares.recorder` and feeds
+the updates, in recorded order, into the real bot running on top of
+:class:`~oynaiq_bot.bench.fake_api.FakeBotAPI` (see
+:func:`oynaiq_bot.bench.load.running_bot`). Recorded gaps between updates
+are kept at ``--speed 1``, shrunk ten times at ``--speed 10`` and dropped
+at ``--speed max``, which turns a captured production day into a
+repeatable regression benchmark.
+
+The report shows wall time, throughput, how far processing lagged behind
+the recorded schedule, and handler latency per router and callback prefix.
+
+Usage::
+
+    python -m oynaiq_bot.bench.replay recordings/ --speed max
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from oynaiq_bot.bench.fake_api import FakeBotAPI
+from oynaiq_bot.bench.load import running_bot
+from oynaiq_bot.middlewares.recorder import FILE_PREFIX, read_recording
+from oynaiq_bot.runtime.metrics import REGISTRY
+
+
+def collect_files(paths: List[str]) -> List[Path]:
+    """
+    Expand directories into their recording files, oldest first.
+    """
+
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files += sorted(path.glob(f"{FILE_PREFIX}*.jsonl*"))
+        else:
+            files.append(path)
+    return files
+
+
+def parse_speed(value: str) -> float:
+    """
+    Parse ``--speed``: a positive factor or ``max`` (returned as ``0``).
+    """
+
+    if value == "max":
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+async def replay(
+    api: FakeBotAPI, records: List[Tuple[float, Dict[str, Any]]], speed: float
+) -> float:
+    """
+    Push records into the fake API following their timestamps.
+
+    Returns:
+        Seconds the pushing fell behind schedule at worst (event loop
+        saturation shows up here at ``1x`` and ``10x``).
+    """
+
+    if not records:
+        return 0.0
+    first = records[0][0]
+    started = time.perf_counter()
+    worst_lag = 0.0
+    for recorded_at, update in records:
+        if speed:
+            due = started + (recorded_at - first) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                worst_lag = max(worst_lag, -delay)
+        api.push_update(update)
+    return worst_lag
+
+
+async def main(args: argparse.Namespace) -> None:
+    files = collect_files(args.paths)
+    records = list(read_recording(files))
+    if not records:
+        print("No recorded updates found")
+        return
+
+    api = FakeBotAPI(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=0)
+    url = await api.start()
+    span = records[-1][0] - records[0][0]
+    print(
+        f"{len(records)} updates from {len(files)} file(s), recorded over {span:.0f} s; "
+        f"speed {'max' if not args.speed else f'{args.speed:g}x'}\n"
+    )
+
+    async with running_bot(url, args.workers, args.pending, args.pool) as scheduler:
+        started = time.perf_counter()
+        lag = await replay(api, records, args.speed)
+        while api.undelivered or scheduler.pending:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    await api.stop()
+
+    print(
+        f"wall time {elapsed:.2f} s, {len(records) / elapsed:.0f} updates/s, "
+        f"worst schedule lag {lag * 1000:.0f} ms\n"
+    )
+
+    latency = REGISTRY.histogram("handler_latency_seconds", "", ("router", "prefix"))
+    errors = REGISTRY.counter("handler_errors_total", "", ("router", "prefix"))
+    print(
+        f"{'router':<16} {'prefix':<12} {'events':>7} {'errors':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for labels, series in sorted(latency.series.items()):
+        p50, p95, p99 = (
+            (series.quantile(latency.buckets, q) or 0.0) * 1000 for q in (0.5, 0.95, 0.99)
+        )
+        print(
+            f"{labels[0]:<16} {labels[1]:<12} {series.count:>7} {int(errors.get(*labels)):>7} "
+            f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+        )
+    print("\nAPI calls: " + ", ".join(f"{m}={n}" for m, n in sorted(api.calls.items())))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="recording files or directories")
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="1, 10, ... or max")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake API latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--pending", type=int, default=1000)
+    parser.add_argument("--pool", type=int, default=100, help="HTTP connection pool size")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,169 @@
+"""
+Throughput benchmark for :class:`~oynaiq_bot.runtime.scheduler.UpdateScheduler`.
+
+Feeds synthetic private-chat messages through a real :class:`Dispatcher`
+whose only handler simulates an I/O wait, and compares two strategies:
+
+* ``tasks`` – aiogram default, one task per update, no ordering and no cap;
+* ``scheduler`` – per-chat serial queues with a bounded worker pool.
+
+For each strategy the report shows throughput, the peak number of updates
+in flight and the number of per-chat ordering violations.
+
+Usage::
+
+    python -m oynaiq_bot.bench.scheduler --chats 10000 --per-chat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message, Update
+
+from oynaiq_bot.runtime.scheduler import UpdateScheduler
+
+
+class _Probe:
+    """
+    Collects ordering and concurrency statistics from the handler.
+    """
+
+    def __init__(self) -> None:
+        self.last_seq: Dict[int, int] = {}
+        self.violations = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.handled = 0
+
+    def reset(self) -> None:
+        self.__init__()  # type: ignore[misc]
+
+
+def build_updates(bot: Bot, chats: int, per_chat: int, bursty: bool = False) -> List[Update]:
+    """
+    Build updates where every chat sends ``per_chat`` numbered messages.
+
+    By default chats are interleaved; with ``bursty`` all messages of a chat
+    arrive back to back, like rapid double taps.
+    """
+
+    if bursty:
+        order = [(seq, chat_id) for chat_id in range(1, chats + 1) for seq in range(per_chat)]
+    else:
+        order = [(seq, chat_id) for seq in range(per_chat) for chat_id in range(1, chats + 1)]
+
+    updates: List[Update] = []
+    update_id = 0
+    for seq, chat_id in order:
+        update_id += 1
+        updates.append(
+            Update.model_validate(
+                {
+                    "update_id": update_id,
+                    "message": {
+                        "message_id": update_id,
+                        "date": 0,
+                        "chat": {"id": chat_id, "type": "private"},
+                        "from": {"id": chat_id, "is_bot": False, "first_name": "u"},
+                        "text": str(seq),
+                    },
+                },
+                context={"bot": bot},
+            )
+        )
+    return updates
+
+
+def build_dispatcher(probe: _Probe, latency: float) -> Dispatcher:
+    router = Router(name="bench")
+
+    @router.message()
+    async def handler(message: Message) -> None:
+        probe.in_flight += 1
+        probe.peak = max(probe.peak, probe.in_flight)
+        # Jitter makes reordering visible when updates of a chat overlap
+        await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+        seq = int(message.text or 0)
+        if probe.last_seq.get(message.chat.id, -1) != seq - 1:
+            probe.violations += 1
+        probe.last_seq[message.chat.id] = seq
+        probe.in_flight -= 1
+        probe.handled += 1
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    return dp
+
+
+async def run_tasks(dp: Dispatcher, bot: Bot, updates: List[Update]) -> float:
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(dp.feed_update(bot, update)) for update in updates]
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started
+
+
+async def run_scheduler(
+    dp: Dispatcher, bot: Bot, updates: List[Update], workers: int, pending: int
+) -> float:
+    scheduler = UpdateScheduler(dp, bot, max_workers=workers, max_pending=pending)
+    scheduler.start()
+    started = time.perf_counter()
+    for update in updates:
+        await scheduler.submit(update)
+    await scheduler.join()
+    elapsed = time.perf_counter() - started
+    await scheduler.stop()
+    return elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    bot = Bot(token="42:benchmark")
+    probe = _Probe()
+    dp = build_dispatcher(probe, args.latency_ms / 1000)
+    updates = build_updates(bot, args.chats, args.per_chat, bursty=args.bursty)
+
+    print(
+        f"{len(updates)} updates from {args.chats} chats "
+        f"({'bursty' if args.bursty else 'interleaved'}), "
+        f"handler latency ~{args.latency_ms} ms\n"
+    )
+    print(f"{'strategy':<10} {'updates/s':>10} {'peak in flight':>15} {'order violations':>17}")
+
+    runs = [
+        ("tasks", lambda: run_tasks(dp, bot, updates)),
+        ("scheduler", lambda: run_scheduler(dp, bot, updates, args.workers, args.pending)),
+    ]
+    for name, run in runs:
+        probe.reset()
+        elapsed = await run()
+        print(
+            f"{name:<10} {probe.handled / elapsed:>10.0f} {probe.peak:>15} "
+            f"{probe.violations:>17}"
+        )
+
+    await bot.session.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chats", type=int, default=10_000)
+    parser.add_argument("--per-chat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=256)
+    parser.add_argument("--pending", type=int, default=2000)
+    parser.add_argument(
+        "--bursty", action="store_true", help="send all messages of a chat back to back"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parse_args()))
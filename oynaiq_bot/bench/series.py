@@ -0,0 +1,125 @@
+"""
+Memory and listing cost of recurring matches (:mod:`oynaiq_bot.data.series`).
+
+Creates ``--series`` weekly slots running for ``--weeks`` weeks and keeps
+them either
+
+* ``expanded`` – one stored :class:`Match` per week, published through
+  :class:`~oynaiq_bot.data.matches.SportSnapshots`; a listing of the next
+  days filters the whole view;
+* ``lazy`` – one :class:`~oynaiq_bot.data.series.MatchSeries` each in a
+  :class:`~oynaiq_bot.data.series.SeriesStore`; the first listing of the
+  day generates the occurrences (``cold``), the others are cached.
+
+Usage::
+
+    python -m oynaiq_bot.bench.series --series 200 --weeks 520
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+from zoneinfo import ZoneInfo
+
+from oynaiq_bot.bench.snapshots import build_matches
+from oynaiq_bot.data.matches import Match, SportSnapshots
+from oynaiq_bot.data.series import WINDOW_DAYS, SeriesStore
+
+SPORT = "football"
+
+
+def measure_memory(build: Callable[[], object]) -> Tuple[object, int]:
+    tracemalloc.start()
+    built = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, size
+
+
+def timed(call: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) / repeat
+
+
+def main(args: argparse.Namespace) -> None:
+    zone = ZoneInfo(args.timezone)
+    now = datetime.now(zone)
+    rng = random.Random(args.seed)
+    # Slots started weeks ago and run for as many weeks ahead as behind
+    templates = [replace(match, sport=SPORT) for match in build_matches(args.series, rng)]
+    firsts = [
+        (now - timedelta(weeks=args.weeks // 2, days=rng.randrange(7))).replace(
+            hour=rng.randrange(8, 23), minute=0, second=0, microsecond=0
+        )
+        for _ in templates
+    ]
+
+    def expand() -> SportSnapshots:
+        matches: List[Match] = []
+        for template, first in zip(templates, firsts):
+            for week in range(args.weeks):
+                starts_at = first + timedelta(weeks=week)
+                matches.append(replace(template, id=len(matches) + 1, starts_at=starts_at))
+        return SportSnapshots(matches)
+
+    def lazy() -> SeriesStore:
+        store = SeriesStore(args.timezone)
+        for template, first in zip(templates, firsts):
+            store.add(template, first)
+        return store
+
+    snapshots, expanded_bytes = measure_memory(expand)
+    store, lazy_bytes = measure_memory(lazy)
+    assert isinstance(snapshots, SportSnapshots) and isinstance(store, SeriesStore)
+
+    midnight = datetime.min.time()
+    window_end = datetime.combine(now.date() + timedelta(days=WINDOW_DAYS), midnight, zone)
+
+    def list_expanded() -> Tuple[Match, ...]:
+        return tuple(
+            match
+            for match in snapshots.view(SPORT)
+            if match.starts_at is not None and now <= match.starts_at < window_end
+        )
+
+    def list_cold() -> Tuple[Match, ...]:
+        return lazy().upcoming(SPORT)
+
+    listed = len(store.upcoming(SPORT))
+    expanded_listed = len(list_expanded())
+    print(
+        f"{args.series} weekly slots over {args.weeks} weeks: {len(snapshots)} expanded "
+        f"matches, {listed} listed in the next {WINDOW_DAYS} days "
+        f"({expanded_listed} still to start)\n"
+    )
+    print(f"{'mode':<13} {'memory':>10} {'µs/listing':>11}")
+    build_cost = timed(lazy, 5)
+    runs = [
+        ("expanded", expanded_bytes, timed(list_expanded, args.repeat)),
+        ("lazy, cold", lazy_bytes, timed(list_cold, 5) - build_cost),
+        ("lazy, cached", lazy_bytes, timed(lambda: store.upcoming(SPORT), args.repeat)),
+    ]
+    for name, memory, seconds in runs:
+        print(f"{name:<13} {memory / 1024:>8,.0f} K {seconds * 1e6:>11,.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--weeks", type=int, default=520)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--timezone", default="Asia/Almaty")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,198 @@
+"""
+Read throughput of match listing under a concurrent write load.
+
+Reader threads list the matches of one sport over and over while writer
+threads take and release seats. Every write changes two fields, the seat
+count and the status derived from it, so a reader can catch a match
+between them. Three ways to read are compared:
+
+* ``live`` – iterate the live :class:`Match` objects without a lock
+  (what handlers did before); torn reads are counted;
+* ``locked`` – readers and writers share a :class:`threading.Lock`, and
+  readers filter the storage under it;
+* ``snapshot`` – writers publish new versions through
+  :class:`~oynaiq_bot.data.matches.SportSnapshots`, readers take the
+  current tuple with no lock.
+
+Usage::
+
+    python -m oynaiq_bot.bench.snapshots --matches 500 --readers 4 --writers 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from oynaiq_bot.data.matches import Match, MatchChange, MatchStatus, SportSnapshots
+
+SPORTS = ["football", "basketball", "volleyball"]
+
+
+def status_for(match: Match) -> MatchStatus:
+    free = match.players_total - match.players_current
+    if free <= 0:
+        return MatchStatus.ACTIVE
+    return MatchStatus.ALMOST_FULL if free <= 2 else MatchStatus.LOW_PLAYERS
+
+
+def build_matches(count: int, rng: random.Random) -> List[Match]:
+    matches = []
+    for match_id in range(1, count + 1):
+        match = Match(
+            id=match_id,
+            sport=rng.choice(SPORTS),
+            title="Игра",
+            location=f"Площадка {match_id}",
+            date_human="завтра",
+            time_human="19:00",
+            google_maps_url="",
+            players_current=rng.randrange(1, 10),
+            players_total=10,
+            deposit=200,
+            level="любители",
+            organizer_username="org",
+            rules="",
+            refund_policy="",
+            status=MatchStatus.LOW_PLAYERS,
+        )
+        match.status = status_for(match)
+        matches.append(match)
+    return matches
+
+
+def run(
+    read: Callable[[], Tuple[int, int]],
+    write: Callable[[random.Random], None],
+    readers: int,
+    writers: int,
+    seconds: float,
+) -> Tuple[int, int, int]:
+    """
+    Run readers and writers for ``seconds``.
+
+    Returns:
+        Number of reads, torn matches seen by readers and writes.
+    """
+
+    stop = threading.Event()
+    reads = [0] * readers
+    torn = [0] * readers
+    writes = [0] * writers
+
+    def reader(index: int) -> None:
+        while not stop.is_set():
+            _, bad = read()
+            reads[index] += 1
+            torn[index] += bad
+
+    def writer(index: int) -> None:
+        rng = random.Random(index)
+        while not stop.is_set():
+            write(rng)
+            writes[index] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads), sum(torn), sum(writes)
+
+
+def scan(matches: "List[Match] | Tuple[Match, ...]") -> Tuple[int, int]:
+    # What a keyboard render reads: the seats and the status of every match
+    free = bad = 0
+    for match in matches:
+        free += match.players_total - match.players_current
+        if match.status is not status_for(match):
+            bad += 1
+    return free, bad
+
+
+def mutate(match: Match, rng: random.Random) -> Optional[MatchChange]:
+    if rng.random() < 0.5:
+        if match.players_current >= match.players_total:
+            return None
+        match.players_current += 1
+        change = MatchChange.SEAT_TAKEN
+    else:
+        if match.players_current <= 0:
+            return None
+        match.players_current -= 1
+        change = MatchChange.SEAT_RELEASED
+    # Give other threads a chance to see the match between the two fields
+    time.sleep(0)
+    match.status = status_for(match)
+    return change
+
+
+def main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.matches} matches, {args.readers} readers, {args.writers} writers, "
+        f"{args.seconds:.0f} s per mode\n"
+    )
+    print(f"{'mode':<9} {'reads/s':>10} {'writes/s':>10} {'torn reads':>11}")
+
+    for mode in ("live", "locked", "snapshot"):
+        matches = build_matches(args.matches, random.Random(args.seed))
+        lock = threading.Lock()
+        snapshots = SportSnapshots(matches)
+
+        if mode == "live":
+
+            def read() -> Tuple[int, int]:
+                return scan([m for m in matches if m.sport == "football"])
+
+            def write(rng: random.Random) -> None:
+                mutate(rng.choice(matches), rng)
+
+        elif mode == "locked":
+
+            def read() -> Tuple[int, int]:
+                with lock:
+                    return scan([m for m in matches if m.sport == "football"])
+
+            def write(rng: random.Random) -> None:
+                match = rng.choice(matches)
+                with lock:
+                    mutate(match, rng)
+
+        else:
+
+            def read() -> Tuple[int, int]:
+                return scan(snapshots.view("football"))
+
+            def write(rng: random.Random) -> None:
+                match = rng.choice(matches)
+                # Writers own the live objects; one writer per match at a time
+                with lock:
+                    change = mutate(match, rng)
+                    if change is not None:
+                        snapshots.publish(match, change)
+
+        reads, torn, writes = run(read, write, args.readers, args.writers, args.seconds)
+        print(
+            f"{mode:<9} {reads / args.seconds:>10,.0f} {writes / args.seconds:>10,.0f} "
+            f"{torn:>11}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
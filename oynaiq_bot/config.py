@@ -8,7 +8,8 @@ typed settings that can be reused across the project.
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
 
 from dotenv import load_dotenv
 
@@ -23,9 +24,221 @@ class Settings:
 
     Attributes:
         bot_token: Telegram bot token obtained from BotFather.
+        api_base_url: Base URL of the Bot API server. ``None`` means the
+            official ``https://api.telegram.org``; point it to a local
+            server (e.g. ``http://127.0.0.1:8081``) for load tests.
+        http_pool_limit: Total number of simultaneous connections in the pool.
+        http_pool_limit_per_host: Connection limit per host (``0`` — no limit).
+        http_dns_cache_ttl: Seconds to cache DNS lookups (``0`` disables cache).
+        http_keepalive_timeout: Seconds to keep idle connections alive
+            (``0`` closes the connection after every request).
+        http_timeout: Default Bot API request timeout in seconds.
+        http_method_timeouts: Per-method request timeouts in seconds, keyed by
+            Bot API method name (e.g. ``sendMessage``).
+        polling_timeout: Long-polling wait time of ``getUpdates`` in seconds.
+        max_concurrent_updates: Number of updates processed in parallel
+            (updates of one chat are always processed in order).
+        max_pending_updates: Maximum number of fetched but unfinished updates;
+            the fetcher waits when the limit is reached.
+        shutdown_timeout: Seconds allowed for draining in-flight updates and
+            flushing buffers after SIGTERM, before the process exits.
+        metrics_host: Interface of the Prometheus metrics endpoint.
+        metrics_port: Port of the metrics endpoint (``0`` disables it).
+        admin_ids: Telegram user ids allowed to run admin commands.
+        trace_sample_rate: Fraction of updates (``0``–``1``) that get
+            per-phase trace spans logged.
+        profile_dir: Directory for sampling profiler output.
+        profile_seconds: Default duration of a profiling session.
+        state_dir: Directory for journals of persistent in-memory stores
+            (referrals, payments...).
+        kaspi_pay_url: Payment link shown to users; ``{payment_id}`` in it
+            is replaced with the id of the user's payment.
+        payments_api_url: Payment verification service
+            (see :mod:`oynaiq_bot.payments.provider`). Without it and
+            without :attr:`payments_stub`, deposit booking is disabled.
+        payments_stub: Verify payments with the in-process stub that
+            approves every payment after a few seconds; for development
+            and load tests only.
+        payments_batch_size: Payments verified per provider call.
+        payments_poll_interval: Seconds before a pending payment is checked
+            again (doubles with every attempt).
+        payments_timeout: Seconds after which an unconfirmed payment fails.
+        waitlist_hold: Seconds a seat offered to the next user on the
+            waitlist is held before it passes to the one after.
+        card_edit_interval: Minimum seconds between two edits of one
+            announcement or match card (see :mod:`oynaiq_bot.runtime.edits`).
+        card_edits_per_second: Rate limit of card edits over all chats.
+        timezone: IANA time zone in which users type match dates.
+        city_idle_timeout: Seconds without reads after which the matches
+            of a city are unloaded (see :mod:`oynaiq_bot.data.cities`).
+        sports_catalog: JSON file with the sport catalog (see
+            :mod:`oynaiq_bot.utils.sports`); ``None`` uses the bundled one.
+        event_log_dir: Directory for the structured event log (see
+            :mod:`oynaiq_bot.runtime.events`); ``None`` disables it.
+        event_log_max_mb: Size in megabytes after which the event log is
+            rotated.
+        event_log_keep_files: Number of rotated event log files to keep.
+        event_queue_size: Events that may wait for the log writer; more
+            are dropped and counted.
+        api_host: Interface of the read-only match API (see
+            :mod:`oynaiq_bot.runtime.api_server`).
+        api_port: Port of the match API (``0`` disables it).
+        api_page_size: Matches per page when a request gives no ``limit``.
+        record_dir: Directory for recorded updates; ``None`` disables the
+            recorder.
+        record_max_mb: Uncompressed size in megabytes after which the
+            recording file is rotated.
+        record_keep_files: Number of recording files to keep.
+        record_salt: Secret used to pseudonymize user and chat ids; a
+            random one is generated per process when empty.
     """
 
     bot_token: str
+    api_base_url: Optional[str] = None
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 0
+    http_dns_cache_ttl: int = 300
+    http_keepalive_timeout: float = 30.0
+    http_timeout: float = 60.0
+    http_method_timeouts: Dict[str, float] = field(default_factory=dict)
+    polling_timeout: int = 10
+    max_concurrent_updates: int = 64
+    max_pending_updates: int = 1000
+    shutdown_timeout: float = 25.0
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9100
+    admin_ids: FrozenSet[int] = frozenset()
+    trace_sample_rate: float = 0.0
+    profile_dir: str = "profiles"
+    profile_seconds: float = 30.0
+    state_dir: str = "state"
+    kaspi_pay_url: str = "https://pay.kaspi.kz/pay/df3xuh5c"
+    payments_api_url: Optional[str] = None
+    payments_stub: bool = False
+    payments_batch_size: int = 50
+    payments_poll_interval: float = 2.0
+    payments_timeout: float = 900.0
+    waitlist_hold: float = 600.0
+    card_edit_interval: float = 3.0
+    card_edits_per_second: float = 20.0
+    timezone: str = "Asia/Almaty"
+    city_idle_timeout: float = 1800.0
+    sports_catalog: Optional[str] = None
+    event_log_dir: Optional[str] = None
+    event_log_max_mb: float = 32.0
+    event_log_keep_files: int = 5
+    event_queue_size: int = 10_000
+    api_host: str = "127.0.0.1"
+    api_port: int = 0
+    api_page_size: int = 20
+    record_dir: Optional[str] = None
+    record_max_mb: float = 64.0
+    record_keep_files: int = 48
+    record_salt: str = ""
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Read an integer environment variable.
+
+    Args:
+        name: Variable name.
+        default: Value used when the variable is not set or empty.
+
+    Returns:
+        Parsed integer value.
+
+    Raises:
+        RuntimeError: If the value is not a valid integer.
+    """
+
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise RuntimeError(f"{name} must be an integer, got {raw!r}.") from None
+
+
+def _env_float(name: str, default: float) -> float:
+    """
+    Read a float environment variable.
+
+    Args:
+        name: Variable name.
+        default: Value used when the variable is not set or empty.
+
+    Returns:
+        Parsed float value.
+
+    Raises:
+        RuntimeError: If the value is not a valid number.
+    """
+
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        raise RuntimeError(f"{name} must be a number, got {raw!r}.") from None
+
+
+def _env_mapping(name: str) -> Dict[str, float]:
+    """
+    Read a ``key=value`` comma-separated environment variable.
+
+    Example:
+        ``HTTP_METHOD_TIMEOUTS=sendMessage=10,answerCallbackQuery=5``
+
+    Args:
+        name: Variable name.
+
+    Returns:
+        Dictionary of keys to float values (empty if the variable is unset).
+
+    Raises:
+        RuntimeError: If an item is malformed.
+    """
+
+    result: Dict[str, float] = {}
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return result
+
+    for item in raw.split(","):
+        key, sep, value = item.partition("=")
+        try:
+            if not sep or not key.strip():
+                raise ValueError
+            result[key.strip()] = float(value)
+        except ValueError:
+            raise RuntimeError(
+                f"{name} must look like 'method=seconds,...', got {item!r}."
+            ) from None
+    return result
+
+
+def _env_ids(name: str) -> FrozenSet[int]:
+    """
+    Read a comma-separated list of integer ids.
+
+    Args:
+        name: Variable name.
+
+    Returns:
+        Set of ids (empty if the variable is unset).
+
+    Raises:
+        RuntimeError: If an item is not an integer.
+    """
+
+    raw = os.getenv(name, "").strip()
+    try:
+        return frozenset(int(item) for item in raw.split(",") if item.strip())
+    except ValueError:
+        raise RuntimeError(f"{name} must be a comma-separated list of ids, got {raw!r}.") from None
 
 
 def get_settings() -> Settings:
@@ -46,7 +259,47 @@ def get_settings() -> Settings:
             "Create a .env file (see .env.example) and define BOT_TOKEN."
         )
 
-    return Settings(bot_token=bot_token)
-
-
-
+    return Settings(
+        bot_token=bot_token,
+        api_base_url=os.getenv("TELEGRAM_API_URL") or None,
+        http_pool_limit=_env_int("HTTP_POOL_LIMIT", 100),
+        http_pool_limit_per_host=_env_int("HTTP_POOL_LIMIT_PER_HOST", 0),
+        http_dns_cache_ttl=_env_int("HTTP_DNS_CACHE_TTL", 300),
+        http_keepalive_timeout=_env_float("HTTP_KEEPALIVE_TIMEOUT", 30.0),
+        http_timeout=_env_float("HTTP_TIMEOUT", 60.0),
+        http_method_timeouts=_env_mapping("HTTP_METHOD_TIMEOUTS"),
+        polling_timeout=_env_int("POLLING_TIMEOUT", 10),
+        max_concurrent_updates=_env_int("MAX_CONCURRENT_UPDATES", 64),
+        max_pending_updates=_env_int("MAX_PENDING_UPDATES", 1000),
+        shutdown_timeout=_env_float("SHUTDOWN_TIMEOUT", 25.0),
+        metrics_host=os.getenv("METRICS_HOST") or "127.0.0.1",
+        metrics_port=_env_int("METRICS_PORT", 9100),
+        admin_ids=_env_ids("ADMIN_IDS"),
+        trace_sample_rate=_env_float("TRACE_SAMPLE_RATE", 0.0),
+        profile_dir=os.getenv("PROFILE_DIR") or "profiles",
+        profile_seconds=_env_float("PROFILE_SECONDS", 30.0),
+        state_dir=os.getenv("STATE_DIR") or "state",
+        kaspi_pay_url=os.getenv("KASPI_PAY_URL") or "https://pay.kaspi.kz/pay/df3xuh5c",
+        payments_api_url=os.getenv("PAYMENTS_API_URL") or None,
+        payments_stub=os.getenv("PAYMENTS_STUB") == "1",
+        payments_batch_size=_env_int("PAYMENTS_BATCH_SIZE", 50),
+        payments_poll_interval=_env_float("PAYMENTS_POLL_INTERVAL", 2.0),
+        payments_timeout=_env_float("PAYMENTS_TIMEOUT", 900.0),
+        waitlist_hold=_env_float("WAITLIST_HOLD_SECONDS", 600.0),
+        card_edit_interval=_env_float("CARD_EDIT_INTERVAL", 3.0),
+        card_edits_per_second=_env_float("CARD_EDITS_PER_SECOND", 20.0),
+        timezone=os.getenv("TIMEZONE") or "Asia/Almaty",
+        city_idle_timeout=_env_float("CITY_IDLE_SECONDS", 1800.0),
+        sports_catalog=os.getenv("SPORTS_CATALOG") or None,
+        event_log_dir=os.getenv("EVENT_LOG_DIR") or None,
+        event_log_max_mb=_env_float("EVENT_LOG_MAX_MB", 32.0),
+        event_log_keep_files=_env_int("EVENT_LOG_KEEP_FILES", 5),
+        event_queue_size=_env_int("EVENT_QUEUE_SIZE", 10_000),
+        api_host=os.getenv("API_HOST") or "127.0.0.1",
+        api_port=_env_int("API_PORT", 0),
+        api_page_size=_env_int("API_PAGE_SIZE", 20),
+        record_dir=os.getenv("RECORD_DIR") or None,
+        record_max_mb=_env_float("RECORD_MAX_MB", 64.0),
+        record_keep_files=_env_int("RECORD_KEEP_FILES", 48),
+        record_salt=os.getenv("RECORD_SALT", ""),
+    )
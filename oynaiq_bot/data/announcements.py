@@ -0,0 +1,101 @@
+"""
+Match announcement cards posted to group chats.
+
+A card is a bot message in a group with the match summary and reaction
+buttons («👍 Пойду», «🤔 Думаю», «👎 Не смогу»). Every card keeps its
+counters and each user's current reaction in memory, so a click is
+counted in O(1) and the card text can be rendered at any moment without
+recounting. Only the most recently used :data:`MAX_CARDS` cards are kept.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+MAX_CARDS = 10_000
+
+# Reaction codes and button labels, in display order
+REACTIONS: Dict[str, str] = {
+    "go": "👍 Пойду",
+    "maybe": "🤔 Думаю",
+    "no": "👎 Не смогу",
+}
+
+
+@dataclass
+class AnnouncementCard:
+    """
+    Reaction state of one announcement message.
+
+    Attributes:
+        match_id: Announced match.
+        counts: Number of users per reaction code.
+        votes: Current reaction code of every user who clicked.
+    """
+
+    match_id: int
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(REACTIONS, 0))
+    votes: Dict[int, str] = field(default_factory=dict)
+
+    def react(self, user_id: int, reaction: str) -> bool:
+        """
+        Set the reaction of a user, replacing the previous one.
+
+        Returns:
+            ``False`` if the user already had this reaction.
+        """
+
+        previous = self.votes.get(user_id)
+        if previous == reaction:
+            return False
+        if previous is not None:
+            self.counts[previous] -= 1
+        self.votes[user_id] = reaction
+        self.counts[reaction] += 1
+        return True
+
+
+class AnnouncementBoard:
+    """
+    Cards by ``(chat_id, message_id)`` with LRU eviction.
+
+    Args:
+        max_cards: Number of cards kept in memory.
+    """
+
+    def __init__(self, max_cards: int = MAX_CARDS) -> None:
+        self.max_cards = max_cards
+        self._cards: "OrderedDict[Tuple[int, int], AnnouncementCard]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def get(self, chat_id: int, message_id: int) -> Optional[AnnouncementCard]:
+        """
+        Return the card of a message, if it is known.
+        """
+
+        return self._cards.get((chat_id, message_id))
+
+    def card(self, chat_id: int, message_id: int, match_id: int) -> AnnouncementCard:
+        """
+        Return the card of a message, creating an empty one if needed
+        (new announcements, or cards forgotten after a restart).
+        """
+
+        key = (chat_id, message_id)
+        card = self._cards.get(key)
+        if card is None:
+            card = self._cards[key] = AnnouncementCard(match_id)
+            while len(self._cards) > self.max_cards:
+                self._cards.popitem(last=False)
+        else:
+            self._cards.move_to_end(key)
+        return card
+
+
+# Process-wide cards of all group chats
+ANNOUNCEMENTS = AnnouncementBoard()
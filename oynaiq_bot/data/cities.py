@@ -0,0 +1,343 @@
+"""
+City partitions of the match storage.
+
+Matches are partitioned by :attr:`~oynaiq_bot.data.matches.Match.city`.
+Every city has its own :class:`CityPartition`: copy-on-write snapshots of
+the matches of each sport (:class:`~oynaiq_bot.data.matches.SportSnapshots`),
+a :class:`~oynaiq_bot.data.search.MatchSearchIndex` and a
+:class:`~oynaiq_bot.data.recommendations.Recommender` ranking the snapshot
+copies. Matches not stored yet (weekly series occurrences, see
+:func:`~oynaiq_bot.data.matches.get_source_matches`) are not indexed:
+:meth:`CityPartition.recommend` and :meth:`CityPartition.find` add them to
+every answer. Listing, search and recommendations of a user only read the
+partition of the user's city, so their cost does not grow with the number
+of cities.
+
+:data:`PARTITIONS` builds a partition from the storage on first access
+(:func:`~oynaiq_bot.data.matches.load_city_matches`) and drops it after
+:attr:`~oynaiq_bot.config.Settings.city_idle_timeout` seconds without
+reads. Loaded partitions follow the storage through
+:func:`~oynaiq_bot.data.matches.add_match_listener`; changes of an
+unloaded city need no work, they are read with the rest on load.
+
+The city chosen by each user is kept in :data:`USER_CITIES`, backed by a
+:class:`~oynaiq_bot.data.journal.Journal`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiogram import Dispatcher
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.journal import Journal
+from oynaiq_bot.data.matches import (
+    Match,
+    MatchChange,
+    SportSnapshots,
+    add_match_listener,
+    get_source_matches,
+    load_city_matches,
+)
+from oynaiq_bot.data.recommendations import PROFILES, Recommender, UserProfiles
+from oynaiq_bot.data.search import MatchSearchIndex, matches_query
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+from oynaiq_bot.utils.navigator import CITIES, DEFAULT_CITY
+from oynaiq_bot.utils.sports import CATALOG
+
+
+logger = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = 30 * 60
+# Journals with more records than this are compacted on startup
+COMPACT_RECORDS = 1000
+
+Loader = Callable[[str], List[Match]]
+
+
+class CityPartition:
+    """
+    Matches of one city with their search and ranking indexes.
+
+    Args:
+        city: Internal city code.
+        matches: Matches of the city, in storage order.
+        profiles: User profiles for the recommender.
+    """
+
+    def __init__(self, city: str, matches: List[Match], profiles: UserProfiles) -> None:
+        self.city = city
+        self.snapshots = SportSnapshots()
+        self.search = MatchSearchIndex()
+        self.recommender = Recommender(profiles=profiles)
+        self.last_read = time.monotonic()
+        for match in matches:
+            self.on_change(match, MatchChange.CREATED)
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def matches_by_sport(self, sport: str) -> Tuple[Match, ...]:
+        """
+        Return the current snapshot of the matches of ``sport``, followed
+        by the unbooked matches of the city from the match sources.
+        """
+
+        return self.snapshots.view(sport) + get_source_matches(sport, self.city)
+
+    def recommend(self, user_id: Optional[int], sport: str, k: int) -> List[Match]:
+        """
+        Return the ``k`` best matches of ``sport`` for a user, including
+        the unbooked matches of the city from the match sources.
+        """
+
+        return self.recommender.top(user_id, sport, k, get_source_matches(sport, self.city))
+
+    def find(self, query: str) -> Tuple[int, ...]:
+        """
+        Return the ids of the matches found by ``query``: indexed ones in
+        storage order, then the unbooked ones from the match sources.
+        """
+
+        found = self.search.search(query)
+        extra = tuple(
+            match.id
+            for sport in CATALOG.labels
+            for match in get_source_matches(sport, self.city)
+            if matches_query(match, query)
+        )
+        return found + extra if extra else found
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Keep the indexes in sync with the match storage.
+        """
+
+        copy = self.snapshots.publish(match, change)
+        if change is MatchChange.CREATED:
+            self.search.add(match)
+        if copy is not None:
+            self.recommender.on_change(copy, change)
+
+
+class MatchPartitions:
+    """
+    Lazily loaded, evictable city partitions.
+
+    Args:
+        loader: Returns the matches of a city from the storage.
+        idle_timeout: Seconds without reads after which a partition is
+            dropped by :meth:`evict_idle`.
+        profiles: User profiles shared by the recommenders.
+        registry: Registry for the load/evict counter.
+    """
+
+    def __init__(
+        self,
+        loader: Loader = load_city_matches,
+        idle_timeout: float = IDLE_TIMEOUT,
+        profiles: UserProfiles = PROFILES,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.loader = loader
+        self.idle_timeout = idle_timeout
+        self.profiles = profiles
+        self.events = registry.counter(
+            "city_partition_events_total", "City partitions loaded and evicted.", ("event",)
+        )
+        self._partitions: Dict[str, CityPartition] = {}
+
+    def __contains__(self, city: str) -> bool:
+        return city in self._partitions
+
+    def partition(self, city: str) -> CityPartition:
+        """
+        Return the partition of ``city``, loading it on first access.
+        """
+
+        partition = self._partitions.get(city)
+        if partition is None:
+            started = time.perf_counter()
+            partition = CityPartition(city, self.loader(city), self.profiles)
+            self._partitions[city] = partition
+            self.events.inc("load")
+            logger.info(
+                "Loaded city partition %s: %d matches in %.1f ms",
+                city,
+                len(partition),
+                (time.perf_counter() - started) * 1000,
+            )
+        partition.last_read = time.monotonic()
+        return partition
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Forward a change to the partition of its city, if loaded.
+        """
+
+        partition = self._partitions.get(match.city)
+        if partition is not None:
+            partition.on_change(match, change)
+
+    def evict_idle(self) -> List[str]:
+        """
+        Drop partitions not read for :attr:`idle_timeout` seconds.
+
+        Returns:
+            Codes of the evicted cities.
+        """
+
+        expired = time.monotonic() - self.idle_timeout
+        evicted = [
+            city for city, partition in self._partitions.items() if partition.last_read < expired
+        ]
+        for city in evicted:
+            del self._partitions[city]
+            self.events.inc("evict")
+        if evicted:
+            logger.info("Evicted idle city partitions: %s", ", ".join(evicted))
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Drop all partitions, e.g. after the sport catalog was reloaded
+        (search indexes contain sport labels); they are rebuilt on access.
+        """
+
+        self._partitions.clear()
+
+    async def run(self) -> None:
+        """
+        Evict idle partitions periodically until cancelled.
+        """
+
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 1.0))
+            self.evict_idle()
+
+
+class UserCities:
+    """
+    City chosen by each user, persisted to a journal.
+
+    Users who never chose a city get :data:`~oynaiq_bot.utils.navigator.DEFAULT_CITY`.
+    """
+
+    def __init__(self) -> None:
+        self.city_of: Dict[int, str] = {}
+        self._journal: Optional[Journal] = None
+
+    @property
+    def opened(self) -> bool:
+        """
+        Whether the store is backed by a journal.
+        """
+
+        return self._journal is not None
+
+    def open(self, path: Path) -> None:
+        """
+        Load the journal and persist further choices to it.
+
+        Records look like ``{"user_id": 1, "city": "almaty"}``; the last
+        record of a user wins.
+        """
+
+        journal = Journal(path)
+        records = 0
+        for record in journal.load():
+            records += 1
+            if record.get("city") in CITIES:
+                self.city_of[record["user_id"]] = record["city"]
+
+        if records > COMPACT_RECORDS:
+            journal.rewrite(
+                [{"user_id": user_id, "city": city} for user_id, city in self.city_of.items()]
+            )
+        self._journal = journal
+        logger.info("Loaded city choices of %d users", len(self.city_of))
+
+    def get(self, user_id: Optional[int]) -> str:
+        """
+        Return the city of a user.
+        """
+
+        if user_id is None:
+            return DEFAULT_CITY
+        return self.city_of.get(user_id, DEFAULT_CITY)
+
+    def set(self, user_id: int, city: str) -> None:
+        """
+        Remember the city chosen by a user.
+
+        Raises:
+            ValueError: If ``city`` is not in :data:`~oynaiq_bot.utils.navigator.CITIES`.
+        """
+
+        if city not in CITIES:
+            raise ValueError(f"Unknown city {city!r}")
+        if self.city_of.get(user_id) == city:
+            return
+        self.city_of[user_id] = city
+        if self._journal is not None:
+            self._journal.write([{"user_id": user_id, "city": city}])
+
+    async def close(self, budget: float) -> int:
+        """
+        Flush hook: close the journal.
+
+        Returns:
+            Number of dropped choices (always ``0``).
+        """
+
+        if self._journal is not None:
+            await self._journal.close()
+        return 0
+
+
+# Process-wide partitions and city choices
+PARTITIONS = MatchPartitions()
+add_match_listener(PARTITIONS.on_change)
+CATALOG.add_reload_listener(PARTITIONS.clear)
+USER_CITIES = UserCities()
+
+
+def user_partition(user_id: Optional[int]) -> CityPartition:
+    """
+    Return the partition of the city chosen by a user.
+    """
+
+    return PARTITIONS.partition(USER_CITIES.get(user_id))
+
+
+def setup_cities(dp: Dispatcher, settings: Settings) -> None:
+    """
+    Back :data:`USER_CITIES` with a journal in :attr:`Settings.state_dir`
+    and evict idle partitions of :data:`PARTITIONS` while the bot is polling.
+
+    Calling it again has no effect.
+    """
+
+    if USER_CITIES.opened:
+        return
+    USER_CITIES.open(Path(settings.state_dir) / "cities.jsonl")
+    PARTITIONS.idle_timeout = settings.city_idle_timeout
+    tasks: List["asyncio.Task[None]"] = []
+
+    async def on_startup() -> None:
+        tasks.append(asyncio.create_task(PARTITIONS.run(), name="city-partitions"))
+
+    async def stop(budget: float) -> int:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return await USER_CITIES.close(budget)
+
+    dp.startup.register(on_startup)
+    SHUTDOWN_HOOKS.register("cities", stop)
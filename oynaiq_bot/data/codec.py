@@ -0,0 +1,279 @@
+"""
+Compact encodings of :class:`~oynaiq_bot.data.matches.Match`.
+
+:class:`MatchCodec` inspects the fields of ``Match`` once, at import, and
+prepares everything an encoding needs: one :class:`struct.Struct` for all
+fixed-size fields, the order of string fields, the index of every
+:class:`~oynaiq_bot.data.matches.MatchStatus` value and a single
+:func:`operator.attrgetter` reading all fields at once. Encoding and
+decoding a match is then a few C-level calls instead of the recursive
+walk of :func:`dataclasses.asdict`.
+
+Binary record layout (little-endian)::
+
+    u32 record size (excluding itself)
+    u32 schema id (CRC-32 of the field names and types)
+    fixed fields: i64 per int, u8 status index, i64 + i16 per datetime
+    u32 length in characters per string field
+    UTF-8 bytes of the string fields joined together
+
+Records can be concatenated; :meth:`MatchCodec.iter_decode` walks a
+buffer of them. Decoding reads straight from a :class:`memoryview` with
+``unpack_from`` and decodes the text of all strings in one call, so no
+intermediate ``bytes`` are made; the fields are then sliced out of it by
+their character lengths. A record written with a different
+``Match`` schema is rejected instead of being misread.
+
+Datetimes keep their instant and UTC offset; a ``ZoneInfo`` comes back as
+a fixed-offset timezone.
+
+The JSON form is an object with the field names, the status value and
+ISO 8601 datetimes, built from the same precomputed getter.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_type_hints,
+)
+
+from oynaiq_bot.data.matches import Match, MatchStatus
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Offset stored for naive datetimes and for ``None``
+_NAIVE = -32768
+_NONE = -32767
+
+_SIZE = struct.Struct("<I")
+
+Encoder = Callable[[Any], Tuple[Any, ...]]
+Decoder = Callable[[Tuple[Any, ...]], Any]
+
+
+class MatchCodec:
+    """
+    Binary and JSON codec for :class:`Match`, built from its fields.
+
+    Raises:
+        TypeError: If ``Match`` has a field of a type the codec does not
+            support (at construction, not at encoding time).
+    """
+
+    def __init__(self) -> None:
+        hints = get_type_hints(Match)
+        self.names: Tuple[str, ...] = tuple(field.name for field in fields(Match))
+        self._values = attrgetter(*self.names)
+        statuses = tuple(MatchStatus)
+        status_index = {status: index for index, status in enumerate(statuses)}
+
+        # (field index, struct items, encoder, decoder) of fixed-size fields
+        self._fixed_fields: List[Tuple[int, int, Encoder, Decoder]] = []
+        self._string_fields: List[int] = []
+        fixed_format = "<I"
+        for index, name in enumerate(self.names):
+            hint = hints[name]
+            if hint is str:
+                self._string_fields.append(index)
+            elif hint is int:
+                fixed_format += "q"
+                self._fixed_fields.append((index, 1, _as_items, _first_item))
+            elif hint is MatchStatus:
+                fixed_format += "B"
+                self._fixed_fields.append(
+                    (
+                        index,
+                        1,
+                        lambda value: (status_index[value],),
+                        lambda items: statuses[items[0]],
+                    )
+                )
+            elif hint in (datetime, Optional[datetime]):
+                fixed_format += "qh"
+                self._fixed_fields.append((index, 2, _encode_datetime, _decode_datetime))
+            else:
+                raise TypeError(f"MatchCodec does not support field {name}: {hint!r}")
+        self._fixed = struct.Struct(fixed_format + "I" * len(self._string_fields))
+
+        # Where decode finds each fixed field among the unpacked items; ints
+        # are copied as is, other types go through their decoder
+        self._plain_slots: List[Tuple[int, int]] = []
+        self._converted_slots: List[Tuple[int, int, int, Decoder]] = []
+        position = 1
+        for index, width, _, decode in self._fixed_fields:
+            if decode is _first_item:
+                self._plain_slots.append((index, position))
+            else:
+                self._converted_slots.append((index, position, width, decode))
+            position += width
+        self._lengths_at = position
+
+        signature = ";".join(f"{name}:{hints[name]!r}" for name in self.names)
+        self.schema_id = zlib.crc32(signature.encode("utf-8"))
+
+    # Binary
+
+    def encode(self, match: Match) -> bytes:
+        """
+        Encode a match as one length-prefixed binary record.
+        """
+
+        out = bytearray()
+        self.encode_into(out, match)
+        return bytes(out)
+
+    def encode_into(self, out: bytearray, match: Match) -> None:
+        """
+        Append the binary record of ``match`` to ``out``.
+        """
+
+        values = self._values(match)
+        items: List[Any] = [self.schema_id]
+        for index, _, encode, _ in self._fixed_fields:
+            items.extend(encode(values[index]))
+        strings = [values[index] for index in self._string_fields]
+        items.extend(map(len, strings))
+        text = "".join(strings).encode("utf-8")
+
+        body = self._fixed.pack(*items)
+        out += _SIZE.pack(len(body) + len(text))
+        out += body
+        out += text
+
+    def decode(self, buffer: Buffer, offset: int = 0) -> Tuple[Match, int]:
+        """
+        Decode the record starting at ``offset`` of ``buffer``.
+
+        Returns:
+            The match and the offset just past its record.
+
+        Raises:
+            ValueError: If the record is truncated or was written with
+                another schema.
+        """
+
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        if len(view) - offset < _SIZE.size:
+            raise ValueError("truncated match record")
+        (size,) = _SIZE.unpack_from(view, offset)
+        cursor = offset + _SIZE.size
+        end = cursor + size
+        if end > len(view) or size < self._fixed.size:
+            raise ValueError("truncated match record")
+
+        items = self._fixed.unpack_from(view, cursor)
+        if items[0] != self.schema_id:
+            raise ValueError(
+                f"match record has schema {items[0]:#x}, expected {self.schema_id:#x}"
+            )
+
+        values: List[Any] = [None] * len(self.names)
+        for index, position in self._plain_slots:
+            values[index] = items[position]
+        for index, position, width, decode in self._converted_slots:
+            values[index] = decode(items[position : position + width])
+        text = str(view[cursor + self._fixed.size : end], "utf-8")
+        start = 0
+        for index, length in zip(self._string_fields, items[self._lengths_at :]):
+            values[index] = text[start : start + length]
+            start += length
+        if start != len(text):
+            raise ValueError("malformed match record")
+        return Match(*values), end
+
+    def iter_decode(self, buffer: Buffer) -> Iterator[Match]:
+        """
+        Decode consecutive records filling ``buffer``.
+        """
+
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        offset = 0
+        while offset < len(view):
+            match, offset = self.decode(view, offset)
+            yield match
+
+    # JSON
+
+    def to_dict(self, match: Match) -> Dict[str, Any]:
+        """
+        Return the JSON-compatible form of a match.
+        """
+
+        data = dict(zip(self.names, self._values(match)))
+        data["status"] = match.status.value
+        if match.starts_at is not None:
+            data["starts_at"] = match.starts_at.isoformat()
+        return data
+
+    def from_dict(self, data: Dict[str, Any]) -> Match:
+        """
+        Build a match from :meth:`to_dict` output.
+        """
+
+        values = dict(data)
+        values["status"] = MatchStatus(values["status"])
+        if values.get("starts_at") is not None:
+            values["starts_at"] = datetime.fromisoformat(values["starts_at"])
+        return Match(**values)
+
+    def dumps(self, match: Match) -> str:
+        """
+        Encode a match as compact JSON.
+        """
+
+        return json.dumps(self.to_dict(match), ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, text: Union[str, bytes]) -> Match:
+        """
+        Decode a match from :meth:`dumps` output.
+        """
+
+        return self.from_dict(json.loads(text))
+
+
+def _as_items(value: Any) -> Tuple[Any, ...]:
+    return (value,)
+
+
+def _first_item(items: Tuple[Any, ...]) -> Any:
+    return items[0]
+
+
+def _encode_datetime(value: Optional[datetime]) -> Tuple[int, int]:
+    if value is None:
+        return 0, _NONE
+    offset = value.utcoffset()
+    if offset is None:
+        return (value.replace(tzinfo=timezone.utc) - _EPOCH) // _MICROSECOND, _NAIVE
+    return (value - _EPOCH) // _MICROSECOND, int(offset.total_seconds()) // 60
+
+
+def _decode_datetime(items: Tuple[int, ...]) -> Optional[datetime]:
+    micros, offset = items
+    if offset == _NONE:
+        return None
+    moment = _EPOCH + micros * _MICROSECOND
+    if offset == _NAIVE:
+        return moment.replace(tzinfo=None)
+    return moment.astimezone(timezone(timedelta(minutes=offset)))
+
+
+# Process-wide codec for the current Match schema
+MATCH_CODEC = MatchCodec()
@@ -0,0 +1,259 @@
+"""
+Idempotency keys for user actions with side effects.
+
+Double taps and Telegram redeliveries make the same callback arrive more
+than once. Actions that change state (booking a seat, confirming
+participation) run through :meth:`IdempotencyCache.once` with a key per
+``(user, match, action)``: the first call executes the action and stores
+its result, repeated calls get the stored result without executing
+anything.
+
+Results are kept in a bounded LRU map with a TTL, so hot keys are
+answered without any I/O. Results of *durable* actions, whose side effect
+survives a restart (queuing a payment in its journal), are also stored in
+a SQLite table, where entries evicted from memory or lost with a restart
+are looked up: unlike an append-only journal it can find a single key
+without loading everything. Results of other actions (taking a seat,
+which lives in memory) are not persisted, since replaying them after a
+restart would report an effect that was lost. All SQLite access happens
+on one background thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 10_000
+TTL_SECONDS = 24 * 60 * 60
+
+
+def idempotency_key(user_id: int, match_id: int, action: str) -> str:
+    """
+    Build the key of a user's action on a match.
+    """
+
+    return f"{user_id}:{match_id}:{action}"
+
+
+class IdempotencyCache:
+    """
+    Bounded TTL/LRU map of action results with a persistent fallback.
+
+    Args:
+        max_entries: Number of results kept in memory.
+        ttl: Seconds a result stays valid.
+        registry: Registry for the hit counters.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        ttl: float = TTL_SECONDS,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = registry.counter(
+            "idempotency_hits_total", "Repeated actions answered from cache.", ("source",)
+        )
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def opened(self) -> bool:
+        """
+        Whether the persistent fallback is enabled.
+        """
+
+        return self._executor is not None
+
+    def open(self, path: Path) -> None:
+        """
+        Enable the persistent fallback stored in the SQLite file ``path``.
+        """
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="idempotency")
+        self._executor.submit(self._db_open, path).result()
+
+    async def once(
+        self, key: str, action: Callable[[], str], durable: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        Run ``action`` once per ``key`` and remember its result.
+
+        Args:
+            key: Idempotency key, see :func:`idempotency_key`.
+            action: Synchronous function performing the side effect and
+                returning a short result (e.g. the answer text).
+            durable: Whether the side effect survives a restart; only then
+                is the result persisted.
+
+        Returns:
+            ``(result, fresh)``: ``fresh`` is ``True`` only for the call
+            that actually executed ``action``.
+        """
+
+        now = time.time()
+        cached = self._get_memory(key, now)
+        if cached is not None:
+            self.hits.inc("memory")
+            return cached, False
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            result = await asyncio.shield(pending)
+            if result is None:  # the first call failed, try ourselves
+                return await self.once(key, action)
+            self.hits.inc("inflight")
+            return result, False
+
+        future: "asyncio.Future[Optional[str]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            stored = await self._get_persistent(key, now) if durable else None
+            if stored is not None:
+                self.hits.inc("persistent")
+                self._remember(key, stored)
+                future.set_result(stored[1])
+                return stored[1], False
+
+            result = action()
+            self._remember(key, (now + self.ttl, result))
+            if durable:
+                self._put_persistent(key, now + self.ttl, result)
+            future.set_result(result)
+            return result, True
+        finally:
+            if not future.done():
+                future.set_result(None)
+            del self._inflight[key]
+
+    def forget(self, key: str) -> None:
+        """
+        Drop the stored result of ``key``, so the next call runs the
+        action again (e.g. confirming after having left a match).
+        """
+
+        self._entries.pop(key, None)
+        if self._executor is not None:
+            self._executor.submit(self._db_delete, key)
+
+    async def close(self, budget: float) -> int:
+        """
+        Flush hook: finish pending writes and close the database.
+
+        Returns:
+            Number of dropped entries (always ``0``).
+        """
+
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.submit(self._db_close)
+            await asyncio.to_thread(executor.shutdown, wait=True)
+        return 0
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        entries = self._entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def _get_persistent(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if self._executor is None:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._db_get, key, now)
+
+    def _put_persistent(self, key: str, expires: float, result: str) -> None:
+        if self._executor is not None:
+            self._executor.submit(self._db_put, key, expires, result)
+
+    # Background thread ---------------------------------------------------------
+
+    def _db_open(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency "
+            "(key TEXT PRIMARY KEY, expires REAL NOT NULL, result TEXT NOT NULL)"
+        )
+        purged = db.execute("DELETE FROM idempotency WHERE expires <= ?", (time.time(),))
+        db.commit()
+        logger.info("Idempotency store %s opened, %d expired keys purged", path, purged.rowcount)
+        self._db = db
+
+    def _db_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        assert self._db is not None
+        row = self._db.execute(
+            "SELECT expires, result FROM idempotency WHERE key = ? AND expires > ?", (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _db_put(self, key: str, expires: float, result: str) -> None:
+        assert self._db is not None
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO idempotency (key, expires, result) VALUES (?, ?, ?)",
+                (key, expires, result),
+            )
+            self._db.commit()
+        except sqlite3.Error:
+            logger.exception("Failed to persist idempotency key %s", key)
+
+    def _db_delete(self, key: str) -> None:
+        assert self._db is not None
+        try:
+            self._db.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+            self._db.commit()
+        except sqlite3.Error:
+            logger.exception("Failed to delete idempotency key %s", key)
+
+    def _db_close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# Process-wide cache for booking and confirmation actions
+IDEMPOTENCY = IdempotencyCache()
+
+
+def setup_idempotency(settings: Settings) -> None:
+    """
+    Enable the persistent fallback of :data:`IDEMPOTENCY` in
+    :attr:`Settings.state_dir`. Calling it again has no effect.
+    """
+
+    if IDEMPOTENCY.opened:
+        return
+    IDEMPOTENCY.open(Path(settings.state_dir) / "idempotency.sqlite3")
+    SHUTDOWN_HOOKS.register("idempotency", IDEMPOTENCY.close)
@@ -0,0 +1,130 @@
+"""
+Append-only JSONL journal for small persistent stores.
+
+Stores keep their state in memory and append changes to a journal; on
+startup the journal is read back to rebuild the state. Records are
+encoded on the event loop and written by a single background thread, so
+a handler never waits for the disk and the order of records is kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(records: Iterable[Dict[str, Any]]) -> bytes:
+    return b"".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        for record in records
+    )
+
+
+class Journal:
+    """
+    Append-only file of JSON records, one per line.
+
+    Args:
+        path: Journal file; parent directories are created on first write.
+        fsync: Call :func:`os.fsync` after every batch, for stores that
+            must survive a power loss (payment queue), not just a crash.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False) -> None:
+        self.path = path
+        self.fsync = fsync
+        self._file: Optional[IO[bytes]] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"journal-{path.stem}"
+        )
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read all records written so far (blocking, meant for startup).
+
+        A partially written last line, left by a crash, is ignored.
+        """
+
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping a corrupted record in %s", self.path)
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> "Future[None]":
+        """
+        Queue records for writing; returns immediately.
+
+        Returns:
+            Future completed once the records are on disk; stores that
+            need durability can await it with :func:`asyncio.wrap_future`.
+        """
+
+        future = self._executor.submit(self._write, _encode(records))
+        future.add_done_callback(self._log_error)
+        return future
+
+    def rewrite(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Queue replacing the whole journal with ``records`` (compaction).
+
+        The new content is written to a temporary file and renamed over
+        the journal, so a crash leaves either the old or the new version.
+        """
+
+        future = self._executor.submit(self._rewrite, _encode(records))
+        future.add_done_callback(self._log_error)
+
+    async def close(self) -> None:
+        """
+        Wait until queued records are written and close the file.
+        """
+
+        self._executor.submit(self._close)
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("ab")
+        return self._file
+
+    def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        fh = self._open()
+        fh.write(data)
+        fh.flush()
+        if self.fsync:
+            os.fsync(fh.fileno())
+
+    def _rewrite(self, data: bytes) -> None:
+        self._close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _log_error(self, future: "Future[None]") -> None:
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Failed to write %s - %s: %s", self.path, type(exc).__name__, exc)
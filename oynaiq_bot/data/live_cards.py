@@ -0,0 +1,133 @@
+"""
+Live match detail cards.
+
+Every message currently showing the details of a match is registered in
+:data:`LIVE_CARDS`. When the seats of the match change, each registered
+message gets a refreshed card through :data:`~oynaiq_bot.runtime.edits.EDITS`,
+which coalesces changes within its interval into one edit per message
+and rate-limits edits over all chats.
+
+Only the most recently shown :data:`MAX_CARDS` cards are tracked, and a
+card stops being refreshed after :data:`CARD_TTL` seconds or once its
+message shows something else.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Set, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from oynaiq_bot.data.matches import (
+    Match,
+    MatchChange,
+    add_match_listener,
+    get_match_by_id,
+)
+from oynaiq_bot.keyboards.match_details import build_match_details_keyboard
+from oynaiq_bot.runtime.edits import EDITS, DebouncedEditor, Render
+from oynaiq_bot.utils.formatter import format_match_details
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+MAX_CARDS = 20_000
+CARD_TTL = 60 * 60
+
+MessageKey = Tuple[int, int]
+
+
+class _Card(NamedTuple):
+    match_id: int
+    bot: "Bot"
+    shown: float
+
+
+class LiveCards:
+    """
+    Messages showing match details, indexed by match.
+
+    Args:
+        editor: Editor used to refresh the cards.
+        max_cards: Number of cards tracked.
+        ttl: Seconds a card is refreshed after it was shown.
+    """
+
+    def __init__(
+        self,
+        editor: DebouncedEditor = EDITS,
+        max_cards: int = MAX_CARDS,
+        ttl: float = CARD_TTL,
+    ) -> None:
+        self.editor = editor
+        self.max_cards = max_cards
+        self.ttl = ttl
+        self._cards: "OrderedDict[MessageKey, _Card]" = OrderedDict()
+        self._by_match: Dict[int, Set[MessageKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def show(self, bot: "Bot", chat_id: int, message_id: int, match_id: int) -> None:
+        """
+        Register a message that now shows the details of ``match_id``.
+        """
+
+        key = (chat_id, message_id)
+        self.forget(chat_id, message_id)
+        self._cards[key] = _Card(match_id, bot, time.monotonic())
+        self._by_match.setdefault(match_id, set()).add(key)
+        while len(self._cards) > self.max_cards:
+            oldest = next(iter(self._cards))
+            self.forget(*oldest)
+
+    def forget(self, chat_id: int, message_id: int) -> None:
+        """
+        Stop refreshing a message (it shows something else now).
+        """
+
+        card = self._cards.pop((chat_id, message_id), None)
+        if card is None:
+            return
+        keys = self._by_match[card.match_id]
+        keys.discard((chat_id, message_id))
+        if not keys:
+            del self._by_match[card.match_id]
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Schedule a refresh of every live card of a changed match.
+        """
+
+        if change not in (MatchChange.SEAT_TAKEN, MatchChange.SEAT_RELEASED):
+            return
+        keys = self._by_match.get(match.id)
+        if not keys:
+            return
+
+        expired = time.monotonic() - self.ttl
+        render = _renderer(match.id)
+        for key in list(keys):
+            card = self._cards[key]
+            if card.shown < expired:
+                self.forget(*key)
+            else:
+                self.editor.schedule(card.bot, key[0], key[1], render)
+
+
+def _renderer(match_id: int) -> Render:
+    def render() -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+        match = get_match_by_id(match_id)
+        if match is None:
+            return None
+        return format_match_details(match), build_match_details_keyboard(match)
+
+    return render
+
+
+# Process-wide registry of shown match cards
+LIVE_CARDS = LiveCards()
+add_match_listener(LIVE_CARDS.on_change)
@@ -3,13 +3,34 @@ Mock match data for OynaIQ.bot.
 
 This module defines a simple in‑memory list of matches that emulate
 what will later be stored in a real database.
+
+Matches are changed only through :func:`add_match`, :func:`take_seat`,
+:func:`release_seat` and :func:`record_deposit`, which notify listeners registered with
+:func:`add_match_listener` so derived views can be updated incrementally.
+
+Matches that exist only on a schedule, such as the weekly occurrences of
+:mod:`oynaiq_bot.data.series`, come from sources registered with
+:func:`add_match_source`. They are listed and found by id like stored
+matches, and :func:`take_seat` stores one when its first seat is booked.
+
+Readers that list matches get a snapshot instead of the live objects:
+:class:`SportSnapshots` keeps an immutable tuple of private copies per
+sport, and every write publishes a new tuple with a fresh copy of the
+changed match, swapped in with one reference assignment. A render never
+sees a half-updated match or a list growing under it, and readers take
+no lock.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Set, Tuple
+
+from oynaiq_bot.utils.dates import format_day
+from oynaiq_bot.utils.navigator import DEFAULT_CITY
 
 
 class MatchStatus(str, Enum):
@@ -27,6 +48,23 @@ class MatchStatus(str, Enum):
     LOW_PLAYERS = "low_players"
 
 
+class MatchChange(str, Enum):
+    """
+    Kinds of match mutations reported to listeners.
+
+    Attributes:
+        CREATED: Match was added to the storage.
+        SEAT_TAKEN: ``players_current`` grew by one.
+        SEAT_RELEASED: ``players_current`` dropped by one.
+        DEPOSIT_PAID: A deposit of ``deposit`` tenge was paid for the match.
+    """
+
+    CREATED = "created"
+    SEAT_TAKEN = "seat_taken"
+    SEAT_RELEASED = "seat_released"
+    DEPOSIT_PAID = "deposit_paid"
+
+
 @dataclass
 class Match:
     """
@@ -37,7 +75,9 @@ class Match:
         sport: Internal sport code (e.g. ``football``).
         title: Short title such as ``Футбол 5×5``.
         location: Human‑readable location name.
-        date_human: Human‑friendly date description (e.g. ``сегодня``).
+        date_human: Human‑friendly date description (e.g. ``сегодня``);
+            absolute (``сб, 25.10``) when :attr:`starts_at` is known. Cards
+            show :meth:`day_label`.
         time_human: Human‑friendly time (e.g. ``19:00``).
         google_maps_url: Link to open the location in Google Maps.
         players_current: Number of already confirmed players.
@@ -48,6 +88,8 @@ class Match:
         rules: Description of match rules.
         refund_policy: Short explanation of refund policy.
         status: One of :class:`MatchStatus` values.
+        starts_at: Start time, if known (matches created in the bot).
+        city: Internal code of the city the match is played in.
     """
 
     id: int
@@ -65,6 +107,20 @@ class Match:
     rules: str
     refund_policy: str
     status: MatchStatus
+    starts_at: Optional[datetime] = None
+    city: str = DEFAULT_CITY
+
+    def day_label(self, now: Optional[datetime] = None) -> str:
+        """
+        Describe the day of the match relative to ``now`` (by default the
+        current time in the zone of :attr:`starts_at`), e.g. ``завтра``.
+
+        Matches without :attr:`starts_at` keep their :attr:`date_human`.
+        """
+
+        if self.starts_at is None:
+            return self.date_human
+        return format_day(self.starts_at, now or datetime.now(self.starts_at.tzinfo))
 
 
 # Simple in‑memory list of sample matches
@@ -140,18 +196,175 @@ MOCK_MATCHES: List[Match] = [
 ]
 
 
-def get_matches_by_sport(sport: str) -> List[Match]:
+class SportSnapshots:
+    """
+    Copy-on-write views of matches, one tuple per sport.
+
+    Published matches are copies owned by the snapshot: writers never
+    change them, and readers must not either.
+
+    Args:
+        matches: Existing matches to publish.
+    """
+
+    def __init__(self, matches: Iterable[Match] = ()) -> None:
+        self._views: Dict[str, Tuple[Match, ...]] = {}
+        self._rows: Dict[int, int] = {}
+        self._versions: Dict[str, int] = {}
+        # Serializes writers only; readers never take it
+        self._write_lock = threading.Lock()
+        for match in matches:
+            self.publish(match, MatchChange.CREATED)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def view(self, sport: str) -> Tuple[Match, ...]:
+        """
+        Return the current snapshot of the matches of ``sport``, in
+        storage order.
+        """
+
+        return self._views.get(sport, ())
+
+    def version(self, sport: str) -> int:
+        """
+        Return a counter that grows with every change of ``sport``.
+        """
+
+        return self._versions.get(sport, 0)
+
+    def publish(self, match: Match, change: MatchChange) -> Optional[Match]:
+        """
+        Publish a new version of the view that contains ``match``.
+
+        Returns:
+            The published copy, or ``None`` if ``change`` does not alter
+            the match or it is not in a view.
+        """
+
+        if change not in (
+            MatchChange.CREATED,
+            MatchChange.SEAT_TAKEN,
+            MatchChange.SEAT_RELEASED,
+        ):
+            return None
+        with self._write_lock:
+            view = self._views.get(match.sport, ())
+            copy = replace(match)
+            if change is MatchChange.CREATED:
+                self._rows[match.id] = len(view)
+                view = (*view, copy)
+            else:
+                row = self._rows.get(match.id)
+                if row is None:
+                    return None
+                view = (*view[:row], copy, *view[row + 1 :])
+            self._views[match.sport] = view
+            self._versions[match.sport] = self._versions.get(match.sport, 0) + 1
+        return copy
+
+
+# Process-wide snapshots of MOCK_MATCHES, published before listeners run
+SNAPSHOTS = SportSnapshots(MOCK_MATCHES)
+
+# Stored matches by id
+_by_id: Dict[int, Match] = {match.id: match for match in MOCK_MATCHES}
+# Users holding a seat, per match id; seats taken without a user (like the
+# organizer's) are only counted
+_holders: Dict[int, Set[int]] = {}
+
+
+class MatchSource(Protocol):
+    """
+    Provider of matches that are not stored until booked.
+
+    Listed matches are read-only copies, like snapshot ones; :meth:`get`
+    returns the object that :func:`take_seat` stores on the first booking.
+    """
+
+    def get(self, match_id: int) -> Optional[Match]:
+        """
+        Return the match with ``match_id``, if the source has it.
+        """
+
+    def upcoming(self, sport: str, city: Optional[str] = None) -> Tuple[Match, ...]:
+        """
+        Return the unbooked matches of ``sport`` to list now.
+        """
+
+    def version(self, sport: str) -> str:
+        """
+        Return a value that changes whenever :meth:`upcoming` may.
+        """
+
+
+_sources: List[MatchSource] = []
+
+
+def add_match_source(source: MatchSource) -> None:
+    """
+    List and look up the matches of ``source`` along with stored ones.
+    """
+
+    _sources.append(source)
+
+
+def get_source_matches(sport: str, city: Optional[str] = None) -> Tuple[Match, ...]:
+    """
+    Retrieve the unbooked matches of ``sport`` from all sources.
+
+    Args:
+        sport: Internal sport code to filter by.
+        city: Internal city code, ``None`` for all cities.
+    """
+
+    if not _sources:
+        return ()
+    return tuple(match for source in _sources for match in source.upcoming(sport, city))
+
+
+def get_matches_by_sport(sport: str) -> Tuple[Match, ...]:
     """
     Retrieve all matches for a particular sport.
 
     Args:
         sport: Internal sport code to filter by.
 
+    Returns:
+        Current snapshot of :class:`Match` copies, see :class:`SportSnapshots`,
+        followed by the unbooked matches of the sources.
+    """
+
+    return SNAPSHOTS.view(sport) + get_source_matches(sport)
+
+
+def get_matches_version(sport: str) -> str:
+    """
+    Return a value that changes whenever :func:`get_matches_by_sport`
+    may return something else for ``sport``.
+    """
+
+    versions = [str(SNAPSHOTS.version(sport))]
+    versions.extend(source.version(sport) for source in _sources)
+    return ".".join(versions)
+
+
+def load_city_matches(city: str) -> List[Match]:
+    """
+    Retrieve all matches played in a city, in storage order.
+
+    Used to build a city partition (see :mod:`oynaiq_bot.data.cities`);
+    with a real database this becomes one query by the ``city`` column.
+
+    Args:
+        city: Internal city code.
+
     Returns:
         List of :class:`Match` objects.
     """
 
-    return [m for m in MOCK_MATCHES if m.sport == sport]
+    return [m for m in MOCK_MATCHES if m.city == city]
 
 
 def get_match_by_id(match_id: int) -> Optional[Match]:
@@ -165,7 +378,112 @@ def get_match_by_id(match_id: int) -> Optional[Match]:
         Match instance if found, otherwise ``None``.
     """
 
-    return next((m for m in MOCK_MATCHES if m.id == match_id), None)
+    match = _by_id.get(match_id)
+    if match is None:
+        for source in _sources:
+            match = source.get(match_id)
+            if match is not None:
+                break
+    return match
+
+
+MatchListener = Callable[[Match, MatchChange], None]
+
+_listeners: List[MatchListener] = []
+
+
+def add_match_listener(listener: MatchListener) -> None:
+    """
+    Call ``listener(match, change)`` after every match mutation.
+
+    Listeners run synchronously in the mutating handler and must be cheap.
+    """
+
+    _listeners.append(listener)
+
+
+def _notify(match: Match, change: MatchChange) -> None:
+    SNAPSHOTS.publish(match, change)
+    for listener in _listeners:
+        listener(match, change)
+
+
+def add_match(match: Match) -> None:
+    """
+    Store a newly created match.
+    """
+
+    MOCK_MATCHES.append(match)
+    _by_id[match.id] = match
+    _notify(match, MatchChange.CREATED)
+
+
+def holds_seat(match_id: int, user_id: int) -> bool:
+    """
+    Whether ``user_id`` holds a seat of the match ``match_id``.
+    """
+
+    return user_id in _holders.get(match_id, ())
+
+
+def take_seat(match: Match, user_id: Optional[int] = None) -> bool:
+    """
+    Give one seat of ``match`` to a confirmed player.
+
+    A match from a source (see :func:`add_match_source`) is stored first.
+
+    Args:
+        match: Match to book.
+        user_id: Player taking the seat; a player holds at most one seat
+            of a match, and taking it again changes nothing.
+
+    Returns:
+        ``False`` if the match is already full.
+    """
+
+    if user_id is not None and holds_seat(match.id, user_id):
+        return True
+    if match.players_current >= match.players_total:
+        return False
+    if match.id not in _by_id:
+        add_match(match)
+    if user_id is not None:
+        _holders.setdefault(match.id, set()).add(user_id)
+    match.players_current += 1
+    _notify(match, MatchChange.SEAT_TAKEN)
+    return True
+
+
+def release_seat(match: Match, user_id: Optional[int] = None) -> bool:
+    """
+    Free one seat of ``match``, e.g. when a player cancels.
+
+    Args:
+        match: Match to release a seat of.
+        user_id: Player giving the seat up; only a seat this player
+            holds is released.
+
+    Returns:
+        ``False`` if no seat was taken (by ``user_id``, if given).
+    """
 
+    if user_id is not None:
+        holders = _holders.get(match.id)
+        if holders is None or user_id not in holders:
+            return False
+        holders.discard(user_id)
+        if not holders:
+            del _holders[match.id]
+    if match.players_current <= 0:
+        return False
+    match.players_current -= 1
+    _notify(match, MatchChange.SEAT_RELEASED)
+    return True
 
 
+def record_deposit(match: Match) -> None:
+    """
+    Register a verified deposit payment for ``match``.
+    """
+
+    _notify(match, MatchChange.DEPOSIT_PAID)
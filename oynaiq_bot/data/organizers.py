@@ -0,0 +1,117 @@
+"""
+Per-organizer index of matches with running aggregates.
+
+:data:`ORGANIZERS` keeps, for every ``organizer_username``, the list of
+the organizer's matches and an :class:`OrganizerStats` record. Both are
+updated from match change notifications (see
+:func:`~oynaiq_bot.data.matches.add_match_listener`) in O(1), so the
+``/my_games`` dashboard never scans the match storage.
+
+The index is built from the storage on import and only sees later
+changes, so it must be imported before the first deposit is paid:
+deposits cannot be reconstructed from the matches themselves.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from oynaiq_bot.data.matches import (
+    MOCK_MATCHES,
+    Match,
+    MatchChange,
+    add_match_listener,
+)
+
+
+@dataclass
+class OrganizerStats:
+    """
+    Running totals over the matches of one organizer.
+
+    Attributes:
+        games: Number of matches.
+        seats_total: Sum of ``players_total``.
+        players_confirmed: Sum of ``players_current``.
+        deposits_collected: Sum of verified deposits in tenge.
+    """
+
+    games: int = 0
+    seats_total: int = 0
+    players_confirmed: int = 0
+    deposits_collected: int = 0
+
+    @property
+    def fill_ratio(self) -> float:
+        """
+        Share of taken seats over all matches, from ``0`` to ``1``.
+        """
+
+        return self.players_confirmed / self.seats_total if self.seats_total else 0.0
+
+
+def organizer_key(username: str) -> str:
+    """
+    Normalize an organizer username (Telegram usernames ignore case).
+    """
+
+    return username.lstrip("@").lower()
+
+
+class OrganizerIndex:
+    """
+    Reverse index ``organizer -> matches`` with :class:`OrganizerStats`.
+
+    Args:
+        matches: Existing matches to index.
+    """
+
+    def __init__(self, matches: Iterable[Match] = ()) -> None:
+        self._matches: Dict[str, List[Match]] = {}
+        self._stats: Dict[str, OrganizerStats] = {}
+        for match in matches:
+            self.on_change(match, MatchChange.CREATED)
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Apply one match mutation to the aggregates.
+        """
+
+        key = organizer_key(match.organizer_username)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = OrganizerStats()
+
+        if change is MatchChange.CREATED:
+            self._matches.setdefault(key, []).append(match)
+            stats.games += 1
+            stats.seats_total += match.players_total
+            stats.players_confirmed += match.players_current
+        elif change is MatchChange.SEAT_TAKEN:
+            stats.players_confirmed += 1
+        elif change is MatchChange.SEAT_RELEASED:
+            stats.players_confirmed -= 1
+        elif change is MatchChange.DEPOSIT_PAID:
+            stats.deposits_collected += match.deposit
+
+    def stats(self, username: str) -> OrganizerStats:
+        """
+        Return the totals of an organizer (zeros for unknown ones).
+        """
+
+        return self._stats.get(organizer_key(username)) or OrganizerStats()
+
+    def latest(self, username: str, limit: int) -> List[Match]:
+        """
+        Return up to ``limit`` most recently created matches of an organizer,
+        newest first.
+        """
+
+        matches = self._matches.get(organizer_key(username), [])
+        return matches[: -limit - 1 : -1] if limit > 0 else []
+
+
+# Process-wide index over MOCK_MATCHES
+ORGANIZERS = OrganizerIndex(MOCK_MATCHES)
+add_match_listener(ORGANIZERS.on_change)
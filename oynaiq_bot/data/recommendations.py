@@ -0,0 +1,317 @@
+"""
+Personalized ranking of matches.
+
+Every match is reduced to a few numeric features kept column-wise in
+:mod:`array` arrays, one set of columns per sport:
+
+* free seats, level, deposit and hours until the start, the latter
+  recomputed every hour;
+* a *static* score combining the user-independent terms, updated when a
+  seat is taken or released and with the hours.
+
+Every user has a small preference vector (preferred level, usual deposit,
+number of confirmations) learned from past confirmations, plus the venues
+they played at. Ranking adds the user-dependent terms to the static score
+in one pass over the columns and keeps the best ``k`` rows in a bounded
+heap, so a request costs O(n log k) without building any per-match object.
+
+Every city has its own :class:`Recommender` over its matches (see
+:mod:`oynaiq_bot.data.cities`); user profiles live in :data:`PROFILES`,
+shared by all of them.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from oynaiq_bot.data.matches import Match, MatchChange
+
+
+# Score weights
+W_FREE = 1.0
+W_SOON = 1.5
+W_LEVEL = 1.0
+W_DEPOSIT = 0.5
+W_HISTORY = 0.75
+# Full matches still appear, but after everything bookable
+FULL_PENALTY = 100.0
+
+FREE_CAP = 5
+WEEK_HOURS = 7 * 24
+DEPOSIT_SCALE = 1000.0
+HISTORY_CAP = 3
+
+LEVELS: Dict[str, float] = {
+    "новички": 0.0,
+    "любители": 1.0,
+    "продвинутые": 2.0,
+    "профи": 3.0,
+}
+DEFAULT_LEVEL = 1.0
+DEFAULT_DEPOSIT = 200.0
+
+DAYS_AHEAD: Dict[str, int] = {"сегодня": 0, "завтра": 1, "послезавтра": 2}
+# Weekdays and free-form dates are assumed to be a few days away
+DEFAULT_DAYS_AHEAD = 3
+
+# Indexes in a user preference vector
+PREF_LEVEL = 0
+PREF_DEPOSIT = 1
+PREF_COUNT = 2
+
+
+def parse_level(level: str) -> float:
+    """
+    Map a level description such as ``новички/любители`` to a number.
+    """
+
+    values = [LEVELS[part.strip()] for part in level.lower().split("/") if part.strip() in LEVELS]
+    return sum(values) / len(values) if values else DEFAULT_LEVEL
+
+
+def start_hours(match: Match) -> float:
+    """
+    Estimate the hours from the start of today until the match begins.
+    """
+
+    if match.starts_at is not None:
+        now = datetime.now(match.starts_at.tzinfo)
+        hours = (match.starts_at - now).total_seconds() / 3600 + now.hour + now.minute / 60
+        return max(hours, 0.0)
+    days = DAYS_AHEAD.get(match.date_human.strip().lower(), DEFAULT_DAYS_AHEAD)
+    hour = 12.0
+    hours, _, minutes = match.time_human.partition(":")
+    if hours.isdigit():
+        hour = int(hours) + (int(minutes) / 60 if minutes.isdigit() else 0.0)
+    return days * 24 + hour
+
+
+def static_score(free: int, hours: float) -> float:
+    """
+    User-independent part of the score.
+    """
+
+    score = W_FREE * min(free, FREE_CAP) / FREE_CAP - W_SOON * hours / WEEK_HOURS
+    return score - FULL_PENALTY if free <= 0 else score
+
+
+class _SportColumns:
+    """
+    Feature columns of the matches of one sport.
+    """
+
+    def __init__(self) -> None:
+        self.matches: List[Match] = []
+        self.rows: Dict[int, int] = {}
+        self.free = array("i")
+        self.level = array("d")
+        self.deposit = array("d")
+        self.hours = array("d")
+        self.venue = array("i")
+        self.static = array("d")
+
+    def append(self, match: Match, venue: int) -> None:
+        free = max(match.players_total - match.players_current, 0)
+        hours = start_hours(match)
+        self.rows[match.id] = len(self.matches)
+        self.matches.append(match)
+        self.free.append(free)
+        self.level.append(parse_level(match.level))
+        self.deposit.append(float(match.deposit))
+        self.hours.append(hours)
+        self.venue.append(venue)
+        self.static.append(static_score(free, hours))
+
+    def refresh(self, match: Match) -> None:
+        row = self.rows.get(match.id)
+        if row is None:
+            return
+        self.matches[row] = match
+        free = max(match.players_total - match.players_current, 0)
+        self.free[row] = free
+        self.static[row] = static_score(free, self.hours[row])
+
+    def refresh_hours(self) -> None:
+        for row, match in enumerate(self.matches):
+            hours = self.hours[row] = start_hours(match)
+            self.static[row] = static_score(self.free[row], hours)
+
+
+class UserProfiles:
+    """
+    Preferences and venue history of users, learned from confirmations.
+
+    Profiles do not depend on the indexed matches, so one instance is
+    shared by the recommenders of all cities (see
+    :mod:`oynaiq_bot.data.cities`) and survives their eviction.
+    """
+
+    def __init__(self) -> None:
+        self._venues: Dict[str, int] = {}
+        self._prefs: Dict[int, array] = {}
+        self._history: Dict[int, Dict[int, int]] = {}
+
+    def record_confirmation(self, user_id: int, match: Match) -> None:
+        """
+        Learn from a user confirming or paying for ``match``.
+        """
+
+        prefs = self._prefs.get(user_id)
+        if prefs is None:
+            prefs = self._prefs[user_id] = array("d", (DEFAULT_LEVEL, DEFAULT_DEPOSIT, 0.0))
+        # Running means with the defaults counted as one observation
+        weight = prefs[PREF_COUNT] + 1
+        prefs[PREF_LEVEL] += (parse_level(match.level) - prefs[PREF_LEVEL]) / (weight + 1)
+        prefs[PREF_DEPOSIT] += (match.deposit - prefs[PREF_DEPOSIT]) / (weight + 1)
+        prefs[PREF_COUNT] = weight
+
+        venue = self.venue_id(match.location)
+        history = self._history.setdefault(user_id, {})
+        history[venue] = history.get(venue, 0) + 1
+
+    def prefs(self, user_id: Optional[int]) -> Optional[array]:
+        """
+        Return the preference vector of a user, if any was learned.
+        """
+
+        return self._prefs.get(user_id) if user_id is not None else None
+
+    def history(self, user_id: Optional[int]) -> Dict[int, int]:
+        """
+        Return confirmations of a user per venue id.
+        """
+
+        return self._history.get(user_id, {}) if user_id is not None else {}
+
+    def venue_id(self, location: str) -> int:
+        """
+        Return the numeric id of a venue, assigning one on first use.
+        """
+
+        key = location.strip().lower()
+        venue = self._venues.get(key)
+        if venue is None:
+            venue = self._venues[key] = len(self._venues)
+        return venue
+
+
+class Recommender:
+    """
+    Top-k ranking of matches per user.
+
+    Args:
+        matches: Existing matches to index.
+        profiles: User profiles to rank with; a private set by default.
+    """
+
+    def __init__(
+        self, matches: Iterable[Match] = (), profiles: Optional[UserProfiles] = None
+    ) -> None:
+        self.profiles = profiles if profiles is not None else UserProfiles()
+        self._sports: Dict[str, _SportColumns] = {}
+        # Hour (since the epoch) the hours column was computed in
+        self._hours_at = int(time.time() // 3600)
+        for match in matches:
+            self.on_change(match, MatchChange.CREATED)
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Keep the feature columns in sync with the match storage.
+        """
+
+        if change is MatchChange.CREATED:
+            columns = self._sports.get(match.sport)
+            if columns is None:
+                columns = self._sports[match.sport] = _SportColumns()
+            columns.append(match, self.profiles.venue_id(match.location))
+        elif change in (MatchChange.SEAT_TAKEN, MatchChange.SEAT_RELEASED):
+            columns = self._sports.get(match.sport)
+            if columns is not None:
+                columns.refresh(match)
+
+    def top(
+        self, user_id: Optional[int], sport: str, k: int, extra: Sequence[Match] = ()
+    ) -> List[Match]:
+        """
+        Return the ``k`` best matches of ``sport`` for a user, best first.
+
+        Args:
+            user_id: User to rank for, ``None`` for no personalization.
+            sport: Internal sport code.
+            k: Number of matches to return.
+            extra: Matches of ``sport`` that are not indexed, ranked along
+                with the indexed ones (e.g. unbooked occurrences of weekly
+                series, see :func:`~oynaiq_bot.data.matches.get_source_matches`).
+        """
+
+        hour = int(time.time() // 3600)
+        if hour != self._hours_at:
+            # Hours are counted from the start of today, which moves
+            for columns in self._sports.values():
+                columns.refresh_hours()
+            self._hours_at = hour
+
+        candidates = []
+        columns = self._sports.get(sport)
+        if columns is not None:
+            candidates.append(columns)
+        if extra:
+            columns = _SportColumns()
+            for match in extra:
+                columns.append(match, self.profiles.venue_id(match.location))
+            candidates.append(columns)
+        if not candidates or k <= 0:
+            return []
+
+        prefs = self.profiles.prefs(user_id)
+        pref_level = prefs[PREF_LEVEL] if prefs else DEFAULT_LEVEL
+        pref_deposit = prefs[PREF_DEPOSIT] if prefs else DEFAULT_DEPOSIT
+        history = self.profiles.history(user_id)
+        deposit_weight = W_DEPOSIT / DEPOSIT_SCALE
+        history_weight = W_HISTORY / HISTORY_CAP
+
+        heap: List[Tuple[float, int]] = []
+        # Score of the worst kept row; rows are visited in storage order,
+        # indexed before extra ones, so on a tie the earlier row stays
+        threshold = -math.inf
+        base = 0
+        for columns in candidates:
+            for row, static, level, deposit, venue in zip(
+                itertools.count(base),
+                columns.static,
+                columns.level,
+                columns.deposit,
+                columns.venue,
+            ):
+                score = static - W_LEVEL * abs(level - pref_level)
+                if deposit > pref_deposit:
+                    score -= deposit_weight * (deposit - pref_deposit)
+                if history:
+                    score += history_weight * min(history.get(venue, 0), HISTORY_CAP)
+                if score <= threshold:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, -row))
+                    if len(heap) == k:
+                        threshold = heap[0][0]
+                else:
+                    heapq.heapreplace(heap, (score, -row))
+                    threshold = heap[0][0]
+            base += len(columns.matches)
+
+        heap.sort(reverse=True)
+        first = candidates[0].matches
+        return [
+            first[-row] if -row < len(first) else candidates[1].matches[-row - len(first)]
+            for _, row in heap
+        ]
+
+
+# Process-wide user profiles, shared by the recommenders of all cities
+PROFILES = UserProfiles()
@@ -0,0 +1,255 @@
+"""
+Referral graph storage for OynaIQ.bot.
+
+A referral edge links an invited user to the referrer key from the
+``ref_<key>`` start payload (a username or a numeric id, see
+``/referral``). Only the first referral of a user counts.
+
+State lives in memory: edges, an invite counter per referrer and an
+incrementally maintained leaderboard. Changes are coalesced and appended
+to a :class:`~oynaiq_bot.data.journal.Journal` once per flush interval,
+so a viral burst of ``/start ref_...`` turns into one write per second
+instead of one per user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.journal import Journal
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0
+# Pending edges that trigger a flush without waiting for the interval
+MAX_PENDING_EDGES = 1000
+LEADERBOARD_SIZE = 10
+# Journals with more records than this are compacted on startup
+COMPACT_RECORDS = 1000
+
+
+def normalize_referrer(key: str) -> str:
+    """
+    Normalize a referrer key: usernames are case-insensitive.
+    """
+
+    return key.strip().lstrip("@").lower()
+
+
+class Leaderboard:
+    """
+    Top-N referrers, updated in place as counters grow.
+
+    Counters only increase, so an update moves an entry up by a few
+    positions at most; with a small N this is cheaper than keeping a heap
+    and needs no sorting on read.
+
+    Args:
+        size: Number of entries to keep.
+    """
+
+    def __init__(self, size: int = LEADERBOARD_SIZE) -> None:
+        self.size = size
+        self._entries: List[Tuple[int, str]] = []
+        self._keys: Set[str] = set()
+
+    def update(self, key: str, count: int) -> None:
+        """
+        Record the new counter value of ``key``.
+        """
+
+        entries = self._entries
+        if key in self._keys:
+            idx = next(i for i, (_, k) in enumerate(entries) if k == key)
+            entries[idx] = (count, key)
+        elif len(entries) < self.size:
+            entries.append((count, key))
+            self._keys.add(key)
+            idx = len(entries) - 1
+        elif count > entries[-1][0]:
+            self._keys.discard(entries[-1][1])
+            entries[-1] = (count, key)
+            self._keys.add(key)
+            idx = len(entries) - 1
+        else:
+            return
+
+        # Bubble up; equal counts keep their order, earlier referrers stay ahead
+        while idx and entries[idx - 1][0] < count:
+            entries[idx - 1], entries[idx] = entries[idx], entries[idx - 1]
+            idx -= 1
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Return ``(referrer, count)`` pairs, best first.
+        """
+
+        return [(key, count) for count, key in self._entries[:limit]]
+
+
+class ReferralStore:
+    """
+    In-memory referral graph with batched journal writes.
+
+    Args:
+        flush_interval: Seconds changes may stay in memory before written.
+        leaderboard_size: Number of referrers in the leaderboard.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = FLUSH_INTERVAL,
+        leaderboard_size: int = LEADERBOARD_SIZE,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.referrer_of: Dict[int, str] = {}
+        self.counts: Dict[str, int] = {}
+        self.leaderboard = Leaderboard(leaderboard_size)
+        self._journal: Optional[Journal] = None
+        self._pending: List[Tuple[int, str]] = []
+        self._dirty: Set[str] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def opened(self) -> bool:
+        """
+        Whether the store is backed by a journal.
+        """
+
+        return self._journal is not None
+
+    def open(self, path: Path) -> None:
+        """
+        Load the journal and persist further changes to it.
+
+        Records look like ``{"edges": [[user_id, referrer], ...],
+        "counts": {referrer: total}}``; counters are absolute, so the
+        last record of a referrer wins.
+        """
+
+        journal = Journal(path)
+        records = 0
+        for record in journal.load():
+            records += 1
+            for user_id, referrer in record.get("edges", ()):
+                self.referrer_of.setdefault(user_id, referrer)
+            self.counts.update(record.get("counts", {}))
+        for referrer, count in self.counts.items():
+            self.leaderboard.update(referrer, count)
+
+        if records > COMPACT_RECORDS:
+            journal.rewrite([self._snapshot()])
+        self._journal = journal
+        logger.info(
+            "Loaded %d referral edges for %d referrers", len(self.referrer_of), len(self.counts)
+        )
+
+    def add(self, user_id: int, referrer: str, own_keys: Tuple[str, ...] = ()) -> bool:
+        """
+        Record that ``user_id`` came by the ``referrer`` link.
+
+        Args:
+            user_id: Telegram id of the invited user.
+            referrer: Key from the ``ref_<key>`` payload.
+            own_keys: The invited user's own keys (username, id), to
+                ignore self-referrals.
+
+        Returns:
+            ``True`` if the referral was counted, ``False`` for repeated
+            ``/start`` of an already referred user or a self-referral.
+        """
+
+        referrer = normalize_referrer(referrer)
+        if not referrer or user_id in self.referrer_of:
+            return False
+        if referrer in {normalize_referrer(key) for key in own_keys}:
+            return False
+
+        self.referrer_of[user_id] = referrer
+        count = self.counts[referrer] = self.counts.get(referrer, 0) + 1
+        self.leaderboard.update(referrer, count)
+
+        if self._journal is not None:
+            self._pending.append((user_id, referrer))
+            self._dirty.add(referrer)
+            if len(self._pending) >= MAX_PENDING_EDGES:
+                self.flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.flush_interval, self.flush
+                )
+        return True
+
+    def count(self, referrer: str) -> int:
+        """
+        Return the number of users invited by ``referrer``.
+        """
+
+        return self.counts.get(normalize_referrer(referrer), 0)
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Return the best referrers as ``(referrer, count)`` pairs.
+        """
+
+        return self.leaderboard.top(limit)
+
+    def flush(self) -> None:
+        """
+        Append pending edges and coalesced counters as one journal record.
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._journal is None:
+            return
+
+        record = {
+            "edges": self._pending,
+            "counts": {referrer: self.counts[referrer] for referrer in self._dirty},
+        }
+        self._pending, self._dirty = [], set()
+        self._journal.write([record])
+
+    async def close(self, budget: float) -> int:
+        """
+        Flush hook: write pending changes and close the journal.
+
+        Returns:
+            Number of dropped edges (always ``0``).
+        """
+
+        self.flush()
+        if self._journal is not None:
+            await self._journal.close()
+        return 0
+
+    def _snapshot(self) -> Dict[str, object]:
+        return {
+            "edges": [[user_id, referrer] for user_id, referrer in self.referrer_of.items()],
+            "counts": dict(self.counts),
+        }
+
+
+# Process-wide referral store
+REFERRALS = ReferralStore()
+
+
+def setup_referrals(settings: Settings) -> None:
+    """
+    Back :data:`REFERRALS` with a journal in :attr:`Settings.state_dir`.
+
+    Calling it again has no effect.
+    """
+
+    if REFERRALS.opened:
+        return
+    REFERRALS.open(Path(settings.state_dir) / "referrals.jsonl")
+    SHUTDOWN_HOOKS.register("referrals", REFERRALS.close)
@@ -0,0 +1,122 @@
+"""
+Prefix search over matches.
+
+Every match is split into words: its sport (code and label from
+:data:`~oynaiq_bot.utils.navigator.SPORTS`), title and location. Each
+prefix of every word maps to the set of matching ids, so a query word is
+answered by one dict lookup and a multi-word query by intersecting a few
+sets, whatever the number of matches. Answers to repeated queries (every
+keystroke of an inline query is a new one) are memoized until the index
+changes.
+
+Every city has its own index (see :mod:`oynaiq_bot.data.cities`).
+"""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from oynaiq_bot.data.matches import Match, MatchChange
+from oynaiq_bot.utils.navigator import SPORTS
+
+
+# Longer words are indexed by their first MAX_PREFIX characters only
+MAX_PREFIX = 20
+MAX_CACHED_QUERIES = 4096
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words, treating «ё» as «е».
+    """
+
+    return _WORD_RE.findall(text.lower().replace("ё", "е"))
+
+
+def match_words(match: Match) -> Set[str]:
+    """
+    Return the searchable words of a match, cut to :data:`MAX_PREFIX`.
+    """
+
+    sport_label = SPORTS.get(match.sport, "")
+    words = tokenize(f"{match.sport} {sport_label} {match.title} {match.location}")
+    return {word[:MAX_PREFIX] for word in words}
+
+
+def matches_query(match: Match, query: str) -> bool:
+    """
+    Whether every word of ``query`` starts some word of ``match``; the
+    check :meth:`MatchSearchIndex.search` makes, for a match that is not
+    indexed.
+    """
+
+    words = match_words(match)
+    return all(
+        any(word.startswith(part[:MAX_PREFIX]) for word in words) for part in tokenize(query)
+    )
+
+
+class MatchSearchIndex:
+    """
+    Word prefix -> match ids index with memoized query results.
+
+    Args:
+        matches: Existing matches to index.
+    """
+
+    def __init__(self, matches: Iterable[Match] = ()) -> None:
+        self._prefixes: Dict[str, Set[int]] = {}
+        self._ids: List[int] = []
+        self._results: "OrderedDict[Tuple[str, ...], Tuple[int, ...]]" = OrderedDict()
+        for match in matches:
+            self.add(match)
+
+    def add(self, match: Match) -> None:
+        """
+        Index a match.
+        """
+
+        prefixes = self._prefixes
+        for word in match_words(match):
+            for end in range(1, len(word) + 1):
+                prefixes.setdefault(word[:end], set()).add(match.id)
+        self._ids.append(match.id)
+        self._results.clear()
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Index matches as they are created.
+        """
+
+        if change is MatchChange.CREATED:
+            self.add(match)
+
+    def search(self, query: str) -> Tuple[int, ...]:
+        """
+        Return ids of matches where every query word starts some word of
+        the match, in storage order. An empty query matches everything.
+        """
+
+        words = tuple(word[:MAX_PREFIX] for word in tokenize(query))
+        results = self._results
+        cached = results.get(words)
+        if cached is not None:
+            results.move_to_end(words)
+            return cached
+
+        if not words:
+            found = tuple(self._ids)
+        else:
+            sets = sorted((self._prefixes.get(word, set()) for word in words), key=len)
+            matched = set(sets[0]).intersection(*sets[1:]) if sets[0] else set()
+            found = tuple(sorted(matched))
+
+        results[words] = found
+        if len(results) > MAX_CACHED_QUERIES:
+            results.popitem(last=False)
+        return found
+
@@ -0,0 +1,299 @@
+"""
+Recurring weekly matches.
+
+A venue that runs the same slot every week is stored as one
+:class:`MatchSeries`: a template :class:`~oynaiq_bot.data.matches.Match`,
+the start of the first game and the dates on which the game is skipped.
+Occurrences are never expanded ahead of time. :data:`SERIES` is a
+:class:`~oynaiq_bot.data.matches.MatchSource`, so
+
+* listings get the occurrences of the next :data:`WINDOW_DAYS` days,
+  computed from the rule with a few additions per series and cached until
+  the day or the series change;
+* :func:`~oynaiq_bot.data.matches.get_match_by_id` builds the occurrence
+  whose id it is asked for, the id encoding the series and the week;
+* :func:`~oynaiq_bot.data.matches.take_seat` stores an occurrence as a
+  regular match on its first booking; from then on it is listed, changed
+  and found like any other match.
+
+A series with years of weekly games therefore costs one record, and
+listing a sport costs the same whatever the length of its series.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from weakref import WeakValueDictionary
+from zoneinfo import ZoneInfo
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.matches import (
+    Match,
+    MatchChange,
+    add_match_listener,
+    add_match_source,
+)
+from oynaiq_bot.utils.dates import format_date
+
+
+logger = logging.getLogger(__name__)
+
+# Days ahead, including today, whose occurrences are listed
+WINDOW_DAYS = 7
+# Occurrence ids are OCCURRENCE_BASE + series id * MAX_OCCURRENCES + week
+OCCURRENCE_BASE = 1_000_000_000
+MAX_OCCURRENCES = 10_000
+
+WEEK = timedelta(weeks=1)
+
+
+def is_occurrence_id(match_id: int) -> bool:
+    """
+    Whether ``match_id`` is the id of a series occurrence.
+    """
+
+    return match_id >= OCCURRENCE_BASE
+
+
+@dataclass
+class MatchSeries:
+    """
+    A match repeated every week.
+
+    Attributes:
+        id: Series identifier, part of the ids of its occurrences.
+        template: Fields shared by the occurrences; its ``id``,
+            ``starts_at``, ``date_human`` and ``time_human`` are replaced.
+        first_start: Start of the first occurrence (timezone-aware); the
+            others follow at the same local time every week.
+        skipped: Dates on which the game is not played.
+    """
+
+    id: int
+    template: Match
+    first_start: datetime
+    skipped: Set[date] = field(default_factory=set)
+
+    def occurrence_id(self, index: int) -> int:
+        """
+        Return the match id of the occurrence in week ``index``.
+        """
+
+        return OCCURRENCE_BASE + self.id * MAX_OCCURRENCES + index
+
+    def starts_at(self, index: int) -> datetime:
+        """
+        Return the start of the occurrence in week ``index``.
+        """
+
+        # Same wall-clock time even if the UTC offset changes in between
+        day = self.first_start.date() + index * WEEK
+        return datetime.combine(day, self.first_start.timetz())
+
+    def is_played(self, index: int) -> bool:
+        """
+        Whether the game of week ``index`` takes place.
+        """
+
+        return 0 <= index < MAX_OCCURRENCES and self.starts_at(index).date() not in self.skipped
+
+    def indexes(self, first_day: date, last_day: date) -> Iterator[int]:
+        """
+        Yield the weeks whose games are played from ``first_day`` to
+        ``last_day`` inclusive.
+        """
+
+        # First week on or after first_day
+        index = max(-(-(first_day - self.first_start.date()).days // 7), 0)
+        while index < MAX_OCCURRENCES and self.starts_at(index).date() <= last_day:
+            if self.is_played(index):
+                yield index
+            index += 1
+
+    def occurrence(self, index: int) -> Match:
+        """
+        Build the match of week ``index``.
+        """
+
+        starts_at = self.starts_at(index)
+        return replace(
+            self.template,
+            id=self.occurrence_id(index),
+            date_human=format_date(starts_at),
+            time_human=f"{starts_at:%H:%M}",
+            starts_at=starts_at,
+        )
+
+
+class SeriesStore:
+    """
+    Recurring series and the occurrences generated from them.
+
+    Args:
+        timezone: IANA time zone that decides what "today" is.
+    """
+
+    def __init__(self, timezone: str = "Asia/Almaty") -> None:
+        self.timezone = ZoneInfo(timezone)
+        self._series: Dict[int, MatchSeries] = {}
+        self._by_sport: Dict[str, List[MatchSeries]] = {}
+        # Occurrences stored by take_seat; they are no longer generated
+        self._booked: Set[int] = set()
+        # Occurrences handed out by get(), so every caller books the same object
+        self._handed_out: "WeakValueDictionary[int, Match]" = WeakValueDictionary()
+        self._listings: Dict[Tuple[str, Optional[str]], Tuple[Match, ...]] = {}
+        self._listings_day: Optional[date] = None
+        self._versions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __iter__(self) -> Iterator[MatchSeries]:
+        return iter(self._series.values())
+
+    def today(self) -> date:
+        """
+        Return the current date in :attr:`timezone`.
+        """
+
+        return datetime.now(self.timezone).date()
+
+    def add(self, template: Match, first_start: datetime) -> MatchSeries:
+        """
+        Start a weekly series whose first game is at ``first_start``.
+
+        Raises:
+            ValueError: If ``first_start`` is naive.
+        """
+
+        if first_start.tzinfo is None:
+            raise ValueError("first_start must be timezone-aware")
+        series = MatchSeries(max(self._series, default=0) + 1, template, first_start)
+        self._series[series.id] = series
+        self._by_sport.setdefault(template.sport, []).append(series)
+        self._changed(template.sport)
+        logger.info(
+            "Added weekly series %d (%s, %s)", series.id, template.title, template.location
+        )
+        return series
+
+    def find(self, match_id: int) -> Optional[Tuple[MatchSeries, int]]:
+        """
+        Return the series and week of an occurrence id, whether the game
+        is played or not.
+        """
+
+        if not is_occurrence_id(match_id):
+            return None
+        series_id, index = divmod(match_id - OCCURRENCE_BASE, MAX_OCCURRENCES)
+        series = self._series.get(series_id)
+        return None if series is None else (series, index)
+
+    def is_booked(self, match_id: int) -> bool:
+        """
+        Whether the occurrence ``match_id`` was stored by a booking.
+        """
+
+        return match_id in self._booked
+
+    def skip(self, match_id: int) -> bool:
+        """
+        Cancel one occurrence that nobody has booked yet.
+
+        Returns:
+            ``False`` if ``match_id`` is not a played, unbooked occurrence.
+        """
+
+        found = self.find(match_id)
+        if found is None or match_id in self._booked:
+            return False
+        series, index = found
+        if not series.is_played(index):
+            return False
+        series.skipped.add(series.starts_at(index).date())
+        self._handed_out.pop(match_id, None)
+        self._changed(series.template.sport)
+        return True
+
+    # MatchSource
+
+    def get(self, match_id: int) -> Optional[Match]:
+        """
+        Return the unbooked occurrence ``match_id``, if it is played.
+        """
+
+        match = self._handed_out.get(match_id)
+        if match is not None:
+            return match
+        found = self.find(match_id)
+        if found is None or match_id in self._booked or not found[0].is_played(found[1]):
+            return None
+        match = found[0].occurrence(found[1])
+        self._handed_out[match_id] = match
+        return match
+
+    def upcoming(self, sport: str, city: Optional[str] = None) -> Tuple[Match, ...]:
+        """
+        Return copies of the unbooked occurrences of ``sport`` in the next
+        :data:`WINDOW_DAYS` days, ordered by start.
+        """
+
+        series = self._by_sport.get(sport)
+        if not series:
+            return ()
+        today = self.today()
+        if self._listings_day != today:
+            self._listings.clear()
+            self._listings_day = today
+        listing = self._listings.get((sport, city))
+        if listing is None:
+            last_day = today + timedelta(days=WINDOW_DAYS - 1)
+            matches = [
+                item.occurrence(index)
+                for item in series
+                if city is None or item.template.city == city
+                for index in item.indexes(today, last_day)
+                if item.occurrence_id(index) not in self._booked
+            ]
+            matches.sort(key=lambda match: match.starts_at)
+            listing = self._listings[(sport, city)] = tuple(matches)
+        return listing
+
+    def version(self, sport: str) -> str:
+        """
+        Return the number of changes of ``sport`` and the current day.
+        """
+
+        return f"{self._versions.get(sport, 0)}-{self.today():%Y%m%d}"
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Stop generating an occurrence once it is stored.
+        """
+
+        if change is MatchChange.CREATED and self.find(match.id) is not None:
+            self._booked.add(match.id)
+            self._handed_out.pop(match.id, None)
+            self._changed(match.sport)
+
+    def _changed(self, sport: str) -> None:
+        self._versions[sport] = self._versions.get(sport, 0) + 1
+        for key in [key for key in self._listings if key[0] == sport]:
+            del self._listings[key]
+
+
+# Process-wide series, listed and looked up with the stored matches
+SERIES = SeriesStore()
+add_match_source(SERIES)
+add_match_listener(SERIES.on_change)
+
+
+def setup_series(settings: Settings) -> None:
+    """
+    Use :attr:`Settings.timezone` to decide which occurrences are listed.
+    """
+
+    SERIES.timezone = ZoneInfo(settings.timezone)
@@ -0,0 +1,310 @@
+"""
+Per-match waitlists with automatic promotion.
+
+Every match has a FIFO queue of waiting users. It is an
+:class:`~collections.OrderedDict` keyed by user id: a doubly linked list
+with a hash index, so joining, taking the head and cancelling anywhere
+in the queue are all O(1).
+
+When a seat of a match is released (see
+:func:`~oynaiq_bot.data.matches.release_seat`) and someone is waiting,
+the seat is taken again right away on behalf of the first user and held
+for them for :attr:`~oynaiq_bot.config.Settings.waitlist_hold` seconds.
+The user either accepts it, or declines / lets the hold expire, in which
+case the seat is released again and passes to the next user. A seat of a
+match with a deposit is accepted only by paying for it: the payment
+worker calls :meth:`Waitlist.accept` once the payment is verified.
+
+Hold deadlines are kept in one heap (with lazy deletion) and served by a
+single background task, which also sends the offers, instead of a timer
+task per waiting user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Tuple
+
+from aiogram import Bot, Dispatcher
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.matches import (
+    Match,
+    MatchChange,
+    add_match_listener,
+    get_match_by_id,
+    holds_seat,
+    release_seat,
+    take_seat,
+)
+from oynaiq_bot.keyboards.match_details import build_hold_keyboard
+from oynaiq_bot.runtime.events import EVENTS
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+
+
+logger = logging.getLogger(__name__)
+
+HOLD_SECONDS = 600.0
+
+
+@dataclass
+class Hold:
+    """
+    Seat offered to a user from the waitlist.
+
+    Attributes:
+        match_id: Match the seat belongs to.
+        user_id: User the seat is held for.
+        chat_id: Chat to send the offer to.
+        expires: Time when the hold passes to the next user.
+    """
+
+    match_id: int
+    user_id: int
+    chat_id: int
+    expires: float
+
+
+# Called with a hold and ``True`` once it expired, ``False`` when offered
+Notify = Callable[[Hold, bool], Awaitable[None]]
+
+
+class Waitlist:
+    """
+    FIFO waitlists of all matches and the seats held from them.
+
+    Args:
+        hold_seconds: How long a promoted user has to accept the seat.
+    """
+
+    def __init__(self, hold_seconds: float = HOLD_SECONDS) -> None:
+        self.hold_seconds = hold_seconds
+        self._queues: Dict[int, "OrderedDict[int, int]"] = {}
+        self._holds: Dict[Tuple[int, int], Hold] = {}
+        self._deadlines: List[Tuple[float, int, int]] = []
+        self._notices: Deque[Tuple[Hold, bool]] = deque()
+        self._wakeup = asyncio.Event()
+
+    def join(self, match_id: int, user_id: int, chat_id: int) -> int:
+        """
+        Put a user at the end of the waitlist of a match.
+
+        Returns:
+            Position of the user in the queue (1-based); ``0`` if the user
+            already has a seat of this match, held or confirmed.
+        """
+
+        if holds_seat(match_id, user_id):
+            return 0
+        queue = self._queues.setdefault(match_id, OrderedDict())
+        if user_id not in queue:
+            queue[user_id] = chat_id
+            return len(queue)
+        return self.position(match_id, user_id)
+
+    def leave(self, match_id: int, user_id: int) -> bool:
+        """
+        Remove a user from the waitlist of a match.
+
+        Returns:
+            ``False`` if the user was not waiting.
+        """
+
+        queue = self._queues.get(match_id)
+        if queue is None or queue.pop(user_id, None) is None:
+            return False
+        if not queue:
+            del self._queues[match_id]
+        return True
+
+    def position(self, match_id: int, user_id: int) -> int:
+        """
+        Return the 1-based position of a waiting user, ``0`` if absent.
+
+        Unlike the other operations this walks the queue.
+        """
+
+        for place, waiting in enumerate(self._queues.get(match_id, ()), start=1):
+            if waiting == user_id:
+                return place
+        return 0
+
+    def waiting(self, match_id: int) -> int:
+        """
+        Return the number of users waiting for a match.
+        """
+
+        return len(self._queues.get(match_id, ()))
+
+    def is_held(self, match_id: int, user_id: int) -> bool:
+        """
+        Whether a seat of a match is held for a user and not yet accepted.
+        """
+
+        return (match_id, user_id) in self._holds
+
+    def accept(self, match_id: int, user_id: int) -> bool:
+        """
+        Turn the hold of a user into a confirmed seat.
+
+        Returns:
+            ``False`` if the user has no active hold (e.g. it expired).
+        """
+
+        return self._holds.pop((match_id, user_id), None) is not None
+
+    def decline(self, match_id: int, user_id: int) -> bool:
+        """
+        Give a held seat up; it passes to the next waiting user.
+        """
+
+        if self._holds.pop((match_id, user_id), None) is None:
+            return False
+        self._release(match_id, user_id)
+        return True
+
+    def on_change(self, match: Match, change: MatchChange) -> None:
+        """
+        Offer every released seat to the head of the match waitlist.
+        """
+
+        if change is MatchChange.SEAT_RELEASED:
+            self._promote(match)
+
+    def expire(self, now: float) -> int:
+        """
+        Release the seats of holds that expired by ``now``.
+
+        Returns:
+            Number of expired holds.
+        """
+
+        expired = 0
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            expires, match_id, user_id = heapq.heappop(deadlines)
+            hold = self._holds.get((match_id, user_id))
+            # Skip holds already accepted or declined
+            if hold is None or hold.expires != expires:
+                continue
+            del self._holds[(match_id, user_id)]
+            EVENTS.emit("waitlist.expired", match_id=match_id, user_id=user_id)
+            self._notices.append((hold, True))
+            self._release(match_id, user_id)
+            expired += 1
+        return expired
+
+    async def run(self, notify: Notify) -> None:
+        """
+        Serve hold deadlines and deliver offers until cancelled.
+        """
+
+        while True:
+            self.expire(time.time())
+            while self._notices:
+                hold, expired = self._notices.popleft()
+                try:
+                    await notify(hold, expired)
+                except Exception:
+                    logger.exception("Failed to notify user %s about a seat", hold.user_id)
+
+            self._wakeup.clear()
+            if self._notices:
+                continue
+            delay = self._deadlines[0][0] - time.time() if self._deadlines else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _promote(self, match: Match) -> None:
+        queue = self._queues.get(match.id)
+        if not queue:
+            return
+        # Users who got a seat meanwhile (e.g. paid for one) stop waiting
+        while queue and holds_seat(match.id, next(iter(queue))):
+            queue.popitem(last=False)
+        if not queue:
+            del self._queues[match.id]
+            return
+        user_id, chat_id = next(iter(queue.items()))
+        if not take_seat(match, user_id):
+            return
+        del queue[user_id]
+        if not queue:
+            del self._queues[match.id]
+        hold = Hold(match.id, user_id, chat_id, time.time() + self.hold_seconds)
+        self._holds[(match.id, user_id)] = hold
+        heapq.heappush(self._deadlines, (hold.expires, match.id, user_id))
+        EVENTS.emit("waitlist.promoted", match_id=match.id, user_id=user_id)
+        self._notices.append((hold, False))
+        self._wakeup.set()
+
+    def _release(self, match_id: int, user_id: int) -> None:
+        match = get_match_by_id(match_id)
+        if match is not None:
+            # Promotes the next user through on_change
+            release_seat(match, user_id)
+
+
+# Process-wide waitlists, following seat releases of all matches
+WAITLIST = Waitlist()
+add_match_listener(WAITLIST.on_change)
+
+
+async def notify_hold(bot: Bot, hold: Hold, expired: bool) -> None:
+    """
+    Offer a held seat to its user or tell them the hold has expired.
+    """
+
+    match = get_match_by_id(hold.match_id)
+    if match is None:
+        return
+
+    if expired:
+        await bot.send_message(
+            hold.chat_id,
+            f"⌛ Время на подтверждение места в игре «{match.title}» вышло — "
+            "мы предложили его следующему в очереди.",
+        )
+        return
+
+    minutes = max(round((hold.expires - time.time()) / 60), 1)
+    pay = f"Оплати депозит {match.deposit} ₸, чтобы забрать его.\n" if match.deposit else ""
+    await bot.send_message(
+        hold.chat_id,
+        f"🎉 Освободилось место в игре «{match.title}»!\n"
+        f"📍 {match.location}, {match.day_label()} {match.time_human}\n"
+        f"{pay}"
+        f"Место держим за тобой {minutes} мин.",
+        reply_markup=build_hold_keyboard(match),
+    )
+
+
+def setup_waitlist(dp: Dispatcher, settings: Settings) -> None:
+    """
+    Run the hold scheduler of :data:`WAITLIST` while the bot is polling.
+    """
+
+    WAITLIST.hold_seconds = settings.waitlist_hold
+    tasks: List["asyncio.Task[None]"] = []
+
+    async def on_startup(bot: Bot) -> None:
+        async def notify(hold: Hold, expired: bool) -> None:
+            await notify_hold(bot, hold, expired)
+
+        tasks.append(asyncio.create_task(WAITLIST.run(notify), name="waitlist"))
+
+    async def stop(budget: float) -> int:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return 0
+
+    dp.startup.register(on_startup)
+    SHUTDOWN_HOOKS.register("waitlist", stop)
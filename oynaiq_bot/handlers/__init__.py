@@ -2,14 +2,17 @@
 Handlers subpackage for OynaIQ.bot.
 
 This module aggregates all routers so they can be easily included
-in the main dispatcher.
+in the main dispatcher. Rarely used routers (the create-game wizard steps,
+group announcements, the ``utils`` stubs and admin commands) are wrapped in :class:`LazyRouter`
+and imported on first use.
 """
 
 from __future__ import annotations
 
 from aiogram import Router
 
-from . import booking, find_team, match_details, matches, start, utils as handlers_utils
+from . import booking, find_team, inline, match_details, matches, organizer, start
+from .lazy import LazyRouter
 
 
 def get_routers() -> list[Router]:
@@ -22,11 +25,16 @@ def get_routers() -> list[Router]:
 
     return [
         start.router,
+        LazyRouter("oynaiq_bot.handlers.create_game"),
         find_team.router,
         matches.router,
         match_details.router,
         booking.router,
-        handlers_utils.router,
+        organizer.router,
+        inline.router,
+        LazyRouter("oynaiq_bot.handlers.announcements"),
+        LazyRouter("oynaiq_bot.handlers.utils"),
+        LazyRouter("oynaiq_bot.handlers.admin"),
     ]
 
 
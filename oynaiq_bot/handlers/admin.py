@@ -0,0 +1,84 @@
+"""
+Admin-only commands for OynaIQ.bot.
+
+Only users listed in :attr:`~oynaiq_bot.config.Settings.admin_ids` can use
+these commands; for everyone else the router stays silent.
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+from aiogram import Router
+from aiogram.filters import BaseFilter, Command, CommandObject
+from aiogram.types import FSInputFile, Message
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.runtime.profiler import PROFILER
+from oynaiq_bot.utils.sports import CATALOG
+
+
+router = Router(name="admin")
+
+# Upper bound for /profile so a typo cannot keep the profiler running for hours
+MAX_PROFILE_SECONDS = 300.0
+
+
+class AdminFilter(BaseFilter):
+    """
+    Pass only messages from users listed in ``settings.admin_ids``.
+    """
+
+    async def __call__(self, message: Message, settings: Settings) -> bool:
+        return message.from_user is not None and message.from_user.id in settings.admin_ids
+
+
+router.message.filter(AdminFilter())
+
+
+@router.message(Command("profile"))
+async def cmd_profile(message: Message, command: CommandObject, settings: Settings) -> None:
+    """
+    Run the sampling profiler and send back a collapsed-stack flamegraph file.
+
+    Usage: ``/profile`` or ``/profile <seconds>``.
+    """
+
+    try:
+        seconds = float(command.args) if command.args else settings.profile_seconds
+    except ValueError:
+        seconds = math.nan
+    # nan and inf parse as floats but cannot be clamped
+    if not math.isfinite(seconds):
+        await message.answer("Использование: /profile [секунды]")
+        return
+    seconds = min(max(seconds, 1.0), MAX_PROFILE_SECONDS)
+
+    if PROFILER.running:
+        await message.answer("Профилировщик уже запущен, дождись результата.")
+        return
+
+    await message.answer(f"🔬 Профилирую {seconds:.0f} с…")
+    path = await PROFILER.profile(seconds, Path(settings.profile_dir))
+    await message.answer_document(
+        FSInputFile(path),
+        caption="Collapsed stacks: flamegraph.pl или speedscope.app",
+    )
+
+
+@router.message(Command("reload_sports"))
+async def cmd_reload_sports(message: Message) -> None:
+    """
+    Reload the sport catalog from its file without a restart.
+
+    Keyboards built from the old catalog are dropped; if the file is
+    broken, the current catalog stays.
+    """
+
+    try:
+        count = CATALOG.reload()
+    except (OSError, ValueError) as exc:
+        await message.answer(f"Каталог не обновлён: {exc}")
+        return
+    await message.answer(f"Каталог видов спорта обновлён: {count} шт. (версия {CATALOG.version})")
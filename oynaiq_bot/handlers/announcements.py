@@ -0,0 +1,91 @@
+"""
+Match announcements in group chats.
+
+``/announce <id>`` posts a card of the match into the group, with reaction
+buttons under it. Clicks are counted in
+:data:`~oynaiq_bot.data.announcements.ANNOUNCEMENTS` and answered at once,
+while the card itself is refreshed through
+:data:`~oynaiq_bot.runtime.edits.EDITS`: however many people click, the
+card is edited at most once per :attr:`Settings.card_edit_interval`.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from aiogram import F, Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+
+from oynaiq_bot.data.announcements import ANNOUNCEMENTS, REACTIONS
+from oynaiq_bot.data.matches import get_match_by_id
+from oynaiq_bot.keyboards.announcements import build_reactions_keyboard
+from oynaiq_bot.runtime.edits import EDITS
+from oynaiq_bot.utils.formatter import format_announcement
+from oynaiq_bot.utils.navigator import ReactionCallback
+
+
+router = Router(name="announcements")
+
+GROUP_CHATS = {"group", "supergroup"}
+
+
+@router.message(Command("announce"), F.chat.type.in_(GROUP_CHATS))
+async def cmd_announce(message: Message, command: CommandObject) -> None:
+    """
+    Post an announcement card of a match into the current group.
+    """
+
+    args = (command.args or "").strip()
+    match = get_match_by_id(int(args)) if args.isdigit() else None
+    if match is None:
+        await message.answer("Укажи номер игры, например: /announce 1")
+        return
+
+    card = await message.answer(
+        format_announcement(match, dict.fromkeys(REACTIONS, 0)),
+        reply_markup=build_reactions_keyboard(match.id, {}),
+    )
+    ANNOUNCEMENTS.card(card.chat.id, card.message_id, match.id)
+
+
+@router.message(Command("announce"))
+async def cmd_announce_private(message: Message) -> None:
+    """
+    Explain that announcements are posted to groups.
+    """
+
+    await message.answer(
+        "Анонсы публикуются в группах: добавь бота в чат команды и отправь там "
+        "/announce <номер игры>."
+    )
+
+
+@router.callback_query(ReactionCallback.filter(F.reaction.in_(REACTIONS)))
+async def on_reaction(callback: CallbackQuery, callback_data: ReactionCallback) -> None:
+    """
+    Count a reaction and schedule a debounced refresh of the card.
+    """
+
+    message = callback.message
+    if message is None:
+        await callback.answer()
+        return
+
+    chat_id, message_id = message.chat.id, message.message_id
+    card = ANNOUNCEMENTS.card(chat_id, message_id, callback_data.match_id)
+    label = REACTIONS[callback_data.reaction]
+    if not card.react(callback.from_user.id, callback_data.reaction):
+        await callback.answer(f"Ты уже отметил: {label}")
+        return
+
+    def render() -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+        match = get_match_by_id(card.match_id)
+        if match is None:
+            return None
+        return format_announcement(match, card.counts), build_reactions_keyboard(
+            match.id, card.counts
+        )
+
+    EDITS.schedule(callback.bot, chat_id, message_id, render)
+    await callback.answer(f"Записали: {label}")
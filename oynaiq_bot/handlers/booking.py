@@ -1,57 +1,86 @@
 """
-Booking and mock payment handlers.
+Booking and payment handlers.
+
+Payments are not checked here: «Я оплатил через Kaspi» only queues the
+payment for :mod:`oynaiq_bot.payments.worker`, which confirms the seat
+once the provider has verified it. Without a payment provider (see
+:func:`~oynaiq_bot.payments.provider.payments_enabled`) deposit booking
+is refused.
 """
 
 from __future__ import annotations
 
+import time
+
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
 
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.idempotency import IDEMPOTENCY, idempotency_key
 from oynaiq_bot.data.matches import get_match_by_id
 from oynaiq_bot.keyboards.booking import build_booking_keyboard
+from oynaiq_bot.payments.models import Payment, payment_id
+from oynaiq_bot.payments.provider import payments_enabled
+from oynaiq_bot.payments.queue import PAYMENTS
+from oynaiq_bot.runtime.events import EVENTS
 from oynaiq_bot.utils.navigator import BookingCallback, PaymentCallback
 
 
 router = Router(name="booking")
 
+PAYMENTS_DISABLED_TEXT = "Бронирование с депозитом сейчас недоступно 😕"
+
 
 @router.callback_query(BookingCallback.filter(F.action == "deposit"))
 async def start_booking(
     callback: CallbackQuery,
     callback_data: BookingCallback,
+    settings: Settings,
 ) -> None:
     """
     Start the booking flow after \"💳 Забронировать место\" click.
 
-    Shows payment confirmation message with mock payment buttons.
+    Shows the payment link of this user's booking and the payment
+    confirmation buttons.
     """
 
     match = get_match_by_id(callback_data.match_id)
     if not match:
         await callback.answer("Матч не найден.", show_alert=True)
         return
+    if not payments_enabled(settings):
+        await callback.answer(PAYMENTS_DISABLED_TEXT, show_alert=True)
+        return
 
+    user_id = callback.from_user.id
+    pay_url = settings.kaspi_pay_url.replace(
+        "{payment_id}", payment_id(user_id, match.id, PAYMENTS.attempt(user_id, match.id))
+    )
     text = (
         f"💳 Забронировать место за {match.deposit} ₸\n"
         "1) Оплати через Kaspi Pay по ссылке ниже.\n"
         "2) Затем нажми «Я оплатил через Kaspi».\n\n"
         "Ссылка для оплаты: "
-        '<a href="https://pay.kaspi.kz/pay/df3xuh5c">Kaspi Pay</a>\n\n'
+        f'<a href="{pay_url}">Kaspi Pay</a>\n\n'
         "Деньги возвращаются при явке или при отмене за 24 часа."
     )
-    await callback.message.answer(text, reply_markup=build_booking_keyboard(match))
+    await callback.message.answer(text, reply_markup=build_booking_keyboard(match, pay_url))
     await callback.answer()
 
 
 @router.callback_query(PaymentCallback.filter())
-async def handle_mock_payment(
+async def handle_payment(
     callback: CallbackQuery,
     callback_data: PaymentCallback,
+    settings: Settings,
 ) -> None:
     """
-    Handle mock payment confirmation or cancellation.
+    Handle payment confirmation or cancellation.
 
-    Payment is not actually processed; we simply emulate the success flow.
+    ``pay`` queues the payment for verification and answers right away;
+    the seat is confirmed by the reconciliation worker. The action is
+    idempotent per user and match, see :mod:`oynaiq_bot.data.idempotency`,
+    until the worker settles the payment without a seat.
     """
 
     match = get_match_by_id(callback_data.match_id)
@@ -60,17 +89,43 @@ async def handle_mock_payment(
         return
 
     if callback_data.action == "pay":
-        # Условно увеличиваем количество подтверждённых игроков
-        if match.players_current < match.players_total:
-            match.players_current += 1
-        await callback.answer("Оплата через Kaspi отмечена 💸", show_alert=True)
-        await callback.message.answer(
-            "🎉 Место забронировано!\n"
-            f"📍 Игра: {match.location}, {match.date_human} {match.time_human}\n"
-            "🔔 Мы напомним тебе за 2 часа до начала.",
+        if not payments_enabled(settings):
+            await callback.answer(PAYMENTS_DISABLED_TEXT, show_alert=True)
+            return
+        user = callback.from_user
+        payment = Payment(
+            id=payment_id(user.id, match.id, PAYMENTS.attempt(user.id, match.id)),
+            user_id=user.id,
+            chat_id=callback.message.chat.id,
+            match_id=match.id,
+            amount=match.deposit,
+            created=time.time(),
         )
+
+        def enqueue() -> str:
+            PAYMENTS.add(payment)
+            return "Проверяем оплату в Kaspi ⏳"
+
+        # Double taps and redelivered callbacks get the first answer only
+        key = idempotency_key(user.id, match.id, "pay")
+        # The payment journal survives restarts, and so does the key
+        answer, fresh = await IDEMPOTENCY.once(key, enqueue, durable=True)
+        if fresh:
+            # Promise to check the payment only once it is on disk
+            await PAYMENTS.sync()
+            EVENTS.emit(
+                "payment.queued",
+                payment_id=payment.id,
+                match_id=match.id,
+                user_id=user.id,
+                amount=payment.amount,
+            )
+        await callback.answer(answer, show_alert=True)
+        if fresh:
+            await callback.message.answer(
+                "⏳ Проверяем оплату.\n"
+                "Как только Kaspi подтвердит платёж, место будет за тобой — "
+                "мы пришлём сообщение.",
+            )
     else:
         await callback.answer("Оплата отменена.", show_alert=True)
-
-
-
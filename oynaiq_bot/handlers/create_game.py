@@ -0,0 +1,249 @@
+"""
+Step handlers of the \"Создать игру\" wizard.
+
+The wizard is entered from :mod:`oynaiq_bot.handlers.start` (main menu) or
+:mod:`oynaiq_bot.handlers.matches` (matches list). It is rarely used, so the
+module is loaded lazily on the first message that reaches its router.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from aiogram import Router
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.cities import USER_CITIES, user_partition
+from oynaiq_bot.data.matches import (
+    Match,
+    MatchStatus,
+    MOCK_MATCHES,
+    add_match,
+)
+from oynaiq_bot.data.series import SERIES, is_occurrence_id
+from oynaiq_bot.keyboards.create_game import (
+    REPEAT_ONCE,
+    REPEAT_WEEKLY,
+    build_create_game_sport_keyboard,
+    build_repeat_keyboard,
+    remove_keyboard,
+)
+from oynaiq_bot.keyboards.main_menu import build_main_menu_keyboard
+from oynaiq_bot.keyboards.matches_list import build_matches_list_keyboard
+from oynaiq_bot.utils.dates import WEEKDAY_SHORT, format_date, parse_datetime
+from oynaiq_bot.utils.formatter import format_matches_intro
+from oynaiq_bot.utils.navigator import CITIES, SPORTS
+from oynaiq_bot.utils.sports import CATALOG
+from .start import CreateMatchForm
+
+
+router = Router(name="create_game")
+
+
+@router.message(CreateMatchForm.sport)
+async def create_match_choose_sport(message: Message, state: FSMContext) -> None:
+    """
+    Handle sport selection during match creation.
+    """
+
+    matched_code = CATALOG.code_for_label(message.text or "")
+    if matched_code is None:
+        await message.answer(
+            "Пожалуйста, выбери один из вариантов на клавиатуре 🙂",
+            reply_markup=build_create_game_sport_keyboard(),
+        )
+        return
+
+    await state.update_data(sport=matched_code)
+    await state.set_state(CreateMatchForm.title)
+    await message.answer(
+        "Как назовём матч? Например: «Футбол 5×5»",
+        reply_markup=remove_keyboard(),
+    )
+
+
+@router.message(CreateMatchForm.title)
+async def create_match_set_title(message: Message, state: FSMContext) -> None:
+    """
+    Save match title and ask for location.
+    """
+
+    title = (message.text or "").strip()
+    if not title:
+        await message.answer("Название не может быть пустым. Попробуй ещё раз.")
+        return
+
+    await state.update_data(title=title)
+    await state.set_state(CreateMatchForm.location)
+    await message.answer("Где играем? Напиши название площадки или адрес.")
+
+
+@router.message(CreateMatchForm.location)
+async def create_match_set_location(message: Message, state: FSMContext) -> None:
+    """
+    Save location and ask for date/time.
+    """
+
+    location = (message.text or "").strip()
+    if not location:
+        await message.answer("Локация не может быть пустой. Введи, пожалуйста, адрес.")
+        return
+
+    await state.update_data(location=location)
+    await state.set_state(CreateMatchForm.datetime)
+    await message.answer(
+        "Когда играем?\n"
+        "Например: «сегодня, 19:00» или «завтра в 18:30».",
+    )
+
+
+@router.message(CreateMatchForm.datetime)
+async def create_match_set_datetime(
+    message: Message, state: FSMContext, settings: Settings
+) -> None:
+    """
+    Parse the date/time of the match and ask whether it repeats.
+    """
+
+    datetime_text = (message.text or "").strip()
+    if not datetime_text:
+        await message.answer("Пожалуйста, укажи дату и время игры.")
+        return
+
+    starts_at = parse_datetime(datetime_text, datetime.now(ZoneInfo(settings.timezone)))
+    if starts_at is None:
+        await message.answer(
+            "Не получилось понять дату 🤔 Напиши день и время, например:\n"
+            "«сегодня, 19:00», «завтра в 18:30», «в субботу 17:00» или «ертең 18:30».\n"
+            "Время игры должно быть в будущем.",
+        )
+        return
+
+    await state.update_data(starts_at=starts_at.isoformat())
+    await state.set_state(CreateMatchForm.repeat)
+    await message.answer(
+        "Игра разовая или повторяется каждую неделю в это же время?",
+        reply_markup=build_repeat_keyboard(),
+    )
+
+
+@router.message(CreateMatchForm.repeat)
+async def create_match_set_repeat(message: Message, state: FSMContext) -> None:
+    """
+    Save whether the match repeats weekly and ask for deposit.
+    """
+
+    if message.text not in (REPEAT_ONCE, REPEAT_WEEKLY):
+        await message.answer(
+            "Пожалуйста, выбери один из вариантов на клавиатуре 🙂",
+            reply_markup=build_repeat_keyboard(),
+        )
+        return
+
+    await state.update_data(weekly=message.text == REPEAT_WEEKLY)
+    await state.set_state(CreateMatchForm.deposit)
+    await message.answer(
+        "Какой будет депозит за игру? Напиши сумму в тенге, например: 200.\n"
+        "Если депозита нет — напиши 0.",
+        reply_markup=remove_keyboard(),
+    )
+
+
+@router.message(CreateMatchForm.deposit)
+async def create_match_set_deposit(message: Message, state: FSMContext) -> None:
+    """
+    Save deposit amount and finish the wizard with a summary.
+    """
+
+    raw = (message.text or "").replace(" ", "")
+    try:
+        deposit = int(raw)
+        if deposit < 0:
+            raise ValueError
+    except ValueError:
+        await message.answer("Нужно указать неотрицательное число. Попробуй ещё раз 🙂")
+        return
+
+    await state.update_data(deposit=deposit)
+    data = await state.get_data()
+    await state.clear()
+
+    sport_code = data.get("sport", "")
+    sport_label = SPORTS.get(sport_code, sport_code)
+    title = data.get("title", "Без названия")
+    location = data.get("location", "Не указано")
+    starts_at = datetime.fromisoformat(data["starts_at"])
+    time_human = f"{starts_at:%H:%M}"
+
+    city = USER_CITIES.get(message.from_user.id)
+    # Stored occurrences of weekly series have ids of their own
+    new_id = max((m.id for m in MOCK_MATCHES if not is_occurrence_id(m.id)), default=0) + 1
+    players_total = 10
+    players_current = 1  # организатор
+
+    free_slots = max(players_total - players_current, 0)
+    if free_slots <= 0:
+        status = MatchStatus.ACTIVE
+    elif free_slots <= 2:
+        status = MatchStatus.ALMOST_FULL
+    else:
+        status = MatchStatus.LOW_PLAYERS
+
+    organizer_username = message.from_user.username or str(message.from_user.id)
+    google_maps_url = f"https://maps.google.com/?q={location.replace(' ', '+')}"
+    rules = "Правила договоримся на месте 😉"
+    refund_policy = (
+        "Возврат депозита при отмене за 24+ ч" if deposit > 0 else "Без депозита — просто приходи"
+    )
+
+    new_match = Match(
+        id=new_id,
+        sport=sport_code or "other",
+        title=title,
+        location=location,
+        date_human=format_date(starts_at),
+        time_human=time_human,
+        google_maps_url=google_maps_url,
+        players_current=players_current,
+        players_total=players_total,
+        deposit=deposit,
+        level="любители",
+        organizer_username=organizer_username,
+        rules=rules,
+        refund_policy=refund_policy,
+        status=status,
+        starts_at=starts_at,
+        city=city,
+    )
+    date_human = new_match.day_label()
+    if data.get("weekly"):
+        SERIES.add(new_match, starts_at)
+        weekday = WEEKDAY_SHORT[starts_at.weekday()]
+        date_human = f"каждую неделю ({weekday}), ближайшая — {date_human}"
+    else:
+        add_match(new_match)
+
+    summary = (
+        "Игра создана ✅\n\n"
+        f"Вид спорта: {sport_label}\n"
+        f"Название: {title}\n"
+        f"Город: {CITIES[city]}\n"
+        f"Локация: {location}\n"
+        f"Когда: {date_human}, {time_human}\n"
+        f"Депозит: {deposit} ₸\n\n"
+        "Мы добавили игру в общий список — другие игроки теперь могут её найти "
+        "в разделе «Найти команду»."
+    )
+
+    await message.answer(summary, reply_markup=build_main_menu_keyboard())
+
+    # Показать пользователю, как матч выглядит в общем списке
+    if sport_code:
+        matches = user_partition(message.from_user.id).matches_by_sport(sport_code)
+        await message.answer(
+            format_matches_intro(sport_code),
+            reply_markup=build_matches_list_keyboard(sport_code, matches),
+        )
@@ -7,8 +7,9 @@ from __future__ import annotations
 from aiogram import Router
 from aiogram.types import CallbackQuery
 
-from oynaiq_bot.data.matches import get_matches_by_sport
-from oynaiq_bot.keyboards.matches_list import build_matches_list_keyboard
+from oynaiq_bot.data.cities import user_partition
+from oynaiq_bot.keyboards.matches_list import MAX_LISTED_MATCHES, build_matches_list_keyboard
+from oynaiq_bot.runtime.tracing import span
 from oynaiq_bot.utils.formatter import format_matches_intro
 from oynaiq_bot.utils.navigator import SportCallback
 
@@ -21,11 +22,14 @@ async def on_sport_chosen(callback: CallbackQuery, callback_data: SportCallback)
     """
     Handle sport selection from the inline keyboard.
 
-    Shows a list of upcoming matches for the chosen sport.
+    Shows the upcoming matches of the chosen sport that suit the user
+    best in their city, see :mod:`oynaiq_bot.data.recommendations`.
     """
 
     sport = callback_data.sport
-    matches = get_matches_by_sport(sport)
+    with span("store"):
+        partition = user_partition(callback.from_user.id)
+        matches = partition.recommend(callback.from_user.id, sport, MAX_LISTED_MATCHES)
 
     if not matches:
         await callback.message.edit_text(
@@ -36,10 +40,9 @@ async def on_sport_chosen(callback: CallbackQuery, callback_data: SportCallback)
         await callback.answer()
         return
 
-    await callback.message.edit_text(
-        format_matches_intro(sport),
-        reply_markup=build_matches_list_keyboard(sport=sport, matches=matches),
-    )
+    with span("render"):
+        keyboard = build_matches_list_keyboard(sport=sport, matches=matches)
+    await callback.message.edit_text(format_matches_intro(sport), reply_markup=keyboard)
     await callback.answer()
 
 
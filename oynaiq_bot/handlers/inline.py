@@ -0,0 +1,109 @@
+"""
+Inline mode: ``@bot футбол`` in any chat shares a match.
+
+Matches are found in the user's city, weekly occurrences included (see
+:meth:`oynaiq_bot.data.cities.CityPartition.find`); the result article of every match is built
+once and reused until the match changes.
+Results are paged with ``next_offset`` and cached by Telegram for
+:data:`INLINE_CACHE_TIME` seconds.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict
+
+from aiogram import Router
+from aiogram.types import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+)
+
+from oynaiq_bot.data.cities import user_partition
+from oynaiq_bot.data.matches import Match, MatchChange, add_match_listener, get_match_by_id
+from oynaiq_bot.utils.formatter import format_announcement, format_inline_description, sport_emoji
+from oynaiq_bot.utils.sports import CATALOG
+
+
+router = Router(name="inline")
+
+INLINE_PAGE_SIZE = 20
+INLINE_CACHE_TIME = 30
+
+# Prebuilt results by match id, dropped when the match or the sport catalog
+# changes, and every hour since they name the day relative to today
+_articles: Dict[int, InlineQueryResultArticle] = {}
+_articles_hour = 0
+
+
+def _forget_article(match: Match, change: MatchChange) -> None:
+    _articles.pop(match.id, None)
+
+
+add_match_listener(_forget_article)
+CATALOG.add_reload_listener(_articles.clear)
+
+
+def build_match_article(match: Match, bot_username: str) -> InlineQueryResultArticle:
+    """
+    Build the inline result sharing ``match``, with a button opening it in
+    the bot.
+    """
+
+    return InlineQueryResultArticle(
+        id=str(match.id),
+        title=f"{sport_emoji(match.sport)} {match.title} — {match.location}",
+        description=format_inline_description(match),
+        input_message_content=InputTextMessageContent(
+            message_text=format_announcement(match, {})
+        ),
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="➡️ Записаться в боте",
+                        url=f"https://t.me/{bot_username}?start=match_{match.id}",
+                    )
+                ]
+            ]
+        ),
+    )
+
+
+@router.inline_query()
+async def on_inline_query(inline_query: InlineQuery) -> None:
+    """
+    Answer an inline query with one page of matching games.
+    """
+
+    ids = user_partition(inline_query.from_user.id).find(inline_query.query)
+    offset = int(inline_query.offset) if inline_query.offset.isdigit() else 0
+    page = ids[offset : offset + INLINE_PAGE_SIZE]
+
+    global _articles_hour
+    hour = int(time.time() // 3600)
+    if hour != _articles_hour:
+        _articles.clear()
+        _articles_hour = hour
+
+    bot_username = (await inline_query.bot.me()).username or ""
+    results = []
+    for match_id in page:
+        article = _articles.get(match_id)
+        if article is None:
+            match = get_match_by_id(match_id)
+            if match is None:
+                continue
+            article = _articles[match_id] = build_match_article(match, bot_username)
+        results.append(article)
+
+    next_offset = str(offset + INLINE_PAGE_SIZE) if offset + INLINE_PAGE_SIZE < len(ids) else ""
+    await inline_query.answer(
+        results,
+        cache_time=INLINE_CACHE_TIME,
+        is_personal=True,
+        next_offset=next_offset,
+    )
@@ -0,0 +1,75 @@
+"""
+Lazily loaded routers.
+
+A :class:`LazyRouter` is an empty placeholder included into the dispatcher
+at startup. The real handler module is imported the first time an event
+reaches the placeholder (or earlier, by :func:`preload_routers`), so
+rarely used features do not delay the start of polling.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from typing import Any, Optional
+
+from aiogram import Router
+from aiogram.types import TelegramObject
+
+
+logger = logging.getLogger(__name__)
+
+
+class LazyRouter(Router):
+    """
+    Router placeholder that imports ``<module>.router`` on first use.
+
+    Update types are resolved for ``allowed_updates`` before lazy routers
+    are loaded, so a lazy module must only handle update types that some
+    eagerly loaded router already handles.
+
+    Args:
+        module: Dotted path of the module exposing a ``router`` attribute.
+        name: Router name, defaults to ``lazy:<last component of module>``.
+    """
+
+    def __init__(self, module: str, name: Optional[str] = None) -> None:
+        super().__init__(name=name or f"lazy:{module.rsplit('.', 1)[-1]}")
+        self.module = module
+        self.loaded = False
+
+    def load(self) -> None:
+        """
+        Import the module and include its router. Does nothing if loaded.
+        """
+
+        if self.loaded:
+            return
+        started = time.perf_counter()
+        self.include_router(importlib.import_module(self.module).router)
+        self.loaded = True
+        logger.info(
+            "Loaded router %s in %.1f ms", self.module, (time.perf_counter() - started) * 1000
+        )
+
+    async def propagate_event(self, update_type: str, event: TelegramObject, **kwargs: Any) -> Any:
+        if not self.loaded:
+            self.load()
+        return await super().propagate_event(update_type, event, **kwargs)
+
+
+def preload_routers(root: Router) -> None:
+    """
+    Load every not yet loaded :class:`LazyRouter` below ``root``.
+
+    Called shortly after polling starts, so the first user of a deferred
+    feature does not pay for the import.
+
+    Args:
+        root: Dispatcher or router to scan.
+    """
+
+    for router in list(root.chain_tail):
+        if isinstance(router, LazyRouter):
+            router.load()
@@ -7,15 +7,31 @@ from __future__ import annotations
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
 
-from oynaiq_bot.data.matches import get_match_by_id, get_matches_by_sport
-from oynaiq_bot.keyboards.match_details import build_match_details_keyboard
-from oynaiq_bot.keyboards.matches_list import build_matches_list_keyboard
+from oynaiq_bot.data.cities import PARTITIONS
+from oynaiq_bot.data.idempotency import IDEMPOTENCY, idempotency_key
+from oynaiq_bot.data.live_cards import LIVE_CARDS
+from oynaiq_bot.data.matches import get_match_by_id, holds_seat, release_seat, take_seat
+from oynaiq_bot.data.recommendations import PROFILES
+from oynaiq_bot.data.waitlist import WAITLIST
+from oynaiq_bot.keyboards.match_details import (
+    build_match_details_keyboard,
+    build_participation_keyboard,
+    build_waitlist_keyboard,
+)
+from oynaiq_bot.keyboards.matches_list import MAX_LISTED_MATCHES, build_matches_list_keyboard
+from oynaiq_bot.runtime.events import EVENTS
+from oynaiq_bot.runtime.tracing import span
 from oynaiq_bot.utils.formatter import format_match_details, format_matches_intro
 from oynaiq_bot.utils.navigator import BookingCallback, MatchCallback
 
 
 router = Router(name="match_details")
 
+NO_SEATS_TEXT = "Свободных мест нет — встань в очередь 🔔"
+NOT_BOOKED_TEXT = "Ты не записан на эту игру."
+HELD_TEXT = "Место уже держим за тобой — проверь сообщения 🔔"
+BOOKED_TEXT = "Ты уже в списке игроков ✅"
+
 
 @router.callback_query(MatchCallback.filter())
 async def show_match_details(callback: CallbackQuery, callback_data: MatchCallback) -> None:
@@ -27,22 +43,36 @@ async def show_match_details(callback: CallbackQuery, callback_data: MatchCallba
         callback_data: Decoded :class:`MatchCallback` payload.
     """
 
-    match = get_match_by_id(callback_data.match_id)
+    with span("store"):
+        match = get_match_by_id(callback_data.match_id)
     if not match:
         await callback.answer("Матч не найден. Возможно, он был удалён.", show_alert=True)
         return
 
-    await callback.message.edit_text(
-        format_match_details(match),
-        reply_markup=build_match_details_keyboard(match),
-        parse_mode="HTML",
-    )
+    with span("render"):
+        text = format_match_details(match)
+        keyboard = build_match_details_keyboard(match)
+    await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+    # Keep the seat counter of this card up to date, see data/live_cards.py
+    LIVE_CARDS.show(callback.bot, callback.message.chat.id, callback.message.message_id, match.id)
     await callback.answer()
 
 
 @router.callback_query(
     BookingCallback.filter(
-        F.action.in_({"confirm", "contact", "waitlist", "notify", "back_list"})
+        F.action.in_(
+            {
+                "confirm",
+                "leave",
+                "contact",
+                "waitlist",
+                "unwait",
+                "hold_accept",
+                "hold_decline",
+                "notify",
+                "back_list",
+            }
+        )
     )
 )
 async def handle_match_details_actions(
@@ -53,9 +83,14 @@ async def handle_match_details_actions(
     Handle non‑payment actions from the match details keyboard.
 
     Actions processed here:
-        - ``confirm``: Confirm participation without deposit.
+        - ``confirm``: Confirm participation without deposit (idempotent
+          per user and match).
+        - ``leave``: Free the confirmed seat; it goes to the waitlist.
         - ``contact``: Provide organizer username.
-        - ``waitlist`` / ``notify``: Stub subscription to notifications.
+        - ``waitlist`` / ``unwait``: Join or leave the match waitlist.
+        - ``hold_accept`` / ``hold_decline``: Answer a seat offered from
+          the waitlist, see :mod:`oynaiq_bot.data.waitlist`.
+        - ``notify``: Stub subscription to notifications.
         - ``back_list``: Return to the list of matches for the same sport.
     """
 
@@ -66,15 +101,58 @@ async def handle_match_details_actions(
 
     action = callback_data.action
 
+    user = callback.from_user
+
+    # Confirming and leaving clear each other's key, so the pair can repeat
+    confirm_key = idempotency_key(user.id, match.id, "confirm")
+    leave_key = idempotency_key(user.id, match.id, "leave")
+
     if action == "confirm":
-        # Условно увеличиваем количество подтверждённых игроков
-        if match.players_current < match.players_total:
-            match.players_current += 1
-        await callback.answer("Участие подтверждено ✅")
-        await callback.message.answer(
-            "Отлично! Мы записали тебя в список игроков.\n"
-            "Не забудь прийти вовремя — хорошей игры! ⚽",
-        )
+        if WAITLIST.is_held(match.id, user.id):
+            await callback.answer(HELD_TEXT)
+            return
+        if holds_seat(match.id, user.id):
+            await callback.answer(BOOKED_TEXT)
+            return
+        if match.players_current >= match.players_total:
+            await callback.answer(NO_SEATS_TEXT, show_alert=True)
+            return
+
+        def confirm() -> str:
+            if not take_seat(match, user.id):
+                return NO_SEATS_TEXT
+            PROFILES.record_confirmation(user.id, match)
+            IDEMPOTENCY.forget(leave_key)
+            return "Участие подтверждено ✅"
+
+        answer, fresh = await IDEMPOTENCY.once(confirm_key, confirm)
+        if answer == NO_SEATS_TEXT:
+            # Let the user try again once a seat is free
+            IDEMPOTENCY.forget(confirm_key)
+        await callback.answer(answer)
+        if fresh and answer != NO_SEATS_TEXT:
+            EVENTS.emit("booking.confirmed", match_id=match.id, user_id=user.id)
+            await callback.message.answer(
+                "Отлично! Мы записали тебя в список игроков.\n"
+                "Не забудь прийти вовремя — хорошей игры! ⚽",
+                reply_markup=build_participation_keyboard(match),
+            )
+        return
+
+    if action == "leave":
+
+        def leave() -> str:
+            if not release_seat(match, user.id):
+                return NOT_BOOKED_TEXT
+            IDEMPOTENCY.forget(confirm_key)
+            return "Участие отменено. Место получит следующий из очереди."
+
+        answer, fresh = await IDEMPOTENCY.once(leave_key, leave)
+        if answer == NOT_BOOKED_TEXT:
+            IDEMPOTENCY.forget(leave_key)
+        elif fresh:
+            EVENTS.emit("booking.left", match_id=match.id, user_id=user.id)
+        await callback.answer(answer, show_alert=True)
         return
 
     if action == "contact":
@@ -85,12 +163,69 @@ async def handle_match_details_actions(
         )
         return
 
-    if action in {"waitlist", "notify"}:
+    if action == "waitlist":
+        if match.players_current < match.players_total and not WAITLIST.waiting(match.id):
+            await callback.answer(
+                "Свободные места ещё есть — жми «Подтвердить» 🚀", show_alert=True
+            )
+            return
+        place = WAITLIST.join(match.id, user.id, callback.message.chat.id)
+        if not place:
+            held = WAITLIST.is_held(match.id, user.id)
+            await callback.answer(HELD_TEXT if held else BOOKED_TEXT)
+            return
+        EVENTS.emit("waitlist.joined", match_id=match.id, user_id=user.id, position=place)
+        await callback.answer()
+        await callback.message.answer(
+            f"🔔 Ты в очереди на «{match.title}», твой номер: {place}.\n"
+            "Как только освободится место, мы придержим его за тобой и напишем.",
+            reply_markup=build_waitlist_keyboard(match),
+        )
+        return
+
+    if action == "unwait":
+        if WAITLIST.leave(match.id, user.id):
+            EVENTS.emit("waitlist.left", match_id=match.id, user_id=user.id)
+            await callback.answer("Ты вышел из очереди.")
+        else:
+            await callback.answer("Тебя уже нет в очереди.")
+        return
+
+    if action == "hold_accept":
+        if match.deposit and WAITLIST.is_held(match.id, user.id):
+            # Paid seats are accepted by the payment worker
+            await callback.answer(
+                f"Чтобы забрать место, оплати депозит {match.deposit} ₸ 💳", show_alert=True
+            )
+            return
+        if not WAITLIST.accept(match.id, user.id):
+            await callback.answer("Время на подтверждение уже вышло 😕", show_alert=True)
+            return
+        PROFILES.record_confirmation(user.id, match)
+        EVENTS.emit("waitlist.accepted", match_id=match.id, user_id=user.id)
+        await callback.answer("Место твоё ✅")
+        await callback.message.edit_text(
+            f"✅ Место в игре «{match.title}» за тобой.\n"
+            f"📍 {match.location}, {match.day_label()} {match.time_human}",
+            reply_markup=build_participation_keyboard(match),
+        )
+        return
+
+    if action == "hold_decline":
+        if WAITLIST.decline(match.id, user.id):
+            EVENTS.emit("waitlist.declined", match_id=match.id, user_id=user.id)
+        await callback.answer("Хорошо, предложим место следующему.")
+        await callback.message.edit_text(f"Ты отказался от места в игре «{match.title}».")
+        return
+
+    if action == "notify":
         await callback.answer("Мы отправим уведомление, когда появятся места 🔔", show_alert=True)
         return
 
     if action == "back_list":
-        matches = get_matches_by_sport(match.sport)
+        partition = PARTITIONS.partition(match.city)
+        matches = partition.recommend(user.id, match.sport, MAX_LISTED_MATCHES)
+        LIVE_CARDS.forget(callback.message.chat.id, callback.message.message_id)
         await callback.message.edit_text(
             format_matches_intro(match.sport),
             reply_markup=build_matches_list_keyboard(match.sport, matches),
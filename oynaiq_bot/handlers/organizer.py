@@ -0,0 +1,89 @@
+"""
+Organizer dashboard.
+
+``/my_games`` shows the totals over the user's own matches (the ones
+whose ``organizer_username`` is the user's username, or id for users
+without one) and the latest of them. Everything comes from
+:data:`~oynaiq_bot.data.organizers.ORGANIZERS`, so the dashboard costs
+the same for an organizer with one game or with thousands.
+
+``/skip_game`` lists the coming games of the user's weekly series and
+``/skip_game <id>`` cancels one of them, see :mod:`oynaiq_bot.data.series`.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from oynaiq_bot.data.organizers import ORGANIZERS, organizer_key
+from oynaiq_bot.data.series import SERIES, WINDOW_DAYS
+from oynaiq_bot.utils.formatter import format_organizer_dashboard
+
+
+router = Router(name="organizer")
+
+# Number of matches listed on the dashboard
+DASHBOARD_GAMES = 10
+
+
+@router.message(Command("my_games"))
+async def cmd_my_games(message: Message) -> None:
+    """
+    Show the organizer dashboard of the current user.
+    """
+
+    username = message.from_user.username or str(message.from_user.id)
+    text = format_organizer_dashboard(
+        ORGANIZERS.stats(username), ORGANIZERS.latest(username, DASHBOARD_GAMES)
+    )
+    await message.answer(text)
+
+
+@router.message(Command("skip_game"))
+async def cmd_skip_game(message: Message, command: CommandObject) -> None:
+    """
+    List the coming games of the user's weekly series, or cancel the one
+    given as the argument.
+    """
+
+    username = organizer_key(message.from_user.username or str(message.from_user.id))
+    own = [
+        series
+        for series in SERIES
+        if organizer_key(series.template.organizer_username) == username
+    ]
+    if not own:
+        await message.answer("У тебя нет еженедельных игр.")
+        return
+
+    args = (command.args or "").strip()
+    if not args.isdigit():
+        today = SERIES.today()
+        last_day = today + timedelta(days=WINDOW_DAYS - 1)
+        lines = [
+            f"/skip_game {series.occurrence_id(index)} — {series.template.title}, "
+            f"{series.starts_at(index):%d.%m %H:%M}"
+            for series in own
+            for index in series.indexes(today, last_day)
+            if not SERIES.is_booked(series.occurrence_id(index))
+        ]
+        await message.answer(
+            "Какую игру отменить?\n" + "\n".join(lines)
+            if lines
+            else "На ближайшую неделю нет игр, которые можно отменить."
+        )
+        return
+
+    found = SERIES.find(int(args))
+    if found is None or found[0] not in own:
+        await message.answer("Игра не найдена.")
+    elif SERIES.is_booked(int(args)):
+        await message.answer("На эту игру уже записались — её нельзя отменить.")
+    elif SERIES.skip(int(args)):
+        await message.answer(f"Игра {found[0].starts_at(found[1]):%d.%m %H:%M} отменена.")
+    else:
+        await message.answer("Эта игра уже отменена.")
@@ -5,7 +5,8 @@ This module contains stubs for bonus features such as:
 
 * referral system;
 * post‑match feedback prompts;
-* simple reaction commands (for future group integrations).
+* simple text reactions in private chats (groups get real announcement
+  cards, see :mod:`oynaiq_bot.handlers.announcements`).
 """
 
 from __future__ import annotations
@@ -14,9 +15,14 @@ from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from oynaiq_bot.data.referrals import REFERRALS
+
 
 router = Router(name="utils")
 
+# Number of leaderboard entries shown by /referral
+REFERRAL_TOP_SIZE = 5
+
 
 @router.message(Command("Nurlan"))
 @router.message(F.text.regexp(r"(?i)^/nurlan"))
@@ -33,19 +39,31 @@ async def secret_nurlan_command(message: Message) -> None:
 @router.message(Command("referral"))
 async def cmd_referral(message: Message) -> None:
     """
-    Generate a referral link stub for the current user.
+    Show the referral link of the current user and the invite stats.
 
-    In MVP this simply shows a link of the form:
-    ``t.me/playqbot?start=ref_<username>``.
+    The link has the form ``t.me/playqbot?start=ref_<username>``; the
+    invite count and the leaderboard come from the in-memory
+    :data:`~oynaiq_bot.data.referrals.REFERRALS` store.
     """
 
     username = message.from_user.username or str(message.from_user.id)
     link = f"t.me/playqbot?start=ref_{username}"
-    await message.answer(
+    text = (
         "Пригласи друга → получите бонус (в будущем здесь будут реальные бонусы).\n\n"
-        f"Твоя реферальная ссылка:\n{link}",
+        f"Твоя реферальная ссылка:\n{link}\n\n"
+        f"Друзей пришло по твоей ссылке: {REFERRALS.count(username)}"
     )
 
+    top = REFERRALS.top(REFERRAL_TOP_SIZE)
+    if top:
+        lines = [
+            f"{place}. {key if key.isdigit() else '@' + key} — {count}"
+            for place, (key, count) in enumerate(top, start=1)
+        ]
+        text += "\n\n🏆 Топ приглашающих:\n" + "\n".join(lines)
+
+    await message.answer(text)
+
 
 @router.message(Command("feedback"))
 async def cmd_feedback_stub(message: Message) -> None:
@@ -63,12 +81,13 @@ async def cmd_feedback_stub(message: Message) -> None:
     )
 
 
-@router.message(F.text.in_(["👍 Пойду", "🤔 Думаю", "👎 Не смогу"]))
+@router.message(F.chat.type == "private", F.text.in_(["👍 Пойду", "🤔 Думаю", "👎 Не смогу"]))
 async def reaction_stub(message: Message) -> None:
     """
-    Simple text‑based emulation of reaction buttons in groups.
+    Simple text‑based emulation of reaction buttons in private chats.
 
-    In real chats these could be inline buttons under a match announcement.
+    Groups are not answered here: one reply per message floods busy chats,
+    reactions there are inline buttons under ``/announce`` cards.
     """
 
     if message.text == "👍 Пойду":
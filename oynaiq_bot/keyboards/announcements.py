@@ -0,0 +1,36 @@
+"""
+Reaction keyboard under group match announcements.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from oynaiq_bot.data.announcements import REACTIONS
+from oynaiq_bot.utils.navigator import ReactionCallback
+
+
+def build_reactions_keyboard(match_id: int, counts: Mapping[str, int]) -> InlineKeyboardMarkup:
+    """
+    Build one row of reaction buttons with their current counters.
+
+    Args:
+        match_id: Announced match.
+        counts: Number of users per reaction code.
+
+    Returns:
+        :class:`InlineKeyboardMarkup` with a button per reaction.
+    """
+
+    row = []
+    for code, label in REACTIONS.items():
+        count = counts.get(code, 0)
+        row.append(
+            InlineKeyboardButton(
+                text=f"{label} · {count}" if count else label,
+                callback_data=ReactionCallback(match_id=match_id, reaction=code).pack(),
+            )
+        )
+    return InlineKeyboardMarkup(inline_keyboard=[row])
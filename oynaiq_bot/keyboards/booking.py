@@ -1,7 +1,7 @@
 """
 Booking and payment confirmation keyboards.
 
-In the MVP implementation payments are mocked and always succeed.
+Payments are verified asynchronously, see :mod:`oynaiq_bot.payments`.
 """
 
 from __future__ import annotations
@@ -12,7 +12,10 @@ from oynaiq_bot.data.matches import Match
 from oynaiq_bot.utils.navigator import PaymentCallback
 
 
-def build_booking_keyboard(match: Match) -> InlineKeyboardMarkup:
+DEFAULT_PAY_URL = "https://pay.kaspi.kz/pay/df3xuh5c"
+
+
+def build_booking_keyboard(match: Match, pay_url: str = DEFAULT_PAY_URL) -> InlineKeyboardMarkup:
     """
     Build an inline keyboard for confirming the booking payment.
 
@@ -23,6 +26,7 @@ def build_booking_keyboard(match: Match) -> InlineKeyboardMarkup:
 
     Args:
         match: Match for which the booking is being made.
+        pay_url: Payment link of the user's booking.
 
     Returns:
         :class:`InlineKeyboardMarkup` instance.
@@ -32,7 +36,7 @@ def build_booking_keyboard(match: Match) -> InlineKeyboardMarkup:
         [
             InlineKeyboardButton(
                 text="💳 Оплатить через Kaspi Pay",
-                url="https://pay.kaspi.kz/pay/df3xuh5c",
+                url=pay_url,
             )
         ],
         [
@@ -0,0 +1,36 @@
+"""
+City selection keyboard.
+
+The keyboard lists every city from :data:`~oynaiq_bot.utils.navigator.CITIES`
+as an inline button, marking the one currently chosen.
+"""
+
+from __future__ import annotations
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from oynaiq_bot.utils.navigator import CITIES, CityCallback
+
+
+def build_city_choice_keyboard(current: str) -> InlineKeyboardMarkup:
+    """
+    Build an inline keyboard that lets the user choose a city.
+
+    Args:
+        current: Code of the city chosen now; its button gets a check mark.
+
+    Returns:
+        :class:`InlineKeyboardMarkup` with one button per city.
+    """
+
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=f"{label} ✅" if code == current else label,
+                callback_data=CityCallback(city=code).pack(),
+            )
+        ]
+        for code, label in CITIES.items()
+    ]
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -4,9 +4,11 @@ Keyboards for the \"Создать игру\" (create game) flow.
 
 from __future__ import annotations
 
+from typing import Dict
+
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
 
-from oynaiq_bot.utils.navigator import SPORTS
+from oynaiq_bot.utils.sports import CATALOG
 
 
 def build_create_game_sport_keyboard() -> ReplyKeyboardMarkup:
@@ -14,15 +16,16 @@ def build_create_game_sport_keyboard() -> ReplyKeyboardMarkup:
     Build a reply keyboard to choose sport when creating a match.
 
     Returns:
-        :class:`ReplyKeyboardMarkup` with sport options.
+        Cached :class:`ReplyKeyboardMarkup` with the sports of the catalog;
+        answers are mapped back with
+        :meth:`~oynaiq_bot.utils.sports.SportCatalog.code_for_label`.
     """
 
-    keyboard = [
-        [KeyboardButton(text=SPORTS["football"])],
-        [KeyboardButton(text=SPORTS["basketball"])],
-        [KeyboardButton(text=SPORTS["volleyball"])],
-        [KeyboardButton(text=SPORTS["other"])],
-    ]
+    return CATALOG.keyboard("create_game", _build)
+
+
+def _build(sports: Dict[str, str]) -> ReplyKeyboardMarkup:
+    keyboard = [[KeyboardButton(text=label)] for label in sports.values()]
     return ReplyKeyboardMarkup(
         keyboard=keyboard,
         resize_keyboard=True,
@@ -30,6 +33,22 @@ def build_create_game_sport_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
+REPEAT_ONCE = "1️⃣ Один раз"
+REPEAT_WEEKLY = "🔁 Каждую неделю"
+
+
+def build_repeat_keyboard() -> ReplyKeyboardMarkup:
+    """
+    Build a reply keyboard asking whether the match repeats every week.
+    """
+
+    return ReplyKeyboardMarkup(
+        keyboard=[[KeyboardButton(text=REPEAT_ONCE), KeyboardButton(text=REPEAT_WEEKLY)]],
+        resize_keyboard=True,
+        one_time_keyboard=True,
+    )
+
+
 def remove_keyboard() -> ReplyKeyboardRemove:
     """
     Small helper to remove the custom reply keyboard.
@@ -1,14 +1,18 @@
 """
 Sport selection keyboard for the "Найти команду" flow.
 
-The keyboard presents four sport options as inline buttons.
+The keyboard presents the sports of the catalog as inline buttons; it is
+built once per catalog version.
 """
 
 from __future__ import annotations
 
+from typing import Dict
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-from oynaiq_bot.utils.navigator import SportCallback, SPORTS
+from oynaiq_bot.utils.navigator import SportCallback
+from oynaiq_bot.utils.sports import CATALOG
 
 
 def build_sport_choice_keyboard() -> InlineKeyboardMarkup:
@@ -16,35 +20,22 @@ def build_sport_choice_keyboard() -> InlineKeyboardMarkup:
     Build an inline keyboard that lets the user choose a sport.
 
     Returns:
-        :class:`InlineKeyboardMarkup` with four buttons:
-        football, basketball, volleyball and other.
+        Cached :class:`InlineKeyboardMarkup` with one button per sport of
+        the catalog.
     """
 
+    return CATALOG.keyboard("find_team", _build)
+
+
+def _build(sports: Dict[str, str]) -> InlineKeyboardMarkup:
     buttons = [
         [
             InlineKeyboardButton(
-                text=SPORTS["football"],
-                callback_data=SportCallback(sport="football").pack(),
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text=SPORTS["basketball"],
-                callback_data=SportCallback(sport="basketball").pack(),
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text=SPORTS["volleyball"],
-                callback_data=SportCallback(sport="volleyball").pack(),
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text=SPORTS["other"],
-                callback_data=SportCallback(sport="other").pack(),
+                text=label,
+                callback_data=SportCallback(sport=code).pack(),
             )
-        ],
+        ]
+        for code, label in sports.items()
     ]
 
     return InlineKeyboardMarkup(inline_keyboard=buttons)
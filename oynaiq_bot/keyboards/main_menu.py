@@ -17,6 +17,7 @@ def build_main_menu_keyboard() -> ReplyKeyboardMarkup:
     Buttons:
         - 🧑‍🤝‍🧑 Найти команду
         - ⚡ Создать игру
+        - 📍 Город
         - 💬 Узнать, как это работает
 
     Returns:
@@ -30,6 +31,9 @@ def build_main_menu_keyboard() -> ReplyKeyboardMarkup:
         [
             KeyboardButton(text="⚡ Создать игру"),
         ],
+        [
+            KeyboardButton(text="📍 Город"),
+        ],
         [
             KeyboardButton(text="💬 Узнать, как это работает"),
         ],
@@ -161,4 +161,53 @@ def build_match_details_keyboard(match: Match) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+def _single_button_rows(match: Match, buttons: list[tuple[str, str]]) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=text,
+                    callback_data=BookingCallback(match_id=match.id, action=action).pack(),
+                )
+            ]
+            for text, action in buttons
+        ]
+    )
+
+
+def build_participation_keyboard(match: Match) -> InlineKeyboardMarkup:
+    """
+    Keyboard under the participation confirmation: lets the player free
+    the seat for the waitlist.
+    """
+
+    return _single_button_rows(match, [("🚪 Не смогу прийти", "leave")])
+
+
+def build_waitlist_keyboard(match: Match) -> InlineKeyboardMarkup:
+    """
+    Keyboard for a user who joined the waitlist of a match.
+    """
+
+    return _single_button_rows(match, [("❌ Выйти из очереди", "unwait")])
+
+
+def build_join_waitlist_keyboard(match: Match) -> InlineKeyboardMarkup:
+    """
+    Keyboard for a user who could not get a seat of a full match.
+    """
+
+    return _single_button_rows(match, [("🔔 Встать в очередь", "waitlist")])
+
+
+def build_hold_keyboard(match: Match) -> InlineKeyboardMarkup:
+    """
+    Keyboard offering a seat held for a user from the waitlist; a seat of
+    a match with a deposit is taken through the booking flow.
+    """
 
+    if match.deposit:
+        accept = ("💳 Оплатить и взять место", "deposit")
+    else:
+        accept = ("✅ Беру место", "hold_accept")
+    return _single_button_rows(match, [accept, ("🙅 Уже не актуально", "hold_decline")])
@@ -16,6 +16,10 @@ from oynaiq_bot.utils.formatter import format_match_list_item
 from oynaiq_bot.utils.navigator import CreateMatchCallback, MatchCallback
 
 
+# Matches shown in one list, one per index emoji
+MAX_LISTED_MATCHES = 9
+
+
 def build_matches_list_keyboard(sport: str, matches: Iterable[Match]) -> InlineKeyboardMarkup:
     """
     Build an inline keyboard with all matches for the chosen sport.
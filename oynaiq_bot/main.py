@@ -7,12 +7,173 @@ this module.
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import logging
+import signal
+import sys
+from contextlib import suppress
+from pathlib import Path
+from typing import List, Optional
 
 from aiogram import Bot, Dispatcher
 
-from oynaiq_bot.config import get_settings
+from oynaiq_bot.config import Settings, get_settings
 from oynaiq_bot.handlers import get_routers
+from oynaiq_bot.handlers.lazy import preload_routers
+from oynaiq_bot.middlewares.metrics import setup_handler_metrics
+from oynaiq_bot.runtime.lifecycle import drain_and_shutdown
+from oynaiq_bot.runtime.scheduler import UpdateScheduler, poll_updates
+from oynaiq_bot.runtime.session import build_session, log_api_call_summary
+
+
+logger = logging.getLogger(__name__)
+
+# Lazy routers are imported this many seconds after polling starts
+LAZY_ROUTERS_PRELOAD_DELAY = 1.0
+
+
+def build_dispatcher(settings: Optional[Settings] = None) -> Dispatcher:
+    """
+    Create a :class:`Dispatcher` with all routers and middlewares included.
+
+    Args:
+        settings: Application settings; made available to handlers as the
+            ``settings`` argument. Persistent stores are opened from
+            :attr:`Settings.state_dir`; tracing and update recording are
+            enabled according to them.
+
+    Returns:
+        Ready to use dispatcher instance.
+    """
+
+    dp = Dispatcher()
+    if settings is not None:
+        # Imported here so that importing this module stays cheap
+        from oynaiq_bot.data.cities import setup_cities
+        from oynaiq_bot.data.idempotency import setup_idempotency
+        from oynaiq_bot.data.referrals import setup_referrals
+        from oynaiq_bot.data.series import setup_series
+        from oynaiq_bot.data.waitlist import setup_waitlist
+        from oynaiq_bot.payments.worker import setup_reconciliation
+        from oynaiq_bot.runtime.edits import setup_edits
+        from oynaiq_bot.utils.sports import setup_sports
+
+        dp["settings"] = settings
+        # Optional features are not even imported unless enabled
+        if settings.trace_sample_rate > 0:
+            from oynaiq_bot.runtime.tracing import setup_tracing
+
+            setup_tracing(dp, settings.trace_sample_rate)
+        if settings.record_dir:
+            from oynaiq_bot.middlewares.recorder import setup_recorder
+
+            setup_recorder(dp, settings)
+        if settings.event_log_dir:
+            from oynaiq_bot.runtime.events import setup_events
+
+            setup_events(settings)
+        setup_referrals(settings)
+        setup_idempotency(settings)
+        setup_reconciliation(dp, settings)
+        setup_waitlist(dp, settings)
+        setup_edits(settings)
+        setup_cities(dp, settings)
+        setup_sports(settings)
+        setup_series(settings)
+    setup_handler_metrics(dp)
+    for router in get_routers():
+        dp.include_router(router)
+    return dp
+
+
+async def run_polling(dp: Dispatcher, bot: Bot, settings: Settings) -> None:
+    """
+    Long-poll updates through :class:`UpdateScheduler` until SIGINT/SIGTERM.
+
+    The first signal stops fetching and starts a graceful drain limited by
+    :attr:`Settings.shutdown_timeout`; a second signal drops whatever is
+    still in flight and proceeds to flushing immediately. SIGUSR1 starts a
+    sampling profiler session of :attr:`Settings.profile_seconds`.
+
+    Args:
+        dp: Dispatcher with all routers included.
+        bot: Bot instance used for API calls.
+        settings: Application settings.
+    """
+
+    scheduler = UpdateScheduler(
+        dp,
+        bot,
+        max_workers=settings.max_concurrent_updates,
+        max_pending=settings.max_pending_updates,
+    )
+
+    stop = asyncio.Event()
+    force = asyncio.Event()
+
+    def on_signal(sig: signal.Signals) -> None:
+        logger.warning("Received %s signal", sig.name)
+        (force if stop.is_set() else stop).set()
+
+    profile_tasks = set()
+
+    def on_profile_signal() -> None:
+        from oynaiq_bot.runtime.profiler import PROFILER
+
+        if PROFILER.running:
+            logger.warning("Profiler is already running, SIGUSR1 ignored")
+            return
+        task = asyncio.create_task(
+            PROFILER.profile(settings.profile_seconds, Path(settings.profile_dir))
+        )
+        profile_tasks.add(task)
+        task.add_done_callback(profile_tasks.discard)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with suppress(NotImplementedError):  # signals are not supported on Windows
+            loop.add_signal_handler(sig, on_signal, sig)
+    if hasattr(signal, "SIGUSR1"):
+        loop.add_signal_handler(signal.SIGUSR1, on_profile_signal)
+
+    me = await bot.me()
+    await dp.emit_startup(bot=bot, **scheduler.workflow_data)
+    metrics_runner = None
+    if settings.metrics_port:
+        from oynaiq_bot.runtime.metrics_server import start_metrics_server
+
+        metrics_runner = await start_metrics_server(settings.metrics_host, settings.metrics_port)
+    api_runner = None
+    if settings.api_port:
+        from oynaiq_bot.runtime.api_server import start_api_server
+
+        api_runner = await start_api_server(
+            settings.api_host, settings.api_port, settings.api_page_size
+        )
+    scheduler.start()
+    loop.call_later(LAZY_ROUTERS_PRELOAD_DELAY, preload_routers, dp)
+    logger.info("Run polling for bot @%s id=%d", me.username, me.id)
+    try:
+        await poll_updates(
+            bot,
+            scheduler,
+            stop,
+            polling_timeout=settings.polling_timeout,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+    finally:
+        logger.info("Polling stopped")
+        try:
+            report = await drain_and_shutdown(scheduler, settings.shutdown_timeout, force)
+            await dp.emit_shutdown(bot=bot, **scheduler.workflow_data)
+            report.log()
+        finally:
+            await bot.session.close()
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+            if api_runner is not None:
+                await api_runner.cleanup()
 
 
 async def main() -> None:
@@ -21,32 +182,56 @@ async def main() -> None:
 
     This function:
         * loads settings from environment;
-        * creates :class:`Bot` and :class:`Dispatcher` instances;
+        * creates the shared HTTP session, :class:`Bot` and :class:`Dispatcher`;
         * includes all routers;
-        * starts long‑polling.
+        * starts long‑polling through the per‑chat update scheduler.
     """
 
     settings = get_settings()
 
-    bot = Bot(token=settings.bot_token, parse_mode="HTML")
-    dp = Dispatcher()
-
-    for router in get_routers():
-        dp.include_router(router)
+    bot = Bot(token=settings.bot_token, session=build_session(settings), parse_mode="HTML")
+    dp = build_dispatcher(settings)
 
-    await dp.start_polling(bot)
+    try:
+        await run_polling(dp, bot, settings)
+    finally:
+        log_api_call_summary()
 
 
-def run() -> None:
+def run(argv: Optional[List[str]] = None) -> None:
     """
     Convenience wrapper to run the bot using :func:`asyncio.run`.
+
+    Command line flags:
+        ``--profile-startup``: print an import-time report and exit.
+        ``--startup-budget-ms N``: same report, exit with status 1 if
+        startup takes longer than ``N`` milliseconds (for CI).
     """
 
+    parser = argparse.ArgumentParser(prog="oynaiq_bot")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print an import-time report of the bot startup and exit",
+    )
+    parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        help="fail with exit status 1 if startup takes longer than this",
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile_startup or args.startup_budget_ms is not None:
+        from oynaiq_bot.runtime.startup import check_startup_budget, profile_startup
+
+        if args.startup_budget_ms is not None:
+            sys.exit(check_startup_budget(args.startup_budget_ms))
+        print(profile_startup().format())
+        return
+
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
 
 
 if __name__ == "__main__":
     run()
-
-
-
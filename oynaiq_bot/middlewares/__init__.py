@@ -0,0 +1,2 @@
+"""Dispatcher middlewares for OynaIQ.bot."""
+
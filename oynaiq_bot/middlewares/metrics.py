@@ -0,0 +1,111 @@
+"""
+Per-handler instrumentation middleware.
+
+Registered as an *inner* middleware on the dispatcher observers, so it runs
+only for events that matched a handler and sees the router that owns it.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import CallbackQuery, TelegramObject
+
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+
+
+# Label used for events without a callback prefix (messages, inline queries...)
+NO_PREFIX = "-"
+# Label used for callback data that does not belong to any known schema
+UNKNOWN_PREFIX = "other"
+# Default CallbackData separator, used by every schema in utils/navigator.py
+SEPARATOR = ":"
+
+
+def _known_prefixes() -> Set[str]:
+    prefixes: Set[str] = set()
+    pending = list(CallbackData.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        prefix = getattr(cls, "__prefix__", None)
+        if prefix:
+            prefixes.add(prefix)
+    return prefixes
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Count handled events, errors and latency per router and callback prefix.
+
+    Metrics:
+        * ``handler_events_total{router, prefix}``;
+        * ``handler_errors_total{router, prefix}``;
+        * ``handler_latency_seconds{router, prefix}`` (histogram).
+
+    Callback prefixes come from :class:`CallbackData` schemas; anything else
+    is reported as ``other`` to keep label cardinality bounded.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY) -> None:
+        labels = ("router", "prefix")
+        self.events = registry.counter(
+            "handler_events_total", "Events processed by handlers.", labels
+        )
+        self.errors = registry.counter(
+            "handler_errors_total", "Handler calls that raised an exception.", labels
+        )
+        self.latency = registry.histogram(
+            "handler_latency_seconds", "Handler latency including inner middlewares.", labels
+        )
+        self._prefixes = _known_prefixes()
+
+    def _prefix(self, event: TelegramObject) -> str:
+        if not isinstance(event, CallbackQuery) or not event.data:
+            return NO_PREFIX
+        prefix = event.data.split(SEPARATOR, 1)[0]
+        if prefix not in self._prefixes:
+            # Schemas from lazily loaded modules may appear after startup
+            self._prefixes = _known_prefixes()
+            if prefix not in self._prefixes:
+                return UNKNOWN_PREFIX
+        return prefix
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        router = data.get("event_router")
+        labels = (router.name if router is not None else NO_PREFIX, self._prefix(event))
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            self.errors.inc(*labels)
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - started, *labels)
+            self.events.inc(*labels)
+
+
+def setup_handler_metrics(dp: Dispatcher, registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Register :class:`HandlerMetricsMiddleware` on every dispatcher observer.
+
+    Inner middlewares of the dispatcher apply to all nested routers,
+    including lazily loaded ones.
+
+    Args:
+        dp: Dispatcher to instrument.
+        registry: Registry receiving the metrics.
+    """
+
+    middleware = HandlerMetricsMiddleware(registry)
+    for name, observer in dp.observers.items():
+        if name not in {"update", "error"}:
+            observer.middleware(middleware)
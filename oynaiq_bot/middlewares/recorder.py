@@ -0,0 +1,359 @@
+"""
+Opt-in recorder of incoming updates for offline replay.
+
+When :attr:`~oynaiq_bot.config.Settings.record_dir` is set, every update
+is pseudonymized and appended to gzip-compressed JSONL files::
+
+    {"t": 1729345678.123, "update": {...}}
+
+Files are named ``updates-<timestamp>-<pid>-<n>.jsonl.gz`` and rotated by size; only
+the newest :attr:`~oynaiq_bot.config.Settings.record_keep_files` are kept.
+:mod:`oynaiq_bot.bench.replay` feeds them back into the dispatcher.
+
+Anonymization keeps the traffic shape and drops personal data:
+
+* user and chat ids are replaced by keyed hashes, so ordering per chat
+  and repeated taps of one user survive;
+* names, usernames, chat titles, contacts, locations and media are removed;
+* free text is replaced by ``x`` of the same length, except commands,
+  main menu buttons and plain numbers; command arguments are hashed;
+* callback data is kept as is, it only contains our own identifiers.
+
+Serialization happens on the event loop; compression and disk writes run
+in batches on a single background thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject, Update
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+FILE_PREFIX = "updates-"
+FILE_SUFFIX = ".jsonl.gz"
+
+# Buffered lines are handed to the writer thread in batches of this size...
+FLUSH_LINES = 256
+# ...or after this many seconds, whichever comes first
+FLUSH_INTERVAL = 1.0
+
+# Objects and fields removed from recorded updates
+DROP_KEYS = frozenset(
+    {
+        "last_name",
+        "username",
+        "title",
+        "bio",
+        "url",
+        "contact",
+        "location",
+        "venue",
+        "photo",
+        "document",
+        "video",
+        "voice",
+        "audio",
+        "video_note",
+        "animation",
+        "sticker",
+    }
+)
+TEXT_KEYS = frozenset({"text", "caption", "query"})
+
+# Longest all-digit text kept as is
+MAX_KEPT_DIGITS = 6
+# Texts recorded verbatim besides commands and short numbers
+KEEP_TEXTS = frozenset({"🧑‍🤝‍🧑 Найти команду", "⚡ Создать игру", "💬 Узнать, как это работает"})
+
+
+class Anonymizer:
+    """
+    Pseudonymizes update payloads.
+
+    Args:
+        salt: Secret key of the id hash; the same salt maps an id to the
+            same pseudonym.
+    """
+
+    def __init__(self, salt: bytes) -> None:
+        self.salt = salt
+
+    def _digest(self, value: str) -> bytes:
+        return hmac.new(self.salt, value.encode("utf-8"), hashlib.sha256).digest()
+
+    def pseudo_id(self, value: int) -> int:
+        """
+        Map an id to a stable 48-bit pseudonym, keeping the sign of group ids.
+        """
+
+        pseudo = int.from_bytes(self._digest(str(value))[:6], "big") or 1
+        return -pseudo if value < 0 else pseudo
+
+    def text(self, text: str) -> str:
+        """
+        Scrub free text, keeping commands, menu buttons and short numbers.
+        """
+
+        # Amounts are kept; longer digit runs may be phone or card numbers
+        if text in KEEP_TEXTS or (text.isdigit() and len(text) <= MAX_KEPT_DIGITS):
+            return text
+        if text.startswith("/"):
+            command, _, args = text.partition(" ")
+            return f"{command} {self._digest(args).hex()[:12]}" if args else command
+        return "x" * len(text)
+
+    def scrub(self, value: Any) -> Any:
+        """
+        Return an anonymized copy of a JSON-compatible update payload.
+        """
+
+        if isinstance(value, list):
+            return [self.scrub(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        result: Dict[str, Any] = {}
+        for key, item in value.items():
+            if key in DROP_KEYS:
+                continue
+            if key == "id" and isinstance(item, int):
+                # Only users and chats have integer ids in the Bot API
+                result[key] = self.pseudo_id(item)
+            elif key == "first_name":
+                result[key] = "user"
+            elif key == "chat_instance":
+                result[key] = self._digest(str(item)).hex()[:16]
+            elif key in TEXT_KEYS and isinstance(item, str):
+                result[key] = self.text(item)
+            else:
+                result[key] = self.scrub(item)
+        return result
+
+
+class RecordingWriter:
+    """
+    Appends JSONL batches to rotating gzip files (used from one thread).
+
+    Args:
+        directory: Directory for recording files (created if missing).
+        max_bytes: Uncompressed size after which a new file is started.
+        keep_files: Number of newest files to keep.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, keep_files: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.keep_files = keep_files
+        self._file: Optional[IO[bytes]] = None
+        self._written = 0
+        self._sequence = 0
+
+    def write(self, lines: List[bytes]) -> None:
+        """
+        Write a batch of encoded lines, rotating the file when it is full.
+        """
+
+        if self._file is None or self._written >= self.max_bytes:
+            self._rotate()
+        assert self._file is not None
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        self._written += len(data)
+
+    def close(self) -> None:
+        """
+        Finish the current file.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{FILE_PREFIX}{stamp}-{os.getpid()}-{self._sequence:04d}{FILE_SUFFIX}"
+        self._file = gzip.open(self.directory / name, "wb", compresslevel=6)
+        self._written = 0
+
+        files = sorted(self.directory.glob(f"{FILE_PREFIX}*{FILE_SUFFIX}"))
+        for old in files[: max(len(files) - self.keep_files, 0)]:
+            old.unlink(missing_ok=True)
+
+
+class UpdateRecorder:
+    """
+    Buffers anonymized updates and writes them on a background thread.
+
+    Args:
+        writer: File writer, only ever called from the background thread.
+        anonymizer: Payload anonymizer.
+        registry: Registry for the ``updates_recorded_total`` counter.
+    """
+
+    def __init__(
+        self,
+        writer: RecordingWriter,
+        anonymizer: Anonymizer,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.writer = writer
+        self.anonymizer = anonymizer
+        self.recorded = registry.counter(
+            "updates_recorded_total", "Updates written by the recorder."
+        )
+        self._buffer: List[bytes] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="update-recorder")
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    def record(self, update: Update) -> None:
+        """
+        Add an update to the buffer; does nothing once the recorder is closed.
+        """
+
+        if self._closed:
+            return
+        raw = update.model_dump(mode="json", by_alias=True, exclude_none=True)
+        payload = self.anonymizer.scrub(raw)
+        line = json.dumps({"t": round(time.time(), 3), "update": payload}, ensure_ascii=False)
+        self._buffer.append(line.encode("utf-8") + b"\n")
+        self.recorded.inc()
+
+        if len(self._buffer) >= FLUSH_LINES:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(FLUSH_INTERVAL, self.flush)
+
+    def flush(self) -> None:
+        """
+        Hand the buffered lines to the writer thread.
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer and not self._closed:
+            batch, self._buffer = self._buffer, []
+            future = self._executor.submit(self.writer.write, batch)
+            future.add_done_callback(_log_write_error)
+
+    async def close(self, budget: float) -> int:
+        """
+        Flush hook: write what is buffered and close the file. Updates
+        arriving afterwards are not recorded.
+
+        Returns:
+            Number of dropped updates (always ``0``, writes are not cancelled).
+        """
+
+        if self._closed:
+            return 0
+        # flush() cancels the timer; no later flush can reach the executor
+        self.flush()
+        self._closed = True
+        self._executor.submit(self.writer.close)
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+        return 0
+
+
+def _log_write_error(future: "Future[None]") -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Failed to write recorded updates - %s: %s", type(exc).__name__, exc)
+
+
+class RecorderMiddleware(BaseMiddleware):
+    """
+    Outer update middleware that records every update before handling it.
+    """
+
+    def __init__(self, recorder: UpdateRecorder) -> None:
+        self.recorder = recorder
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            try:
+                self.recorder.record(event)
+            except Exception:
+                logger.exception("Failed to record update id=%d", event.update_id)
+        return await handler(event, data)
+
+
+def setup_recorder(dp: Dispatcher, settings: Settings) -> Optional[UpdateRecorder]:
+    """
+    Enable update recording when :attr:`Settings.record_dir` is set.
+
+    Args:
+        dp: Dispatcher to record updates of.
+        settings: Application settings.
+
+    Returns:
+        The recorder, or ``None`` when recording is disabled.
+    """
+
+    if not settings.record_dir:
+        return None
+
+    salt = settings.record_salt.encode("utf-8") if settings.record_salt else os.urandom(16)
+    recorder = UpdateRecorder(
+        RecordingWriter(
+            Path(settings.record_dir),
+            max_bytes=int(settings.record_max_mb * 1024 * 1024),
+            keep_files=settings.record_keep_files,
+        ),
+        Anonymizer(salt),
+    )
+    dp.update.outer_middleware(RecorderMiddleware(recorder))
+    SHUTDOWN_HOOKS.register("recorder", recorder.close)
+    logger.info("Recording anonymized updates to %s", settings.record_dir)
+    return recorder
+
+
+def read_recording(paths: Iterable[Path]) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Read recorded updates from files in the given order.
+
+    Plain ``.jsonl`` files are accepted too. A file cut short by a crash
+    is read up to the last complete line.
+
+    Yields:
+        ``(unix timestamp, update payload)`` pairs.
+    """
+
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as fh:  # type: ignore[operator]
+            try:
+                for line in fh:
+                    if line.strip():
+                        record = json.loads(line)
+                        yield record["t"], record["update"]
+            except (EOFError, json.JSONDecodeError):
+                logger.warning("Recording %s is truncated, the rest is skipped", path)
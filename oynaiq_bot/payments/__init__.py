@@ -0,0 +1 @@
+"""Payment verification for OynaIQ.bot: pending payment queue, providers, reconciliation."""
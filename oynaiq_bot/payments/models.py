@@ -0,0 +1,65 @@
+"""
+Payment models shared by the queue, the providers and the worker.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class PaymentState(str, Enum):
+    """
+    Verification state reported by a payment provider.
+
+    Attributes:
+        PENDING: The provider has not seen the money yet.
+        PAID: Payment is confirmed, the seat can be given.
+        FAILED: Payment was declined or never arrived.
+    """
+
+    PENDING = "pending"
+    PAID = "paid"
+    FAILED = "failed"
+
+
+@dataclass
+class Payment:
+    """
+    Deposit payment waiting for verification.
+
+    Attributes:
+        id: Payment identifier, also used in the payment link.
+        user_id: Telegram id of the payer.
+        chat_id: Chat to notify about the result.
+        match_id: Match the seat is booked in.
+        amount: Deposit in tenge.
+        created: Unix time the user reported the payment.
+        attempts: Number of verification attempts so far.
+        next_check: Unix time of the next verification attempt.
+    """
+
+    id: str
+    user_id: int
+    chat_id: int
+    match_id: int
+    amount: int
+    created: float
+    attempts: int = 0
+    next_check: float = 0.0
+
+
+def payment_id(user_id: int, match_id: int, attempt: int = 0) -> str:
+    """
+    Return the payment id of a user's deposit for a match.
+
+    The id is deterministic: the payment link shown before paying and the
+    queued payment agree without storing anything at link creation time.
+    ``attempt`` (see :meth:`~oynaiq_bot.payments.queue.PaymentQueue.attempt`)
+    grows after every payment that did not end with a seat, so a retry is
+    a new payment for the provider.
+    """
+
+    if attempt:
+        return f"m{match_id}u{user_id}a{attempt}"
+    return f"m{match_id}u{user_id}"
@@ -0,0 +1,187 @@
+"""
+Payment provider interface and implementations.
+
+A provider answers one question in bulk: which of these payments have
+arrived? Two implementations ship with the bot:
+
+* :class:`StubPaymentProvider` – in-process stand-in that treats a
+  payment as paid a few seconds after it is first checked; used only when
+  :attr:`~oynaiq_bot.config.Settings.payments_stub` is set (development,
+  load tests);
+* :class:`HttpPaymentProvider` – talks JSON over HTTP to a verification
+  service, e.g. the local stub server from
+  :mod:`oynaiq_bot.payments.stub_server` or an adapter in front of Kaspi.
+
+HTTP protocol::
+
+    POST <base>/verify  {"ids": ["m1u42", ...]}
+    200                 {"states": {"m1u42": "paid", ...}}
+
+Ids missing from the response are treated as still pending.
+
+With neither a provider URL nor the stub configured there is nothing to
+verify payments with, and deposit booking is disabled
+(:func:`payments_enabled`).
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional, Sequence
+
+import aiohttp
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.payments.models import PaymentState
+
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentProvider(abc.ABC):
+    """
+    Verifies payments in batches.
+    """
+
+    @abc.abstractmethod
+    async def verify(self, payment_ids: Sequence[str]) -> Dict[str, PaymentState]:
+        """
+        Return the current state of each payment.
+
+        Args:
+            payment_ids: Payments to check.
+
+        Returns:
+            State per payment id; missing ids are considered pending.
+        """
+
+    async def close(self) -> None:
+        """
+        Release network resources.
+        """
+
+
+class StubPaymentProvider(PaymentProvider):
+    """
+    In-process provider emulating a user who pays shortly after the link.
+
+    A payment is forgotten once it was reported paid or failed: the
+    worker never asks about a settled payment again.
+
+    Args:
+        pay_delay: Seconds after the first check when a payment becomes
+            paid (``None`` — only :meth:`mark_paid` pays).
+        fail_rate: Fraction of payments that end up failed.
+        latency: Emulated round trip of one :meth:`verify` call in seconds.
+        seed: Seed for the failure randomness.
+    """
+
+    def __init__(
+        self,
+        pay_delay: Optional[float] = 3.0,
+        fail_rate: float = 0.0,
+        latency: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.pay_delay = pay_delay
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self._random = random.Random(seed)
+        self._first_seen: Dict[str, float] = {}
+        self._states: Dict[str, PaymentState] = {}
+
+    def mark_paid(self, payment_id: str) -> None:
+        """
+        Mark a payment as paid, as if the user completed the checkout.
+        """
+
+        self._states[payment_id] = PaymentState.PAID
+
+    def check(self, payment_ids: Sequence[str]) -> Dict[str, PaymentState]:
+        """
+        Synchronous core of :meth:`verify`, shared with the stub server.
+        """
+
+        now = time.time()
+        result: Dict[str, PaymentState] = {}
+        for payment_id in payment_ids:
+            state = self._states.pop(payment_id, None)
+            if state is None:
+                first_seen = self._first_seen.setdefault(payment_id, now)
+                if self.pay_delay is not None and now - first_seen >= self.pay_delay:
+                    failed = self.fail_rate and self._random.random() < self.fail_rate
+                    state = PaymentState.FAILED if failed else PaymentState.PAID
+                else:
+                    state = PaymentState.PENDING
+            if state is not PaymentState.PENDING:
+                # Reported once; the worker does not ask again
+                self._first_seen.pop(payment_id, None)
+            result[payment_id] = state
+        return result
+
+    async def verify(self, payment_ids: Sequence[str]) -> Dict[str, PaymentState]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.check(payment_ids)
+
+
+class HttpPaymentProvider(PaymentProvider):
+    """
+    Provider talking to a verification service over HTTP.
+
+    Args:
+        base_url: Service URL, e.g. ``http://127.0.0.1:8090``.
+        timeout: Request timeout in seconds.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def verify(self, payment_ids: Sequence[str]) -> Dict[str, PaymentState]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        async with self._session.post(
+            f"{self.base_url}/verify", json={"ids": list(payment_ids)}
+        ) as response:
+            response.raise_for_status()
+            payload = await response.json()
+        return {
+            payment_id: PaymentState(state)
+            for payment_id, state in payload.get("states", {}).items()
+        }
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def payments_enabled(settings: Settings) -> bool:
+    """
+    Whether payments can be verified, i.e. deposit booking is available.
+    """
+
+    return bool(settings.payments_api_url or settings.payments_stub)
+
+
+def build_provider(settings: Settings) -> Optional[PaymentProvider]:
+    """
+    Create the provider configured by :attr:`Settings.payments_api_url`,
+    or the stub if :attr:`Settings.payments_stub` is set.
+
+    Returns:
+        ``None`` if neither is configured.
+    """
+
+    if settings.payments_api_url:
+        return HttpPaymentProvider(settings.payments_api_url)
+    if settings.payments_stub:
+        logger.warning("PAYMENTS_STUB is set: every payment is approved after a few seconds")
+        return StubPaymentProvider()
+    return None
@@ -0,0 +1,215 @@
+"""
+Durable queue of payments waiting for verification.
+
+Pending payments live in memory, indexed by id and by the time of the
+next check (a heap with lazy deletion), and every change is appended to
+an fsync'ed :class:`~oynaiq_bot.data.journal.Journal`, so payments
+reported by users survive a crash or restart. Records::
+
+    {"op": "add", "payment": {...}}
+    {"op": "done", "id": "m1u42", "state": "paid"}
+    {"op": "retry", "user_id": 42, "match_id": 1, "attempt": 1}
+
+The queue also counts the payment attempts of each user and match, see
+:meth:`PaymentQueue.attempt`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from oynaiq_bot.data.journal import Journal
+from oynaiq_bot.payments.models import Payment, PaymentState
+
+
+logger = logging.getLogger(__name__)
+
+# Journals with this many finished payments are compacted on startup
+COMPACT_DONE = 1000
+
+
+class PaymentQueue:
+    """
+    Pending payments ordered by their next verification time.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Payment] = {}
+        self._attempts: Dict[Tuple[int, int], int] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._journal: Optional[Journal] = None
+        self._last_write: Optional["asyncio.Future[None]"] = None
+        self.added = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, payment_id: str) -> bool:
+        return payment_id in self._pending
+
+    @property
+    def opened(self) -> bool:
+        """
+        Whether the queue is backed by a journal.
+        """
+
+        return self._journal is not None
+
+    def open(self, path: Path) -> None:
+        """
+        Restore pending payments from the journal at ``path`` and persist
+        further changes to it.
+        """
+
+        journal = Journal(path, fsync=True)
+        done = 0
+        for record in journal.load():
+            if record.get("op") == "add":
+                payment = Payment(**record["payment"])
+                self._pending[payment.id] = payment
+            elif record.get("op") == "done":
+                self._pending.pop(record["id"], None)
+                done += 1
+            elif record.get("op") == "retry":
+                self._attempts[(record["user_id"], record["match_id"])] = record["attempt"]
+        for payment in self._pending.values():
+            payment.next_check = 0.0
+            self._push(payment)
+
+        if done >= COMPACT_DONE:
+            records = [self._add_record(p) for p in self._pending.values()]
+            records.extend(
+                self._retry_record(user_id, match_id, attempt)
+                for (user_id, match_id), attempt in self._attempts.items()
+            )
+            journal.rewrite(records)
+        self._journal = journal
+        logger.info("Payment queue restored with %d pending payments", len(self._pending))
+
+    def add(self, payment: Payment) -> bool:
+        """
+        Queue a payment for verification.
+
+        Returns:
+            ``False`` if a payment with this id is already pending.
+        """
+
+        if payment.id in self._pending:
+            return False
+        self._pending[payment.id] = payment
+        self._push(payment)
+        self._write(self._add_record(payment))
+        self.added.set()
+        return True
+
+    def attempt(self, user_id: int, match_id: int) -> int:
+        """
+        Return the number of earlier payments of a user for a match that
+        did not end with a seat; part of the payment id.
+        """
+
+        return self._attempts.get((user_id, match_id), 0)
+
+    def retry(self, user_id: int, match_id: int) -> int:
+        """
+        Start a new payment attempt of a user for a match, e.g. after a
+        failed check or a refund.
+
+        Returns:
+            The new attempt number.
+        """
+
+        attempt = self.attempt(user_id, match_id) + 1
+        self._attempts[(user_id, match_id)] = attempt
+        self._write(self._retry_record(user_id, match_id, attempt))
+        return attempt
+
+    async def sync(self) -> None:
+        """
+        Wait until every change made so far is on disk.
+        """
+
+        if self._last_write is not None:
+            await asyncio.shield(self._last_write)
+
+    def due(self, now: float, limit: int) -> List[Payment]:
+        """
+        Return up to ``limit`` payments whose next check time has come.
+
+        Returned payments stay pending until :meth:`finish` or
+        :meth:`reschedule` is called for them.
+        """
+
+        batch: List[Payment] = []
+        heap = self._heap
+        while heap and len(batch) < limit and heap[0][0] <= now:
+            next_check, _, payment_id = heapq.heappop(heap)
+            payment = self._pending.get(payment_id)
+            # Skip stale heap entries of finished or rescheduled payments
+            if payment is not None and payment.next_check == next_check:
+                batch.append(payment)
+        return batch
+
+    def next_due(self) -> Optional[float]:
+        """
+        Return the earliest next check time, if anything is pending.
+        """
+
+        heap = self._heap
+        while heap and (
+            heap[0][2] not in self._pending or self._pending[heap[0][2]].next_check != heap[0][0]
+        ):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def reschedule(self, payment: Payment, next_check: float) -> None:
+        """
+        Check a still pending payment again at ``next_check``.
+        """
+
+        payment.attempts += 1
+        payment.next_check = next_check
+        self._push(payment)
+
+    def finish(self, payment: Payment, state: PaymentState) -> None:
+        """
+        Remove a verified or failed payment from the queue.
+        """
+
+        if self._pending.pop(payment.id, None) is not None:
+            self._write({"op": "done", "id": payment.id, "state": state.value})
+
+    async def close(self) -> None:
+        """
+        Wait for pending writes and close the journal.
+        """
+
+        if self._journal is not None:
+            await self._journal.close()
+            self._journal = None
+
+    def _push(self, payment: Payment) -> None:
+        heapq.heappush(self._heap, (payment.next_check, next(self._sequence), payment.id))
+
+    def _write(self, record: Dict[str, object]) -> None:
+        if self._journal is not None:
+            self._last_write = asyncio.wrap_future(self._journal.write([record]))
+
+    @staticmethod
+    def _add_record(payment: Payment) -> Dict[str, object]:
+        return {"op": "add", "payment": asdict(payment)}
+
+    @staticmethod
+    def _retry_record(user_id: int, match_id: int, attempt: int) -> Dict[str, object]:
+        return {"op": "retry", "user_id": user_id, "match_id": match_id, "attempt": attempt}
+
+
+# Process-wide queue of payments reported by users
+PAYMENTS = PaymentQueue()
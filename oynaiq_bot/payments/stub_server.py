@@ -0,0 +1,112 @@
+"""
+Local stub of a payment verification service.
+
+Speaks the protocol of :class:`~oynaiq_bot.payments.provider.HttpPaymentProvider`
+and adds a checkout page, so the whole flow can be clicked through
+without Kaspi::
+
+    python -m oynaiq_bot.payments.stub_server --port 8090
+    PAYMENTS_API_URL=http://127.0.0.1:8090 \\
+    KASPI_PAY_URL='http://127.0.0.1:8090/pay/{payment_id}' python main.py
+
+Endpoints:
+    * ``GET /pay/{payment_id}`` – "pay": marks the payment as paid;
+    * ``POST /verify`` – batch verification, ``{"ids": [...]}``.
+
+With ``--auto-pay-after N`` every payment also becomes paid ``N`` seconds
+after it is first checked, which is what load tests need.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from aiohttp import web
+
+from oynaiq_bot.payments.provider import StubPaymentProvider
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_stub_app(ledger: StubPaymentProvider, latency: float = 0.0) -> web.Application:
+    """
+    Create the stub service application around ``ledger``.
+
+    Args:
+        ledger: Stub provider holding payment states.
+        latency: Emulated processing time of ``/verify`` in seconds.
+    """
+
+    async def pay(request: web.Request) -> web.Response:
+        payment_id = request.match_info["payment_id"]
+        ledger.mark_paid(payment_id)
+        logger.info("Payment %s marked as paid", payment_id)
+        return web.Response(
+            text=f"<h1>Kaspi stub</h1><p>Платёж {payment_id} оплачен ✅</p>",
+            content_type="text/html",
+        )
+
+    async def verify(request: web.Request) -> web.Response:
+        payload = await request.json()
+        if latency:
+            await asyncio.sleep(latency)
+        states = ledger.check(payload.get("ids", []))
+        return web.json_response({"states": {key: state.value for key, state in states.items()}})
+
+    app = web.Application()
+    app.router.add_get("/pay/{payment_id}", pay)
+    app.router.add_post("/verify", verify)
+    return app
+
+
+async def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    ledger: Optional[StubPaymentProvider] = None,
+    latency: float = 0.0,
+) -> web.AppRunner:
+    """
+    Start the stub service; ``port=0`` picks a free port.
+
+    Returns:
+        Running :class:`aiohttp.web.AppRunner`, ``runner.addresses[0]``
+        holds the bound address.
+    """
+
+    runner = web.AppRunner(build_stub_app(ledger or StubPaymentProvider(None), latency))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def serve(args: argparse.Namespace) -> None:
+    ledger = StubPaymentProvider(pay_delay=args.auto_pay_after, fail_rate=args.fail_rate)
+    runner = await start_stub_server(args.host, args.port, ledger, args.latency_ms / 1000)
+    host, port = runner.addresses[0][:2]
+    print(f"Payment stub listening on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--auto-pay-after", type=float, default=None, metavar="SECONDS")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,272 @@
+"""
+Background reconciliation of pending payments.
+
+:class:`ReconciliationWorker` takes due payments from the
+:class:`~oynaiq_bot.payments.queue.PaymentQueue` in batches, verifies them
+with a :class:`~oynaiq_bot.payments.provider.PaymentProvider` and settles
+the result. Handlers only enqueue, so button latency never depends on
+the provider. Payments still pending are retried with exponential
+backoff until :attr:`~oynaiq_bot.config.Settings.payments_timeout`.
+
+:func:`settle_payment` gives the seat once a payment is verified and
+tells the user about the outcome. A payment that ends without a seat
+(failed, or paid for a match that filled up or is gone) lets the user
+pay again: the "pay" idempotency key is dropped and the next payment of
+the user for the match gets a new id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from aiogram import Bot, Dispatcher
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.idempotency import IDEMPOTENCY, idempotency_key
+from oynaiq_bot.data.matches import get_match_by_id, record_deposit, take_seat
+from oynaiq_bot.data.recommendations import PROFILES
+from oynaiq_bot.data.waitlist import WAITLIST
+from oynaiq_bot.keyboards.match_details import build_join_waitlist_keyboard
+from oynaiq_bot.payments.models import Payment, PaymentState
+from oynaiq_bot.payments.provider import PaymentProvider, build_provider
+from oynaiq_bot.payments.queue import PAYMENTS, PaymentQueue
+from oynaiq_bot.runtime.events import EVENTS
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+# Longest pause between two checks of the same payment
+MAX_RETRY_DELAY = 60.0
+
+Settle = Callable[[Payment, PaymentState], Awaitable[None]]
+
+
+class ReconciliationWorker:
+    """
+    Verifies queued payments in batches off the handler path.
+
+    Args:
+        queue: Queue of pending payments.
+        provider: Payment provider used for verification.
+        settle: Coroutine called once per payment with its final state.
+        batch_size: Maximum number of payments per provider call.
+        interval: Delay before the first re-check of a pending payment;
+            doubles with every attempt up to :data:`MAX_RETRY_DELAY`.
+        timeout: Seconds after which a still pending payment fails.
+        registry: Registry for the worker metrics.
+    """
+
+    def __init__(
+        self,
+        queue: PaymentQueue,
+        provider: PaymentProvider,
+        settle: Settle,
+        batch_size: int = 50,
+        interval: float = 2.0,
+        timeout: float = 900.0,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.queue = queue
+        self.provider = provider
+        self.settle = settle
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.verified = registry.counter(
+            "payments_verified_total", "Payments settled by the worker.", ("state",)
+        )
+        self.batch_latency = registry.histogram(
+            "payments_verify_seconds", "Latency of payment provider batch calls."
+        )
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def start(self) -> None:
+        """
+        Start the worker task. Calling it twice has no effect.
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="payment-reconciliation")
+
+    async def stop(self) -> None:
+        """
+        Stop the worker; payments in flight stay queued for the next start.
+        """
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_once(self) -> int:
+        """
+        Verify one batch of due payments.
+
+        Returns:
+            Number of payments checked.
+        """
+
+        now = time.time()
+        batch = self.queue.due(now, self.batch_size)
+        if not batch:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            states = await self.provider.verify([payment.id for payment in batch])
+        except Exception as exc:
+            logger.warning("Payment verification failed - %s: %s", type(exc).__name__, exc)
+            states = {}
+        self.batch_latency.observe(time.perf_counter() - started)
+
+        settled = []
+        for payment in batch:
+            state = states.get(payment.id, PaymentState.PENDING)
+            if state is PaymentState.PENDING and now - payment.created < self.timeout:
+                delay = min(self.interval * 2**payment.attempts, MAX_RETRY_DELAY)
+                self.queue.reschedule(payment, now + delay)
+                continue
+            if state is PaymentState.PENDING:
+                state = PaymentState.FAILED  # gave up waiting
+            self.queue.finish(payment, state)
+            self.verified.inc(state.value)
+            settled.append(self._settle(payment, state))
+        await asyncio.gather(*settled)
+        return len(batch)
+
+    async def _settle(self, payment: Payment, state: PaymentState) -> None:
+        try:
+            await self.settle(payment, state)
+        except Exception:
+            logger.exception("Failed to settle payment %s", payment.id)
+
+    async def _run(self) -> None:
+        while True:
+            if await self.run_once():
+                continue
+            # Nothing due: sleep until the next retry or a new payment
+            self.queue.added.clear()
+            next_due = self.queue.next_due()
+            delay = self.interval if next_due is None else max(next_due - time.time(), 0.0)
+            try:
+                await asyncio.wait_for(self.queue.added.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def settle_payment(bot: Bot, payment: Payment, state: PaymentState) -> None:
+    """
+    Give the seat for a verified payment and notify the user.
+    """
+
+    match = get_match_by_id(payment.match_id)
+    paid = state is PaymentState.PAID
+
+    if paid and match is not None and take_seat(match, payment.user_id):
+        # A seat held from the waitlist is the one paid for
+        WAITLIST.accept(match.id, payment.user_id)
+        PROFILES.record_confirmation(payment.user_id, match)
+        record_deposit(match)
+        _log_settled(payment, state, "booked")
+        await bot.send_message(
+            payment.chat_id,
+            "🎉 Оплата подтверждена, место забронировано!\n"
+            f"📍 Игра: {match.location}, {match.day_label()} {match.time_human}\n"
+            "🔔 Мы напомним тебе за 2 часа до начала.",
+        )
+        return
+
+    # No seat came of this payment: let the user pay again with a new id
+    PAYMENTS.retry(payment.user_id, payment.match_id)
+    IDEMPOTENCY.forget(idempotency_key(payment.user_id, payment.match_id, "pay"))
+    _log_settled(payment, state, "cancelled" if match is None else "full" if paid else "failed")
+
+    if match is None:
+        await bot.send_message(
+            payment.chat_id,
+            "😕 Игра, за которую ты платил, отменена.\n"
+            + ("Депозит вернём в течение 3 рабочих дней." if paid else "Оплата не прошла."),
+        )
+    elif paid:
+        await bot.send_message(
+            payment.chat_id,
+            "😕 Пока мы проверяли оплату, свободные места закончились.\n"
+            "Депозит вернём в течение 3 рабочих дней. "
+            "Можешь встать в очередь — напишем, как только место освободится.",
+            reply_markup=build_join_waitlist_keyboard(match),
+        )
+    else:
+        await bot.send_message(
+            payment.chat_id,
+            "😕 Не получилось подтвердить оплату через Kaspi.\n"
+            "Попробуй ещё раз через «💳 Забронировать место» — ссылка будет новой.\n"
+            f"Если деньги списались, напиши организатору @{match.organizer_username}.",
+        )
+
+
+def _log_settled(payment: Payment, state: PaymentState, outcome: str) -> None:
+    EVENTS.emit(
+        "payment.settled",
+        payment_id=payment.id,
+        match_id=payment.match_id,
+        user_id=payment.user_id,
+        state=state.value,
+        outcome=outcome,
+    )
+
+
+def setup_reconciliation(dp: Dispatcher, settings: Settings) -> None:
+    """
+    Restore the payment queue and run the worker while the bot is polling.
+
+    The queue journal lives in :attr:`Settings.state_dir`; the worker is
+    started on dispatcher startup and stopped by a shutdown hook. Without
+    a configured provider no worker runs and deposit booking is disabled.
+    """
+
+    if not PAYMENTS.opened:
+        PAYMENTS.open(Path(settings.state_dir) / "payments.jsonl")
+    provider = build_provider(settings)
+    if provider is None:
+        logger.error(
+            "Neither PAYMENTS_API_URL nor PAYMENTS_STUB is set: deposit booking is disabled"
+        )
+
+        async def close(budget: float) -> int:
+            await PAYMENTS.close()
+            return 0
+
+        SHUTDOWN_HOOKS.register("payments", close)
+        return
+    workers: List[ReconciliationWorker] = []
+
+    async def on_startup(bot: Bot) -> None:
+        async def settle(payment: Payment, state: PaymentState) -> None:
+            await settle_payment(bot, payment, state)
+
+        worker = ReconciliationWorker(
+            PAYMENTS,
+            provider,
+            settle,
+            batch_size=settings.payments_batch_size,
+            interval=settings.payments_poll_interval,
+            timeout=settings.payments_timeout,
+        )
+        worker.start()
+        workers.append(worker)
+
+    async def flush(budget: float) -> int:
+        for worker in workers:
+            await worker.stop()
+        await provider.close()
+        await PAYMENTS.close()
+        return 0
+
+    dp.startup.register(on_startup)
+    SHUTDOWN_HOOKS.register("payments", flush)
@@ -0,0 +1,2 @@
+"""Runtime infrastructure for OynaIQ.bot: HTTP session, metrics, update processing."""
+
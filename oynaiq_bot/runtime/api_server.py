@@ -0,0 +1,236 @@
+"""
+Read-only JSON API over the match store, for the web mini-app.
+
+Served by aiohttp on the bot's event loop, next to the metrics endpoint,
+and reads the same in-memory store as the handlers:
+
+* ``GET /api/sports`` – the sport catalog;
+* ``GET /api/sports/{sport}/matches?offset=0&limit=20`` – one page of
+  :func:`~oynaiq_bot.data.matches.get_matches_by_sport`;
+* ``GET /api/matches/{id}`` – :func:`~oynaiq_bot.data.matches.get_match_by_id`.
+
+Matches are serialized with :data:`~oynaiq_bot.data.codec.MATCH_CODEC`.
+
+Every response carries an ``ETag`` built from the version counter of the
+data it shows (:func:`~oynaiq_bot.data.matches.get_matches_version` per
+sport, :attr:`~oynaiq_bot.utils.sports.SportCatalog.version` for the
+catalog) and a token of the process, so counters restarting from zero
+never validate an old copy. A request whose ``If-None-Match`` holds the
+current tag gets ``304 Not Modified`` without anything being serialized;
+this is what a polling mini-app gets until a match of the sport changes.
+
+List pages are rendered once per version: the JSON and its gzip
+compression are kept in a small LRU cache and sent as they are to every
+client, compressed when ``Accept-Encoding`` allows it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from oynaiq_bot.data.codec import MATCH_CODEC
+from oynaiq_bot.data.matches import (
+    get_match_by_id,
+    get_matches_by_sport,
+    get_matches_version,
+)
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+from oynaiq_bot.utils.sports import CATALOG
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/json; charset=utf-8"
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Rendered list pages kept; one per (sport, offset, limit)
+CACHED_PAGES = 256
+# Bodies shorter than this are sent uncompressed
+GZIP_MIN_BYTES = 512
+
+# Differs between processes so that tags of a previous run never match
+_BOOT = os.urandom(4).hex()
+
+# Tag, JSON body and its gzip compression (``None`` when not worth it)
+Rendered = Tuple[str, bytes, Optional[bytes]]
+
+
+class PageCache:
+    """
+    Rendered list pages, reused while the version of their sport holds.
+
+    Args:
+        size: Number of pages kept, least recently used are dropped.
+    """
+
+    def __init__(self, size: int = CACHED_PAGES) -> None:
+        self.size = size
+        self._pages: "OrderedDict[Tuple[str, int, int], Tuple[str, Rendered]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, sport: str, offset: int, limit: int) -> Rendered:
+        """
+        Return the current rendering of a page, rendering it if the
+        sport changed since it was cached.
+        """
+
+        key = (sport, offset, limit)
+        version = get_matches_version(sport)
+        cached = self._pages.get(key)
+        if cached is not None and cached[0] == version:
+            self._pages.move_to_end(key)
+            return cached[1]
+
+        # The listing is made of immutable snapshots, so the page matches ``version``
+        matches = get_matches_by_sport(sport)
+        page = {
+            "sport": sport,
+            "total": len(matches),
+            "offset": offset,
+            "limit": limit,
+            "items": [MATCH_CODEC.to_dict(match) for match in matches[offset : offset + limit]],
+        }
+        rendered = _render(list_tag(sport, version, offset, limit), page)
+        self._pages[key] = (version, rendered)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.size:
+            self._pages.popitem(last=False)
+        return rendered
+
+
+def list_tag(sport: str, version: str, offset: int, limit: int) -> str:
+    """
+    Return the ETag of a list page.
+    """
+
+    return f'"{_BOOT}-{sport}-{version}-{offset}-{limit}"'
+
+
+def not_modified(request: web.Request, tag: str) -> bool:
+    """
+    Whether the ``If-None-Match`` header of ``request`` holds ``tag``.
+    """
+
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" matches "x"
+    return any(part.strip().removeprefix("W/") == tag for part in header.split(","))
+
+
+def build_api_app(
+    page_size: int = PAGE_SIZE, registry: MetricsRegistry = REGISTRY
+) -> web.Application:
+    """
+    Create an aiohttp application serving the match API.
+
+    Args:
+        page_size: Matches per page when a request gives no ``limit``.
+        registry: Registry for the response counter.
+
+    Returns:
+        Configured :class:`aiohttp.web.Application`.
+    """
+
+    responses = registry.counter(
+        "api_responses_total", "Match API responses.", ("route", "status")
+    )
+    pages = PageCache()
+
+    def respond(route: str, request: web.Request, rendered: Rendered) -> web.Response:
+        tag, body, compressed = rendered
+        headers = {"ETag": tag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if not_modified(request, tag):
+            responses.inc(route, "304")
+            return web.Response(status=304, headers=headers)
+        responses.inc(route, "200")
+        headers["Content-Type"] = CONTENT_TYPE
+        if compressed is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = compressed
+        return web.Response(body=body, headers=headers)
+
+    def not_found(route: str, message: str) -> web.Response:
+        responses.inc(route, "404")
+        return web.json_response({"error": message}, status=404)
+
+    async def sports(request: web.Request) -> web.Response:
+        tag = f'"{_BOOT}-sports-{CATALOG.version}"'
+        if not_modified(request, tag):
+            return respond("sports", request, (tag, b"", None))
+        items = [{"code": code, "label": label} for code, label in CATALOG.labels.items()]
+        return respond("sports", request, _render(tag, {"items": items}))
+
+    async def sport_matches(request: web.Request) -> web.Response:
+        sport = request.match_info["sport"]
+        if sport not in CATALOG.labels:
+            return not_found("matches", f"unknown sport {sport!r}")
+        try:
+            offset = max(int(request.query.get("offset", 0)), 0)
+            limit = min(max(int(request.query.get("limit", page_size)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            responses.inc("matches", "400")
+            return web.json_response({"error": "offset and limit must be integers"}, status=400)
+
+        tag = list_tag(sport, get_matches_version(sport), offset, limit)
+        if not_modified(request, tag):
+            # Answered from the counter alone, the page is not even looked up
+            return respond("matches", request, (tag, b"", None))
+        return respond("matches", request, pages.get(sport, offset, limit))
+
+    async def match(request: web.Request) -> web.Response:
+        try:
+            match_id = int(request.match_info["match_id"])
+        except ValueError:
+            return not_found("match", "match id must be an integer")
+        found = get_match_by_id(match_id)
+        if found is None:
+            return not_found("match", f"no match {match_id}")
+
+        tag = f'"{_BOOT}-match-{match_id}-{get_matches_version(found.sport)}"'
+        if not_modified(request, tag):
+            return respond("match", request, (tag, b"", None))
+        return respond("match", request, _render(tag, MATCH_CODEC.to_dict(found)))
+
+    app = web.Application()
+    app.router.add_get("/api/sports", sports)
+    app.router.add_get("/api/sports/{sport}/matches", sport_matches)
+    app.router.add_get("/api/matches/{match_id}", match)
+    return app
+
+
+def _render(tag: str, data: Dict[str, Any]) -> Rendered:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    compressed = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return tag, body, compressed
+
+
+async def start_api_server(host: str, port: int, page_size: int = PAGE_SIZE) -> web.AppRunner:
+    """
+    Start serving the match API on ``http://<host>:<port>/api/``.
+
+    Args:
+        host: Interface to bind.
+        port: TCP port.
+        page_size: Matches per page when a request gives no ``limit``.
+
+    Returns:
+        Running :class:`aiohttp.web.AppRunner`; call ``cleanup()`` to stop.
+    """
+
+    runner = web.AppRunner(build_api_app(page_size), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Match API available at http://%s:%d/api/", host, port)
+    return runner
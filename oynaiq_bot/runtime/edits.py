@@ -0,0 +1,188 @@
+"""
+Debounced message edits.
+
+Messages that reflect quickly changing state (reaction counters, seat
+counts) should not be edited on every change. :class:`DebouncedEditor`
+collects edit requests per ``(chat_id, message_id)`` and performs at most
+one ``editMessageText`` per message per interval, rendering the message
+from the latest state at the moment of the edit: any number of changes
+within the interval cost one API call.
+
+Edits of all messages share a token bucket of :attr:`DebouncedEditor.rate`
+edits per second, so a burst of changes (a hot match shown in hundreds of
+chats) is spread out instead of hitting the Bot API flood limits.
+
+Timers are plain event loop timers (no task per message); pending edits
+are sent by a flush hook on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Set, Tuple
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+logger = logging.getLogger(__name__)
+
+EDIT_INTERVAL = 3.0
+EDIT_RATE = 20.0
+
+# Returns the new text and keyboard, or ``None`` to skip the edit
+Render = Callable[[], Optional[Tuple[str, Optional[InlineKeyboardMarkup]]]]
+MessageKey = Tuple[int, int]
+
+
+class DebouncedEditor:
+    """
+    Coalesces edits of the same message into one call per interval.
+
+    Args:
+        interval: Minimum seconds between two edits of one message; an
+            edit requested for an idle message is sent after this delay.
+        rate: Edits per second over all messages (``0`` — unlimited);
+            up to one second worth of edits may be sent at once.
+        registry: Registry for the edit counters.
+    """
+
+    def __init__(
+        self,
+        interval: float = EDIT_INTERVAL,
+        rate: float = EDIT_RATE,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.interval = interval
+        self.rate = rate
+        self.requested = registry.counter(
+            "message_edits_requested_total", "Message edits requested by handlers."
+        )
+        self.sent = registry.counter(
+            "message_edits_sent_total", "Debounced message edits sent.", ("result",)
+        )
+        self.delayed = registry.counter(
+            "message_edits_delayed_total", "Message edits postponed by the rate limit."
+        )
+        self._tokens = rate
+        self._refilled = time.monotonic()
+        self._pending: Dict[MessageKey, Tuple["Bot", Render]] = {}
+        self._timers: Dict[MessageKey, asyncio.TimerHandle] = {}
+        self._inflight: Set["asyncio.Task[None]"] = set()
+
+    def schedule(self, bot: "Bot", chat_id: int, message_id: int, render: Render) -> None:
+        """
+        Request an edit of a message; ``render`` is called when it is sent.
+        """
+
+        key = (chat_id, message_id)
+        self.requested.inc()
+        self._pending[key] = (bot, render)
+        if key not in self._timers:
+            self._start_timer(key, self.interval)
+
+    async def flush(self, budget: float) -> int:
+        """
+        Flush hook: send all pending edits now.
+
+        Returns:
+            Number of edits that did not complete within ``budget``.
+        """
+
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        tasks = [self._spawn(key) for key in list(self._pending)]
+        tasks += [task for task in self._inflight if task not in tasks]
+        if not tasks:
+            return 0
+        _, not_done = await asyncio.wait(tasks, timeout=budget)
+        return len(not_done)
+
+    def _start_timer(self, key: MessageKey, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        self._timers[key] = loop.call_later(delay, self._fire, key)
+
+    def _fire(self, key: MessageKey) -> None:
+        del self._timers[key]
+        wait = self._take_token()
+        if wait:
+            self.delayed.inc()
+            self._start_timer(key, wait)
+            return
+        self._spawn(key)
+
+    def _take_token(self) -> float:
+        """
+        Take a token from the bucket; return ``0`` on success, otherwise
+        the seconds until one is available.
+        """
+
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _spawn(self, key: MessageKey) -> "asyncio.Task[None]":
+        task = asyncio.create_task(self._edit(key))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+
+    async def _edit(self, key: MessageKey) -> None:
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        bot, render = entry
+        rendered = render()
+        if rendered is None:
+            return
+        text, markup = rendered
+        try:
+            await bot.edit_message_text(
+                text=text, chat_id=key[0], message_id=key[1], reply_markup=markup
+            )
+        except TelegramRetryAfter as exc:
+            self.sent.inc("retry_after")
+            # Keep a newer request if one arrived meanwhile
+            self._pending.setdefault(key, entry)
+            if key not in self._timers:
+                self._start_timer(key, max(exc.retry_after, self.interval))
+            return
+        except TelegramBadRequest as exc:
+            if "not modified" not in exc.message:
+                self.sent.inc("error")
+                logger.warning("Failed to edit message %s: %s", key, exc.message)
+                return
+        self.sent.inc("ok")
+        # Changes made while the edit was in flight go out one interval later
+        if key in self._pending and key not in self._timers:
+            self._start_timer(key, self.interval)
+
+
+# Process-wide editor for announcement and match cards
+EDITS = DebouncedEditor()
+
+
+def setup_edits(settings: Settings) -> None:
+    """
+    Configure :data:`EDITS` and send its pending edits on shutdown.
+    """
+
+    EDITS.interval = settings.card_edit_interval
+    EDITS.rate = settings.card_edits_per_second
+    SHUTDOWN_HOOKS.register("edits", EDITS.flush)
@@ -0,0 +1,270 @@
+"""
+Structured event log.
+
+Handlers and stores describe what happened as named events with a few
+fields::
+
+    EVENTS.emit("match.seat_taken", match_id=12, players=9)
+
+Besides every match change (``match.*``), the bot logs what users do and
+what came of it: ``booking.confirmed`` / ``booking.left``,
+``payment.queued`` / ``payment.settled`` and ``waitlist.joined``,
+``waitlist.left``, ``waitlist.promoted``, ``waitlist.accepted``,
+``waitlist.declined`` and ``waitlist.expired``.
+
+and the log writes them as JSON lines::
+
+    {"t":1729345678.123,"event":"match.seat_taken","match_id":12,"players":9}
+
+:meth:`EventLog.emit` only appends a tuple to a bounded
+:class:`~collections.deque`, which is O(1) and never blocks the event
+loop. A background thread takes the events in batches, serializes them
+and appends them to ``events.jsonl`` in
+:attr:`~oynaiq_bot.config.Settings.event_log_dir`, rotating the file by
+size and keeping :attr:`~oynaiq_bot.config.Settings.event_log_keep_files`
+old ones. When the writer falls behind and the queue is full, new events
+are dropped and counted in ``events_dropped_total`` instead of waiting;
+so are the events of a batch that could not be written.
+
+The log is disabled (``emit`` returns at once) unless
+:func:`setup_events` found a directory in the settings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.data.matches import Match, MatchChange, add_match_listener
+from oynaiq_bot.runtime.lifecycle import SHUTDOWN_HOOKS
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+from oynaiq_bot.utils.formatter import debug_match_as_dict
+
+
+logger = logging.getLogger(__name__)
+
+FILE_NAME = "events.jsonl"
+QUEUE_SIZE = 10_000
+# Events serialized and written per batch
+BATCH_SIZE = 512
+# The writer wakes up at least this often to write what is queued
+FLUSH_INTERVAL = 0.5
+
+Event = Tuple[float, str, Dict[str, Any]]
+
+
+class RotatingFile:
+    """
+    Appends to ``directory/name``, renaming it to ``name.1`` (``.1`` to
+    ``.2``...) when it grows past ``max_bytes`` (used from one thread).
+
+    Args:
+        directory: Directory for the files (created if missing).
+        max_bytes: Size after which the file is rotated.
+        keep_files: Number of rotated files to keep.
+        name: File name.
+    """
+
+    def __init__(
+        self, directory: Path, max_bytes: int, keep_files: int, name: str = FILE_NAME
+    ) -> None:
+        self.path = directory / name
+        self.max_bytes = max_bytes
+        self.keep_files = keep_files
+        self._file: Optional[IO[bytes]] = None
+        self._written = 0
+
+    def write(self, data: bytes) -> None:
+        """
+        Append data, rotating first if the file is full.
+        """
+
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("ab")
+            self._written = self._file.tell()
+        if self._written >= self.max_bytes:
+            self._rotate()
+            assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        self._written += len(data)
+
+    def close(self) -> None:
+        """
+        Finish the current file.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        self._numbered(self.keep_files).unlink(missing_ok=True)
+        for index in range(self.keep_files - 1, 0, -1):
+            if self._numbered(index).exists():
+                self._numbered(index).replace(self._numbered(index + 1))
+        if self.keep_files:
+            self.path.replace(self._numbered(1))
+        else:
+            self.path.unlink()
+        self._file = self.path.open("ab")
+        self._written = 0
+
+    def _numbered(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+
+class EventLog:
+    """
+    Bounded queue of events drained by a writer thread.
+
+    Args:
+        queue_size: Events that may wait for the writer; more are dropped.
+        registry: Registry for the event counters.
+    """
+
+    def __init__(
+        self, queue_size: int = QUEUE_SIZE, registry: MetricsRegistry = REGISTRY
+    ) -> None:
+        self.queue_size = queue_size
+        self.emitted = registry.counter("events_emitted_total", "Structured events queued.")
+        self.dropped = registry.counter(
+            "events_dropped_total",
+            "Structured events dropped because the queue was full or writing failed."
+        )
+        self.written = 0
+        self._queue: Deque[Event] = deque()
+        self._output: Optional[RotatingFile] = None
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether events are written anywhere.
+        """
+
+        return self._thread is not None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Queue an event; field values must be JSON-serializable (others are
+        written with :func:`str`).
+        """
+
+        if self._thread is None:
+            return
+        if len(self._queue) >= self.queue_size:
+            self.dropped.inc()
+            return
+        self._queue.append((time.time(), event, fields))
+        self.emitted.inc()
+        if len(self._queue) >= BATCH_SIZE:
+            self._wakeup.set()
+
+    def start(self, output: RotatingFile) -> None:
+        """
+        Start the writer thread.
+        """
+
+        self._output = output
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    async def close(self, budget: float) -> int:
+        """
+        Flush hook: write the queued events and stop the writer.
+
+        Returns:
+            Number of events left unwritten within ``budget``.
+        """
+
+        thread = self._thread
+        if thread is None:
+            return 0
+        self._thread = None
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.to_thread(thread.join, budget)
+        return len(self._queue)
+
+    def _run(self) -> None:
+        assert self._output is not None
+        while True:
+            self._wakeup.wait(FLUSH_INTERVAL)
+            self._wakeup.clear()
+            while self._queue:
+                self._write_batch()
+            if self._stopping:
+                self._output.close()
+                return
+
+    def _write_batch(self) -> None:
+        queue = self._queue
+        lines: List[bytes] = []
+        for _ in range(min(len(queue), BATCH_SIZE)):
+            stamp, event, fields = queue.popleft()
+            record = {"t": round(stamp, 3), "event": event, **fields}
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+            lines.append(line.encode("utf-8") + b"\n")
+        try:
+            assert self._output is not None
+            self._output.write(b"".join(lines))
+        except OSError as exc:
+            logger.error("Failed to write %d events - %s", len(lines), exc)
+            self.dropped.inc(amount=len(lines))
+            return
+        self.written += len(lines)
+
+
+# Process-wide event log
+EVENTS = EventLog()
+
+
+def _log_match_change(match: Match, change: MatchChange) -> None:
+    if change is MatchChange.CREATED:
+        EVENTS.emit("match.created", match=debug_match_as_dict(match))
+    else:
+        EVENTS.emit(
+            f"match.{change.value}",
+            match_id=match.id,
+            players=match.players_current,
+            total=match.players_total,
+        )
+
+
+def setup_events(settings: Settings) -> None:
+    """
+    Start :data:`EVENTS` when :attr:`Settings.event_log_dir` is set and
+    log match changes to it.
+
+    Calling it again has no effect.
+    """
+
+    if not settings.event_log_dir or EVENTS.enabled:
+        return
+    EVENTS.queue_size = settings.event_queue_size
+    EVENTS.start(
+        RotatingFile(
+            Path(settings.event_log_dir),
+            max_bytes=int(settings.event_log_max_mb * 1024 * 1024),
+            keep_files=settings.event_log_keep_files,
+        )
+    )
+    add_match_listener(_log_match_change)
+    SHUTDOWN_HOOKS.register("events", EVENTS.close)
+    logger.info("Writing structured events to %s", settings.event_log_dir)
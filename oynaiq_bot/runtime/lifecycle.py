@@ -0,0 +1,171 @@
+"""
+Graceful shutdown sequence for OynaIQ.bot.
+
+On SIGTERM/SIGINT the bot:
+
+1. stops fetching updates and confirms the last fetched batch;
+2. waits for in-flight and queued updates until a deadline;
+3. runs registered flush hooks (stores, journals, outbound queues)
+   with whatever time is left;
+4. closes the Bot API session.
+
+Components that buffer data register a flush hook in
+:data:`SHUTDOWN_HOOKS`; each hook reports how many items it had to drop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from oynaiq_bot.runtime.scheduler import UpdateScheduler
+
+
+logger = logging.getLogger(__name__)
+
+# Receives the remaining time budget in seconds, returns the number of dropped items
+FlushHook = Callable[[float], Awaitable[int]]
+
+# Every hook gets at least this much time, even if the drain used up the deadline
+MIN_HOOK_SECONDS = 1.0
+
+
+class ShutdownHooks:
+    """
+    Ordered collection of flush hooks executed on shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._hooks: List[Tuple[str, FlushHook]] = []
+
+    def register(self, name: str, hook: FlushHook) -> None:
+        """
+        Register a flush hook. Hooks run in registration order.
+
+        Args:
+            name: Short name used in the shutdown report (e.g. ``journal``).
+            hook: Coroutine function receiving the remaining time budget
+                in seconds and returning the number of dropped items.
+        """
+
+        self._hooks.append((name, hook))
+
+    async def flush(self, budget: float) -> Dict[str, int]:
+        """
+        Run all hooks within the given time budget.
+
+        A hook that fails or runs out of time is reported with ``-1``
+        dropped items, meaning "unknown, possibly everything". Each hook
+        gets at least :data:`MIN_HOOK_SECONDS`, so a slow drain cannot
+        starve the flushes completely.
+
+        Args:
+            budget: Total time in seconds available for all hooks.
+
+        Returns:
+            Mapping of hook name to the number of dropped items.
+        """
+
+        deadline = time.monotonic() + budget
+        dropped: Dict[str, int] = {}
+        for name, hook in self._hooks:
+            remaining = max(deadline - time.monotonic(), MIN_HOOK_SECONDS)
+            try:
+                dropped[name] = await asyncio.wait_for(hook(remaining), timeout=remaining)
+            except asyncio.TimeoutError:
+                logger.error("Flush hook %r did not finish in time", name)
+                dropped[name] = -1
+            except Exception:
+                logger.exception("Flush hook %r failed", name)
+                dropped[name] = -1
+        return dropped
+
+
+# Process-wide hooks executed by :func:`drain_and_shutdown`
+SHUTDOWN_HOOKS = ShutdownHooks()
+
+
+@dataclass
+class ShutdownReport:
+    """
+    Summary of a shutdown sequence.
+
+    Attributes:
+        drain_seconds: Time spent waiting for in-flight updates.
+        drained_updates: Updates finished during the drain.
+        dropped_updates: Updates still unfinished at the deadline.
+        flush_dropped: Dropped items per flush hook (``-1`` — unknown).
+        total_seconds: Duration of the whole sequence.
+    """
+
+    drain_seconds: float = 0.0
+    drained_updates: int = 0
+    dropped_updates: int = 0
+    flush_dropped: Dict[str, int] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    def log(self) -> None:
+        """
+        Write the report to the log, as a warning if anything was dropped.
+        """
+
+        lost = self.dropped_updates + sum(abs(v) for v in self.flush_dropped.values())
+        flushes = ", ".join(f"{k}={v}" for k, v in self.flush_dropped.items()) or "none"
+        logger.log(
+            logging.WARNING if lost else logging.INFO,
+            "Shutdown finished in %.2f s: drained %d updates in %.2f s, "
+            "dropped %d updates; flush dropped: %s",
+            self.total_seconds,
+            self.drained_updates,
+            self.drain_seconds,
+            self.dropped_updates,
+            flushes,
+        )
+
+
+async def drain_and_shutdown(
+    scheduler: UpdateScheduler,
+    timeout: float,
+    force: asyncio.Event,
+    hooks: ShutdownHooks = SHUTDOWN_HOOKS,
+) -> ShutdownReport:
+    """
+    Drain the scheduler and flush registered hooks within ``timeout``.
+
+    The caller must have stopped the update fetcher already. Closing the
+    bot session is left to the caller as the last step.
+
+    Args:
+        scheduler: Scheduler with in-flight updates.
+        timeout: Total deadline in seconds for draining and flushing.
+        force: Event that aborts the drain immediately (second signal).
+        hooks: Flush hooks to execute after the drain.
+
+    Returns:
+        :class:`ShutdownReport` with timings and dropped counters.
+    """
+
+    report = ShutdownReport()
+    started = time.monotonic()
+    deadline = started + timeout
+
+    pending_before = scheduler.pending
+    if pending_before:
+        logger.info("Draining %d in-flight updates (deadline %.1f s)", pending_before, timeout)
+        join = asyncio.ensure_future(scheduler.join())
+        forced = asyncio.ensure_future(force.wait())
+        await asyncio.wait((join, forced), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        join.cancel()
+        forced.cancel()
+
+    report.dropped_updates = scheduler.pending
+    report.drained_updates = pending_before - report.dropped_updates
+    report.drain_seconds = time.monotonic() - started
+    await scheduler.stop()
+
+    report.flush_dropped = await hooks.flush(max(deadline - time.monotonic(), 0.0))
+    report.total_seconds = time.monotonic() - started
+    return report
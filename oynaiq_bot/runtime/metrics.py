@@ -0,0 +1,271 @@
+"""
+In-process metrics primitives for OynaIQ.bot.
+
+Counters and histograms here are deliberately tiny: values live in plain
+dictionaries and lists, buckets are fixed at creation time and an
+observation is a single :func:`bisect.bisect_left` plus two integer
+increments. All updates happen on the event loop thread, so no locks are
+needed.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Latency buckets in seconds, from 1 ms to 10 s
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """
+    Monotonic counter split by label values.
+
+    Attributes:
+        name: Metric name.
+        help_text: One-line description of the metric.
+        labelnames: Names of the labels, in the order values are passed.
+        values: Current value per tuple of label values.
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Increase the counter for the given label values.
+
+        Args:
+            labels: Label values in the order of :attr:`labelnames`.
+            amount: Increment, ``1`` by default.
+        """
+
+        values = self.values
+        values[labels] = values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        """
+        Return the current value for the given label values.
+        """
+
+        return self.values.get(labels, 0)
+
+
+class HistogramSeries:
+    """
+    Bucket counts for one combination of label values.
+
+    Attributes:
+        counts: Number of observations per bucket; the last element is
+            the ``+Inf`` bucket. Counts are not cumulative.
+        total: Sum of all observed values.
+        count: Number of observations.
+    """
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts: List[int] = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+    def quantile(self, bounds: Sequence[float], q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside the target bucket.
+
+        Args:
+            bounds: Upper bounds of the finite buckets.
+            q: Quantile in the ``[0, 1]`` range.
+
+        Returns:
+            Estimated value or ``None`` if nothing was observed.
+        """
+
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for idx, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            if idx >= len(bounds):
+                # Everything above the last bound is reported as the bound itself
+                return bounds[-1]
+            lower = bounds[idx - 1] if idx else 0.0
+            upper = bounds[idx]
+            return lower + (upper - lower) * (rank - seen) / bucket_count
+        return bounds[-1]
+
+
+class Histogram:
+    """
+    Histogram with fixed buckets split by label values.
+
+    Attributes:
+        name: Metric name.
+        help_text: One-line description of the metric.
+        labelnames: Names of the labels, in the order values are passed.
+        buckets: Sorted upper bounds of the finite buckets.
+        series: Bucket counts per tuple of label values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.series: Dict[LabelValues, HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record a single observation.
+
+        Args:
+            value: Observed value (seconds for latency histograms).
+            labels: Label values in the order of :attr:`labelnames`.
+        """
+
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+        series.count += 1
+
+    def quantile(self, q: float, *labels: str) -> Optional[float]:
+        """
+        Estimate a quantile for the given label values.
+        """
+
+        series = self.series.get(labels)
+        return series.quantile(self.buckets, q) if series else None
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics shared across the process.
+
+    Metrics are created lazily by name, so modules can declare them at
+    import time without caring about the order of imports.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Get or create a :class:`Counter`.
+        """
+
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help_text, labelnames)
+        if not isinstance(metric, Counter):
+            raise TypeError(f"Metric {name!r} is already registered as {type(metric).__name__}.")
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """
+        Get or create a :class:`Histogram`.
+        """
+
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(name, help_text, labelnames, buckets)
+        if not isinstance(metric, Histogram):
+            raise TypeError(f"Metric {name!r} is already registered as {type(metric).__name__}.")
+        return metric
+
+    def __iter__(self) -> Iterator[object]:
+        return iter(list(self._metrics.values()))
+
+
+# Process-wide registry used by the bot
+REGISTRY = MetricsRegistry()
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(registry: MetricsRegistry = REGISTRY) -> str:
+    """
+    Render all metrics in the Prometheus text exposition format (0.0.4).
+
+    Args:
+        registry: Registry to render.
+
+    Returns:
+        Exposition text ending with a newline.
+    """
+
+    lines: List[str] = []
+    for metric in registry:
+        if isinstance(metric, Counter):
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} counter")
+            for labels, value in sorted(metric.values.items()):
+                lines.append(
+                    f"{metric.name}{_format_labels(metric.labelnames, labels)} "
+                    f"{_format_value(value)}"
+                )
+        elif isinstance(metric, Histogram):
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} histogram")
+            bounds = [repr(float(b)) for b in metric.buckets] + ["+Inf"]
+            for labels, series in sorted(metric.series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, series.counts):
+                    cumulative += bucket_count
+                    le = _format_labels(metric.labelnames, labels, f'le="{bound}"')
+                    lines.append(f"{metric.name}_bucket{le} {cumulative}")
+                plain = _format_labels(metric.labelnames, labels)
+                lines.append(f"{metric.name}_sum{plain} {_format_value(series.total)}")
+                lines.append(f"{metric.name}_count{plain} {series.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,63 @@
+"""
+Small local HTTP endpoint exposing metrics in Prometheus text format.
+
+Served by aiohttp (already a dependency of aiogram) on the bot's event
+loop; a scrape only renders the in-memory registry.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from aiohttp import web
+
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry, render_prometheus
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def build_metrics_app(registry: MetricsRegistry = REGISTRY) -> web.Application:
+    """
+    Create an aiohttp application serving ``GET /metrics``.
+
+    Args:
+        registry: Registry to expose.
+
+    Returns:
+        Configured :class:`aiohttp.web.Application`.
+    """
+
+    async def metrics(_: web.Request) -> web.Response:
+        return web.Response(
+            body=render_prometheus(registry).encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    return app
+
+
+async def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = REGISTRY
+) -> web.AppRunner:
+    """
+    Start serving metrics on ``http://<host>:<port>/metrics``.
+
+    Args:
+        host: Interface to bind, ``127.0.0.1`` keeps the endpoint local.
+        port: TCP port.
+        registry: Registry to expose.
+
+    Returns:
+        Running :class:`aiohttp.web.AppRunner`; call ``cleanup()`` to stop.
+    """
+
+    runner = web.AppRunner(build_metrics_app(registry), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics available at http://%s:%d/metrics", host, port)
+    return runner
@@ -0,0 +1,122 @@
+"""
+On-demand sampling profiler.
+
+A background thread periodically captures the Python stack of the event
+loop thread via :func:`sys._current_frames` and aggregates identical stacks.
+The result is written in the "collapsed stack" format understood by
+``flamegraph.pl``, speedscope and similar tools::
+
+    oynaiq_bot.main:run;asyncio.base_events:run_forever;... 42
+
+Sampling only reads frame objects, so the profiled thread is never
+interrupted; with the default 5 ms interval the overhead is a few percent
+of one core while a session is running and zero otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005
+MAX_DEPTH = 128
+
+
+def _collapse(frame: Optional[FrameType]) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Collects collapsed stacks of one thread for a limited time.
+
+    Only one profiling session may run at a time; :attr:`running` tells
+    whether a session is in progress.
+
+    Args:
+        interval: Seconds between samples.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.running = False
+
+    def sample(self, thread_id: int, duration: float) -> Counter[str]:
+        """
+        Sample ``thread_id`` for ``duration`` seconds (blocking).
+
+        Args:
+            thread_id: Identifier of the thread to profile.
+            duration: Session length in seconds.
+
+        Returns:
+            Counter of collapsed stacks.
+
+        Raises:
+            RuntimeError: If another session is already running.
+        """
+
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Profiler is already running")
+        self.running = True
+        stacks: Counter[str] = Counter()
+        try:
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+                time.sleep(self.interval)
+        finally:
+            self.running = False
+            self._lock.release()
+        return stacks
+
+    async def profile(self, duration: float, out_dir: Path) -> Path:
+        """
+        Profile the event loop thread and write a collapsed-stack file.
+
+        Sampling runs in a worker thread, so the event loop keeps serving
+        updates while it is being profiled.
+
+        Args:
+            duration: Session length in seconds.
+            out_dir: Directory for the output file (created if missing).
+
+        Returns:
+            Path of the written ``.folded`` file.
+        """
+
+        loop_thread = threading.get_ident()
+        logger.info("Sampling profiler started for %.0f s", duration)
+        stacks = await asyncio.to_thread(self.sample, loop_thread, duration)
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / time.strftime("profile-%Y%m%d-%H%M%S.folded")
+        with path.open("w", encoding="utf-8") as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+        logger.info("Profile with %d samples written to %s", sum(stacks.values()), path)
+        return path
+
+
+# Process-wide profiler shared by the admin command and the signal handler
+PROFILER = SamplingProfiler()
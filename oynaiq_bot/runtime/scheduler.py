@@ -0,0 +1,261 @@
+"""
+Bounded concurrent update processing with per-chat ordering.
+
+:class:`UpdateScheduler` sits between the update fetcher and the
+:class:`~aiogram.Dispatcher`:
+
+* updates of one chat are processed strictly one after another, so wizard
+  steps and double taps never interleave;
+* different chats are processed in parallel by a fixed pool of workers;
+* the number of accepted but unfinished updates is capped, and
+  :meth:`UpdateScheduler.submit` waits for a free slot, which in turn
+  stops the fetcher from requesting more updates (backpressure).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import GetUpdates, TelegramMethod
+from aiogram.types import Update
+from aiogram.utils.backoff import Backoff, BackoffConfig
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKOFF_CONFIG = BackoffConfig(min_delay=1.0, max_delay=5.0, factor=1.3, jitter=0.1)
+
+
+def chat_key(update: Update) -> Hashable:
+    """
+    Return the ordering key of an update.
+
+    Updates sharing a key are processed sequentially. The key is the chat id
+    when the event belongs to a chat, otherwise the id of the user who
+    triggered it. Updates without either are not ordered at all.
+
+    Args:
+        update: Incoming update.
+
+    Returns:
+        Hashable ordering key.
+    """
+
+    try:
+        event = update.event
+    except Exception:  # unknown update type, let the dispatcher complain
+        return ("update", update.update_id)
+
+    chat = getattr(event, "chat", None)
+    if chat is None:
+        message = getattr(event, "message", None)
+        chat = getattr(message, "chat", None)
+    if chat is not None:
+        return chat.id
+
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return user.id
+
+    return ("update", update.update_id)
+
+
+class UpdateScheduler:
+    """
+    Per-chat serial queues served by a bounded worker pool.
+
+    Args:
+        dispatcher: Dispatcher that handles the updates.
+        bot: Bot instance passed to handlers.
+        max_workers: Number of updates processed concurrently.
+        max_pending: Maximum number of accepted but unfinished updates.
+        workflow_data: Extra context passed to :meth:`Dispatcher.feed_update`.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        max_workers: int = 64,
+        max_pending: int = 1000,
+        **workflow_data: Any,
+    ) -> None:
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers and max_pending must be positive")
+
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.workflow_data: Dict[str, Any] = {
+            "dispatcher": dispatcher,
+            "bots": [bot],
+            **dispatcher.workflow_data,
+            **workflow_data,
+        }
+
+        self._slots = asyncio.Semaphore(max_pending)
+        self._chats: Dict[Hashable, Deque[Update]] = {}
+        self._ready: "asyncio.Queue[Hashable]" = asyncio.Queue()
+        self._workers: List[asyncio.Task[None]] = []
+        self._pending = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of accepted updates that are queued or being processed.
+        """
+
+        return self._pending
+
+    def start(self) -> None:
+        """
+        Spawn worker tasks. Calling it twice has no effect.
+        """
+
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"update-worker-{idx}")
+            for idx in range(self.max_workers)
+        ]
+
+    async def submit(self, update: Update) -> None:
+        """
+        Accept an update for processing.
+
+        Waits while :attr:`max_pending` updates are already in flight.
+
+        Args:
+            update: Update to process.
+        """
+
+        await self._slots.acquire()
+        self._pending += 1
+        self._idle.clear()
+
+        key = chat_key(update)
+        queue = self._chats.get(key)
+        if queue is None:
+            # The chat is idle: create its queue and mark it ready for a worker
+            self._chats[key] = deque((update,))
+            self._ready.put_nowait(key)
+        else:
+            # A worker owns this chat and will pick the update up in order
+            queue.append(update)
+
+    async def join(self) -> None:
+        """
+        Wait until every accepted update has been processed.
+        """
+
+        await self._idle.wait()
+
+    async def stop(self) -> None:
+        """
+        Cancel worker tasks without waiting for queued updates.
+        """
+
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            queue = self._chats[key]
+            update = queue[0]
+            try:
+                await self._process(update)
+            finally:
+                queue.popleft()
+                if queue:
+                    self._ready.put_nowait(key)
+                else:
+                    del self._chats[key]
+                self._pending -= 1
+                if not self._pending:
+                    self._idle.set()
+                self._slots.release()
+
+    async def _process(self, update: Update) -> None:
+        try:
+            response = await self.dispatcher.feed_update(self.bot, update, **self.workflow_data)
+            if isinstance(response, TelegramMethod):
+                await self.dispatcher.silent_call_request(bot=self.bot, result=response)
+        except Exception as exc:
+            logger.exception(
+                "Cause exception while process update id=%d: %s: %s",
+                update.update_id,
+                type(exc).__name__,
+                exc,
+            )
+
+
+async def poll_updates(
+    bot: Bot,
+    scheduler: UpdateScheduler,
+    stop: asyncio.Event,
+    polling_timeout: int = 10,
+    allowed_updates: Optional[List[str]] = None,
+    backoff_config: BackoffConfig = DEFAULT_BACKOFF_CONFIG,
+) -> None:
+    """
+    Long-poll ``getUpdates`` and feed the results into the scheduler.
+
+    The next ``getUpdates`` request is sent only after every update of the
+    previous batch was accepted by :meth:`UpdateScheduler.submit`, so a
+    saturated scheduler naturally slows the fetcher down. On stop, the
+    accepted updates are confirmed so they are not redelivered to the
+    next instance.
+
+    Args:
+        bot: Bot used for ``getUpdates`` requests.
+        scheduler: Scheduler receiving the updates.
+        stop: Event that ends polling once set.
+        polling_timeout: Long-polling wait time in seconds.
+        allowed_updates: Update types to receive (``None`` — Telegram default).
+        backoff_config: Retry delays for failed requests.
+    """
+
+    backoff = Backoff(config=backoff_config)
+    get_updates = GetUpdates(timeout=polling_timeout, allowed_updates=allowed_updates)
+    request_timeout = int(bot.session.timeout + polling_timeout)
+
+    while not stop.is_set():
+        fetch = asyncio.ensure_future(bot(get_updates, request_timeout=request_timeout))
+        stopped = asyncio.ensure_future(stop.wait())
+        await asyncio.wait((fetch, stopped), return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        if not fetch.done():
+            # Stop requested while waiting: the batch is not confirmed, so
+            # Telegram will redeliver it to the next instance
+            fetch.cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+            break
+
+        try:
+            updates = fetch.result()
+        except Exception as exc:
+            logger.error("Failed to fetch updates - %s: %s", type(exc).__name__, exc)
+            logger.warning("Sleep for %f seconds and try again...", backoff.next_delay)
+            await backoff.asleep()
+            continue
+        backoff.reset()
+
+        for update in updates:
+            await scheduler.submit(update)
+            get_updates.offset = update.update_id + 1
+
+    if get_updates.offset is not None:
+        try:
+            await bot(GetUpdates(offset=get_updates.offset, limit=1, timeout=0))
+        except Exception as exc:
+            logger.warning("Failed to confirm fetched updates - %s: %s", type(exc).__name__, exc)
@@ -0,0 +1,177 @@
+"""
+Shared HTTP session for Bot API calls.
+
+The session wraps aiogram's :class:`AiohttpSession` with a connection pool
+configured from :class:`~oynaiq_bot.config.Settings` and a request
+middleware that records latency and errors of every Bot API method.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from oynaiq_bot.config import Settings
+from oynaiq_bot.runtime.metrics import REGISTRY, MetricsRegistry
+from oynaiq_bot.runtime.tracing import add_span
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+
+logger = logging.getLogger(__name__)
+
+
+class ApiCallMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Request middleware that measures every Bot API call.
+
+    Records two metrics:
+        * ``bot_api_request_seconds`` – latency histogram per method;
+        * ``bot_api_errors_total`` – error counter per method and error type.
+
+    Calls made while handling a traced update are also attached to the
+    trace as ``api:<method>`` spans.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY) -> None:
+        self.latency = registry.histogram(
+            "bot_api_request_seconds",
+            "Latency of Bot API calls.",
+            labelnames=("method",),
+        )
+        self.errors = registry.counter(
+            "bot_api_errors_total",
+            "Failed Bot API calls.",
+            labelnames=("method", "error"),
+        )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        api_method = method.__api_method__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as exc:
+            self.errors.inc(api_method, type(exc).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.latency.observe(elapsed, api_method)
+            add_span(f"api:{api_method}", elapsed)
+
+
+class TunedAiohttpSession(AiohttpSession):
+    """
+    :class:`AiohttpSession` with an explicitly configured connection pool.
+
+    Args:
+        limit: Total number of simultaneous connections.
+        limit_per_host: Connection limit per host (``0`` — no limit).
+        dns_cache_ttl: Seconds to cache DNS lookups (``0`` disables cache).
+        keepalive_timeout: Seconds to keep idle connections alive
+            (``0`` closes the connection after every request).
+        method_timeouts: Request timeouts per Bot API method name, used
+            when the caller does not pass an explicit timeout.
+        kwargs: Passed to :class:`AiohttpSession` (``api``, ``timeout``...).
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        method_timeouts: Optional[Dict[str, float]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self._connector_init.update(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            use_dns_cache=dns_cache_ttl > 0,
+            ttl_dns_cache=dns_cache_ttl or None,
+        )
+        if keepalive_timeout > 0:
+            self._connector_init["keepalive_timeout"] = keepalive_timeout
+        else:
+            self._connector_init["force_close"] = True
+
+        self.method_timeouts: Dict[str, float] = dict(method_timeouts or {})
+
+    async def make_request(
+        self,
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        if timeout is None:
+            timeout = self.method_timeouts.get(method.__api_method__)  # type: ignore[assignment]
+        return await super().make_request(bot, method, timeout=timeout)
+
+
+def build_session(settings: Settings) -> TunedAiohttpSession:
+    """
+    Create the shared Bot API session from settings.
+
+    Args:
+        settings: Application settings.
+
+    Returns:
+        Configured :class:`TunedAiohttpSession` with API call metrics enabled.
+    """
+
+    kwargs: Dict[str, Any] = {"timeout": settings.http_timeout}
+    if settings.api_base_url:
+        kwargs["api"] = TelegramAPIServer.from_base(settings.api_base_url.rstrip("/"))
+
+    session = TunedAiohttpSession(
+        limit=settings.http_pool_limit,
+        limit_per_host=settings.http_pool_limit_per_host,
+        dns_cache_ttl=settings.http_dns_cache_ttl,
+        keepalive_timeout=settings.http_keepalive_timeout,
+        method_timeouts=settings.http_method_timeouts,
+        **kwargs,
+    )
+    session.middleware(ApiCallMetricsMiddleware())
+    return session
+
+
+def log_api_call_summary(registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Log call count, error count and p50/p95 latency per Bot API method.
+
+    Args:
+        registry: Registry holding the session metrics.
+    """
+
+    latency = registry.histogram("bot_api_request_seconds", "", ("method",))
+    errors = registry.counter("bot_api_errors_total", "", ("method", "error"))
+
+    for (api_method,), series in sorted(latency.series.items()):
+        failed = sum(v for labels, v in errors.values.items() if labels[0] == api_method)
+        p50 = series.quantile(latency.buckets, 0.5) or 0.0
+        p95 = series.quantile(latency.buckets, 0.95) or 0.0
+        logger.info(
+            "Bot API %s: %d calls, %d errors, p50=%.1f ms, p95=%.1f ms",
+            api_method,
+            series.count,
+            failed,
+            p50 * 1000,
+            p95 * 1000,
+        )
@@ -0,0 +1,199 @@
+"""
+Startup time profiling for OynaIQ.bot.
+
+:func:`profile_startup` starts a fresh interpreter with ``-X importtime``,
+imports aiogram, then :mod:`oynaiq_bot.main`, and builds the dispatcher
+with default settings, then summarizes
+where the time went: per startup phase, per top-level package and the
+slowest individual modules. It backs the ``--profile-startup`` and
+``--startup-budget-ms`` command line flags.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Executed in a child interpreter; prints phase timings as JSON on stdout.
+# The dispatcher is built with settings as in production, with the
+# persistent stores in a scratch directory.
+_PROBE = """
+import json, sys, tempfile, time
+started = time.perf_counter()
+import aiogram, aiogram.types
+framework = time.perf_counter()
+import oynaiq_bot.main as entry
+from oynaiq_bot.config import Settings
+imported = time.perf_counter()
+with tempfile.TemporaryDirectory() as state_dir:
+    entry.build_dispatcher(Settings(bot_token="42:STARTUP", state_dir=state_dir))
+    built = time.perf_counter()
+own = sorted(name for name in sys.modules if name.startswith("oynaiq_bot."))
+print(json.dumps({
+    "aiogram": framework - started,
+    "import": imported - framework,
+    "dispatcher": built - imported,
+    "modules": own,
+}))
+"""
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class StartupProfile:
+    """
+    Result of a single profiled startup.
+
+    Attributes:
+        phases: Wall time in seconds per phase: ``aiogram`` (importing the
+            framework alone), ``import`` (the bot on top of it) and
+            ``dispatcher`` (:func:`~oynaiq_bot.main.build_dispatcher`).
+        packages: Self import time in seconds per top-level package.
+        modules: ``(self seconds, module name)`` pairs, slowest first.
+        loaded: Project modules imported during startup.
+    """
+
+    phases: Dict[str, float] = field(default_factory=dict)
+    packages: Dict[str, float] = field(default_factory=dict)
+    modules: List[Tuple[float, str]] = field(default_factory=list)
+    loaded: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        """
+        Total startup time in seconds (all phases).
+        """
+
+        return sum(self.phases.values())
+
+    @property
+    def own(self) -> float:
+        """
+        Startup time in seconds spent on top of importing aiogram.
+        """
+
+        return self.total - self.phases.get("aiogram", 0.0)
+
+    def format(self, top: int = 15) -> str:
+        """
+        Render a human-readable report.
+
+        Args:
+            top: Number of slowest modules to list.
+
+        Returns:
+            Multi-line report text.
+        """
+
+        lines = [f"Startup: {self.total * 1000:.0f} ms"]
+        lines += [f"  {name:<12} {sec * 1000:8.1f} ms" for name, sec in self.phases.items()]
+
+        lines.append("\nImport time by package (self):")
+        by_package = sorted(self.packages.items(), key=lambda kv: kv[1], reverse=True)
+        lines += [f"  {name:<28} {sec * 1000:8.1f} ms" for name, sec in by_package[:top]]
+
+        lines.append(f"\nSlowest {top} modules (self):")
+        lines += [f"  {name:<48} {sec * 1000:8.1f} ms" for sec, name in self.modules[:top]]
+
+        lines.append("\nProject modules loaded eagerly:")
+        lines += [f"  {name}" for name in self.loaded]
+        return "\n".join(lines)
+
+
+def _parse_importtime(stderr: str) -> Tuple[Dict[str, float], List[Tuple[float, str]]]:
+    packages: Dict[str, float] = defaultdict(float)
+    modules: List[Tuple[float, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _cumulative, name = line[len("import time:"):].split("|", 2)
+            seconds = int(self_us) / 1_000_000
+        except ValueError:
+            continue
+        name = name.strip()
+        packages[name.split(".", 1)[0]] += seconds
+        modules.append((seconds, name))
+    modules.sort(reverse=True)
+    return dict(packages), modules
+
+
+def profile_startup(repeat: int = 3, python: Optional[str] = None) -> StartupProfile:
+    """
+    Profile startup in fresh interpreters and return the fastest run.
+
+    The first run usually pays for writing bytecode caches, so taking the
+    best of several runs gives a stable number for budget checks.
+
+    Args:
+        repeat: Number of interpreter launches.
+        python: Interpreter to use, defaults to the current one.
+
+    Returns:
+        :class:`StartupProfile` of the fastest run.
+
+    Raises:
+        RuntimeError: If the child interpreter fails.
+    """
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    best: Optional[StartupProfile] = None
+    for _ in range(max(repeat, 1)):
+        proc = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", _PROBE],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=PROJECT_ROOT,
+        )
+        if proc.returncode:
+            raise RuntimeError(f"Startup probe failed:\n{proc.stderr[-2000:]}")
+
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        packages, modules = _parse_importtime(proc.stderr)
+        profile = StartupProfile(
+            phases={phase: probe[phase] for phase in ("aiogram", "import", "dispatcher")},
+            packages=packages,
+            modules=modules,
+            loaded=probe["modules"],
+        )
+        if best is None or profile.total < best.total:
+            best = profile
+
+    assert best is not None
+    return best
+
+
+def check_startup_budget(budget_ms: float, repeat: int = 3) -> int:
+    """
+    Print the startup report and compare it with a time budget.
+
+    Intended for CI: a non-zero exit status means startup got slower
+    than the agreed threshold.
+
+    Args:
+        budget_ms: Maximum allowed startup time in milliseconds.
+        repeat: Number of interpreter launches (best one is used).
+
+    Returns:
+        Process exit status: ``0`` within budget, ``1`` over budget.
+    """
+
+    profile = profile_startup(repeat=repeat)
+    print(profile.format())
+    total_ms = profile.total * 1000
+    if total_ms > budget_ms:
+        print(f"\nFAIL: startup took {total_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+        return 1
+    print(f"\nOK: startup took {total_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+    return 0
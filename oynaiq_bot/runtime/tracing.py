@@ -0,0 +1,225 @@
+"""
+Sampled per-update trace spans.
+
+A trace is started for a random fraction of updates (see
+:attr:`~oynaiq_bot.config.Settings.trace_sample_rate`) and stored in a
+context variable, so every coroutine handling that update can attach
+spans without passing anything around. When the update is finished the
+trace is logged as a single line::
+
+    trace update=1042 total=18.4ms middleware=1.2ms filters=0.6ms
+    handler=16.3ms store=0.0ms render=0.3ms api:editMessageText=14.9ms
+
+Phases:
+    * ``middleware`` – outer update middlewares (errors, user context, FSM);
+    * ``filters`` – router propagation, filters and callback data unpacking;
+    * ``handler`` – inner middlewares and the handler itself;
+    * ``api:<method>`` – Bot API calls made while handling the update;
+    * any custom spans opened with :func:`span` (e.g. ``store``, ``render``).
+
+When the update is not sampled :func:`span` costs one context variable
+lookup.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject, Update
+
+
+logger = logging.getLogger("oynaiq_bot.trace")
+
+
+class Trace:
+    """
+    Spans collected for one update.
+
+    Attributes:
+        update_id: Identifier of the traced update.
+        started: :func:`time.perf_counter` value at the start of the trace.
+        marks: Named points in time used to derive the phases.
+        spans: ``(name, seconds)`` pairs in completion order.
+    """
+
+    __slots__ = ("update_id", "started", "marks", "spans")
+
+    def __init__(self, update_id: int) -> None:
+        self.update_id = update_id
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self.spans: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        """
+        Remember the first time the trace reached ``name``.
+        """
+
+        self.marks.setdefault(name, time.perf_counter())
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Attach a finished span.
+        """
+
+        self.spans.append((name, seconds))
+
+    def format(self, finished: float) -> str:
+        """
+        Render the trace as a single log line.
+        """
+
+        parts = [
+            f"trace update={self.update_id}",
+            f"total={(finished - self.started) * 1000:.1f}ms",
+        ]
+        dispatch = self.marks.get("dispatch")
+        handler = self.marks.get("handler")
+        if dispatch is not None:
+            parts.append(f"middleware={(dispatch - self.started) * 1000:.1f}ms")
+            if handler is not None:
+                parts.append(f"filters={(handler - dispatch) * 1000:.1f}ms")
+
+        totals: Dict[str, float] = {}
+        for name, seconds in self.spans:
+            totals[name] = totals.get(name, 0.0) + seconds
+        parts += [f"{name}={seconds * 1000:.1f}ms" for name, seconds in totals.items()]
+        return " ".join(parts)
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("oynaiq_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """
+    Return the trace of the update being handled, if it is sampled.
+    """
+
+    return _current.get()
+
+
+def add_span(name: str, seconds: float) -> None:
+    """
+    Attach an already measured span to the current trace, if any.
+    """
+
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Measure the enclosed block as a span of the current trace.
+
+    Example::
+
+        with span("render"):
+            text = format_match_details(match)
+    """
+
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - started)
+
+
+class TraceUpdateMiddleware(BaseMiddleware):
+    """
+    Outermost update middleware that starts sampled traces.
+
+    Args:
+        sample_rate: Fraction of updates to trace, from ``0`` to ``1``.
+    """
+
+    def __init__(self, sample_rate: float) -> None:
+        self.sample_rate = sample_rate
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if random.random() >= self.sample_rate or not isinstance(event, Update):
+            return await handler(event, data)
+
+        trace = Trace(event.update_id)
+        token = _current.set(trace)
+        try:
+            return await handler(event, data)
+        finally:
+            _current.reset(token)
+            logger.info(trace.format(time.perf_counter()))
+
+
+class _PhaseMiddleware(BaseMiddleware):
+    """
+    Marks the start of a phase on the current trace.
+    """
+
+    def __init__(self, mark: str, span_name: Optional[str] = None) -> None:
+        self.mark = mark
+        self.span_name = span_name
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        trace = _current.get()
+        if trace is None:
+            return await handler(event, data)
+        trace.mark(self.mark)
+        if self.span_name is None:
+            return await handler(event, data)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            trace.add(self.span_name, time.perf_counter() - started)
+
+
+def setup_tracing(dp: Dispatcher, sample_rate: float) -> None:
+    """
+    Install trace middlewares on the dispatcher.
+
+    The update middleware is moved in front of aiogram's built-in outer
+    middlewares, so the ``middleware`` phase includes FSM storage access.
+    Does nothing when ``sample_rate`` is not positive.
+
+    Args:
+        dp: Dispatcher to instrument.
+        sample_rate: Fraction of updates to trace, from ``0`` to ``1``.
+    """
+
+    if sample_rate <= 0:
+        return
+
+    outer = dp.update.outer_middleware
+    builtin = list(outer)
+    for middleware in builtin:
+        outer.unregister(middleware)
+    outer.register(TraceUpdateMiddleware(sample_rate))
+    for middleware in builtin:
+        outer.register(middleware)
+
+    dispatch = _PhaseMiddleware("dispatch")
+    handler = _PhaseMiddleware("handler", span_name="handler")
+    for name, observer in dp.observers.items():
+        if name not in {"update", "error"}:
+            observer.outer_middleware(dispatch)
+            observer.middleware(handler)
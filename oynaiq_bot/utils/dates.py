@@ -0,0 +1,200 @@
+"""
+Parsing of match dates typed by users.
+
+Understands short Russian and Kazakh expressions the create-game wizard
+suggests, for example::
+
+    сегодня, 19:00        завтра в 18:30        послезавтра 20.00
+    в субботу 17:00       пт в 19               19:00
+    ертең 18:30           сенбі күні 17:00      бүгін сағат 20
+
+Parsing is split in two steps. :func:`parse_phrase` turns the text into a
+:class:`DateSpec` (which day, what time) with a handful of precompiled
+regular expressions; it does not depend on the current time, so its
+results are memoized and the many users typing the same phrases
+("завтра в 19:00") are served from the cache. :func:`resolve` then turns
+a spec into a timezone-aware :class:`~datetime.datetime` relative to now.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+
+PHRASE_CACHE_SIZE = 4096
+
+# Relative days, by offset from today
+DAY_OFFSETS: Dict[str, int] = {
+    "сегодня": 0,
+    "завтра": 1,
+    "послезавтра": 2,
+    "бүгін": 0,
+    "ертең": 1,
+    "бүрсігүні": 2,
+    "бүрсүгүні": 2,
+}
+
+# Weekdays, Monday is 0
+WEEKDAYS: Dict[str, int] = {
+    "понедельник": 0,
+    "пн": 0,
+    "вторник": 1,
+    "вт": 1,
+    "среда": 2,
+    "среду": 2,
+    "ср": 2,
+    "четверг": 3,
+    "чт": 3,
+    "пятница": 4,
+    "пятницу": 4,
+    "пт": 4,
+    "суббота": 5,
+    "субботу": 5,
+    "сб": 5,
+    "воскресенье": 6,
+    "вс": 6,
+    "дүйсенбі": 0,
+    "сейсенбі": 1,
+    "сәрсенбі": 2,
+    "бейсенбі": 3,
+    "жұма": 4,
+    "сенбі": 5,
+    "жексенбі": 6,
+}
+
+# Short weekday names for display
+WEEKDAY_SHORT = ("пн", "вт", "ср", "чт", "пт", "сб", "вс")
+
+# Words allowed around the day and the time
+FILLER_WORDS = frozenset({"в", "во", "на", "к", "ч", "час", "часа", "часов", "күні", "сағат"})
+
+_DAY_RE = re.compile(
+    r"\b(" + "|".join(sorted({*DAY_OFFSETS, *WEEKDAYS}, key=len, reverse=True)) + r")\b"
+)
+_TIME_RE = re.compile(r"\b([01]?\d|2[0-3])[:.]([0-5]\d)\b")
+# A bare hour needs a marker: "в 19", "19 ч", "сағат 19"
+_HOUR_RE = re.compile(
+    r"(?:\b(?:в|к|сағат)\s+([01]?\d|2[0-3])\b)|(?:\b([01]?\d|2[0-3])\s*(?:ч|час|часа|часов)\b)"
+)
+_WORD_RE = re.compile(r"\w+")
+
+
+class DateSpec(NamedTuple):
+    """
+    Parsed phrase, independent of the current date.
+
+    Attributes:
+        day_offset: Days from today (``сегодня`` = 0), if given.
+        weekday: Day of the week (Monday = 0), if given.
+        hour: Hour of the start.
+        minute: Minute of the start.
+    """
+
+    day_offset: Optional[int]
+    weekday: Optional[int]
+    hour: int
+    minute: int
+
+
+@lru_cache(maxsize=PHRASE_CACHE_SIZE)
+def parse_phrase(text: str) -> Optional[DateSpec]:
+    """
+    Parse a date phrase into a :class:`DateSpec`.
+
+    The time is required, the day is optional. Any word that is neither
+    part of the day, the time nor a filler word makes the phrase invalid.
+
+    Returns:
+        ``None`` if the phrase is not understood.
+    """
+
+    rest = text.lower().replace("ё", "е")
+
+    time_match = _TIME_RE.search(rest)
+    if time_match is not None:
+        hour, minute = int(time_match.group(1)), int(time_match.group(2))
+    else:
+        time_match = _HOUR_RE.search(rest)
+        if time_match is None:
+            return None
+        hour, minute = int(time_match.group(1) or time_match.group(2)), 0
+    rest = rest[: time_match.start()] + " " + rest[time_match.end() :]
+
+    day_offset = weekday = None
+    day_match = _DAY_RE.search(rest)
+    if day_match is not None:
+        word = day_match.group(1)
+        day_offset = DAY_OFFSETS.get(word)
+        weekday = WEEKDAYS.get(word)
+        rest = rest[: day_match.start()] + " " + rest[day_match.end() :]
+
+    if any(word not in FILLER_WORDS for word in _WORD_RE.findall(rest)):
+        return None
+    return DateSpec(day_offset, weekday, hour, minute)
+
+
+def resolve(spec: DateSpec, now: datetime) -> Optional[datetime]:
+    """
+    Turn a spec into the nearest matching moment after ``now``.
+
+    A weekday means its next occurrence (today if the time is still
+    ahead); no day means today, or tomorrow if the time has passed.
+
+    Args:
+        spec: Parsed phrase.
+        now: Current time, timezone-aware; the result uses its timezone.
+
+    Returns:
+        ``None`` if an explicit day and time are already in the past.
+    """
+
+    day: date = now.date()
+    if spec.day_offset is not None:
+        day += timedelta(days=spec.day_offset)
+    elif spec.weekday is not None:
+        day += timedelta(days=(spec.weekday - day.weekday()) % 7)
+
+    moment = datetime(day.year, day.month, day.day, spec.hour, spec.minute, tzinfo=now.tzinfo)
+    if moment > now:
+        return moment
+    if spec.day_offset is not None:
+        return None
+    return moment + timedelta(days=7 if spec.weekday is not None else 1)
+
+
+def parse_datetime(text: str, now: datetime) -> Optional[datetime]:
+    """
+    Parse a phrase like ``завтра в 18:30`` relative to ``now``.
+
+    Returns:
+        Timezone-aware start time, or ``None`` if the phrase is not
+        understood or points to the past.
+    """
+
+    spec = parse_phrase(" ".join(text.split()))
+    return resolve(spec, now) if spec is not None else None
+
+
+def format_date(moment: datetime) -> str:
+    """
+    Describe the day of ``moment`` without reference to today: ``сб, 25.10``.
+    """
+
+    return f"{WEEKDAY_SHORT[moment.weekday()]}, {moment:%d.%m}"
+
+
+def format_day(moment: datetime, now: datetime) -> str:
+    """
+    Describe the day of ``moment`` the way match cards do: ``сегодня``,
+    ``завтра``, ``послезавтра`` or ``сб, 25.10``.
+    """
+
+    days = (moment.date() - now.date()).days
+    for word in ("сегодня", "завтра", "послезавтра"):
+        if DAY_OFFSETS[word] == days:
+            return word
+    return format_date(moment)
+
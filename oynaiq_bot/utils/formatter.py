@@ -7,10 +7,13 @@ for match lists and match details screens.
 
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Iterable
+from dataclasses import fields
+from operator import attrgetter
+from typing import Iterable, Mapping, Sequence
 
+from oynaiq_bot.data.announcements import REACTIONS
 from oynaiq_bot.data.matches import Match, MatchStatus
+from oynaiq_bot.data.organizers import OrganizerStats
 from oynaiq_bot.utils.navigator import SPORTS
 
 
@@ -93,9 +96,9 @@ def format_match_details(match: Match) -> str:
     """
 
     if match.time_human:
-        datetime_line = f"🕖 {match.date_human}, {match.time_human}\n"
+        datetime_line = f"🕖 {match.day_label()}, {match.time_human}\n"
     else:
-        datetime_line = f"🕖 {match.date_human}\n"
+        datetime_line = f"🕖 {match.day_label()}\n"
 
     base_header = (
         f"{sport_emoji(match.sport)} {match.title} — {match.location}\n"
@@ -118,7 +121,7 @@ def format_match_details(match: Match) -> str:
             base_header
             + f"🕑 Осталось {free} мест!\n"
             + f"👥 {match.players_current}/{match.players_total} подтверждено\n"
-            + f"🔥 Игра уже {match.date_human} в {match.time_human}\n\n"
+            + f"🔥 Игра уже {match.day_label()} в {match.time_human}\n\n"
             + meta_block
         )
 
@@ -135,11 +138,94 @@ def format_match_details(match: Match) -> str:
     return base_header + players_line + "\n" + deposit_line + meta_block
 
 
+def format_announcement(match: Match, counts: Mapping[str, int]) -> str:
+    """
+    Format a match announcement card for a group chat.
+
+    Args:
+        match: Announced match.
+        counts: Number of users per reaction code.
+
+    Returns:
+        Multi‑line message in Russian.
+    """
+
+    when = f"{match.day_label()}, {match.time_human}" if match.time_human else match.day_label()
+    free = max(match.players_total - match.players_current, 0)
+    reactions = " · ".join(
+        f"{label.split()[0]} {counts.get(code, 0)}" for code, label in REACTIONS.items()
+    )
+    return (
+        f"📣 {sport_emoji(match.sport)} {match.title} — {match.location}\n"
+        f"🕖 {when}\n"
+        f"👥 {match.players_current}/{match.players_total}, свободно: {free}\n"
+        f"💸 Депозит: {match.deposit} ₸\n\n"
+        f"Кто идёт? {reactions}"
+    )
+
+
+def format_inline_description(match: Match) -> str:
+    """
+    Format the one-line description of a match in inline query results.
+
+    Example:
+        ``сегодня 19:00 · 8/10 мест · 200 ₸``
+    """
+
+    when = f"{match.day_label()} {match.time_human}".strip()
+    deposit = f"{match.deposit} ₸" if match.deposit else "без депозита"
+    return f"{when} · {match.players_current}/{match.players_total} мест · {deposit}"
+
+
+def format_organizer_dashboard(stats: OrganizerStats, latest: Sequence[Match]) -> str:
+    """
+    Format the ``/my_games`` dashboard of an organizer.
+
+    Args:
+        stats: Running totals over all the organizer's matches.
+        latest: Most recent matches to list, newest first.
+
+    Returns:
+        Multi‑line message in Russian.
+    """
+
+    if not stats.games:
+        return (
+            "У тебя пока нет своих игр.\n"
+            "Создай первую через «⚡ Создать игру» — здесь появится статистика."
+        )
+
+    lines = [
+        "📋 Твои игры\n",
+        f"Игр: {stats.games}",
+        f"👥 Игроков: {stats.players_confirmed} из {stats.seats_total} мест "
+        f"({stats.fill_ratio:.0%})",
+        f"💸 Собрано депозитов: {stats.deposits_collected} ₸",
+    ]
+    if latest:
+        lines.append("\nПоследние игры:")
+        for match in latest:
+            when = f"{match.day_label()} {match.time_human}".strip()
+            lines.append(
+                f"{sport_emoji(match.sport)} {match.title} — {match.location}, {when}: "
+                f"{match.players_current}/{match.players_total}"
+            )
+    return "\n".join(lines)
+
+
+# Field names of Match and one getter returning all of them as a tuple,
+# computed once instead of walking the dataclass on every call
+MATCH_FIELDS = tuple(field.name for field in fields(Match))
+_match_values = attrgetter(*MATCH_FIELDS)
+
+
 def debug_match_as_dict(match: Match) -> dict:
     """
     Convert a match to a serializable dictionary.
 
     This is used only for logging / debugging and not exposed to users.
+    Unlike :func:`dataclasses.asdict` it does not deep-copy: values are
+    the match's own (all immutable).
 
     Args:
         match: Match instance.
@@ -148,7 +234,7 @@ def debug_match_as_dict(match: Match) -> dict:
         Dictionary representation of the match.
     """
 
-    return asdict(match)
+    return dict(zip(MATCH_FIELDS, _match_values(match)))
 
 
 
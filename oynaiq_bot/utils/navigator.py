@@ -2,7 +2,8 @@
 Navigation helpers and callback data definitions for OynaIQ.bot.
 
 This module centralizes all callback_data schemas and sport metadata so that
-keyboards and handlers can share the same navigation logic.
+keyboards and handlers can share the same navigation logic. The sports
+themselves come from the catalog in :mod:`oynaiq_bot.utils.sports`.
 """
 
 from __future__ import annotations
@@ -11,14 +12,20 @@ from typing import Dict, Optional
 
 from aiogram.filters.callback_data import CallbackData
 
+from oynaiq_bot.utils.sports import CATALOG
 
-# Mapping of internal sport codes to user-facing labels
-SPORTS: Dict[str, str] = {
-    "football": "⚽ Футбол",
-    "basketball": "🏀 Баскетбол",
-    "volleyball": "🏐 Волейбол",
-    "other": "🎯 Другое",
+
+# Mapping of internal sport codes to user-facing labels, in catalog order;
+# updated in place when the catalog is reloaded
+SPORTS: Dict[str, str] = CATALOG.labels
+
+# Mapping of internal city codes to user-facing labels
+CITIES: Dict[str, str] = {
+    "astana": "🏙 Астана",
+    "almaty": "🏔 Алматы",
+    "shymkent": "☀️ Шымкент",
 }
+DEFAULT_CITY = "astana"
 
 
 class SportCallback(CallbackData, prefix="sport"):
@@ -32,6 +39,17 @@ class SportCallback(CallbackData, prefix="sport"):
     sport: str
 
 
+class CityCallback(CallbackData, prefix="city"):
+    """
+    Callback data for choosing the user's city.
+
+    Attributes:
+        city: Internal code of the city (e.g. ``astana``).
+    """
+
+    city: str
+
+
 class MatchCallback(CallbackData, prefix="match"):
     """
     Callback data for selecting a specific match.
@@ -83,6 +101,19 @@ class CreateMatchCallback(CallbackData, prefix="create_match"):
     sport: str
 
 
+class ReactionCallback(CallbackData, prefix="react"):
+    """
+    Callback data for reaction buttons under group announcements.
+
+    Attributes:
+        match_id: Identifier of the announced match.
+        reaction: Reaction code (``go``, ``maybe`` or ``no``).
+    """
+
+    match_id: int
+    reaction: str
+
+
 def get_sport_label(sport: str) -> str:
     """
     Return a human‑readable label for the sport.
@@ -0,0 +1,150 @@
+"""
+Sport catalog loaded from data.
+
+The catalog is a JSON list of ``{"code": ..., "label": ...}`` entries, in
+the order the sports are offered to users; the bundled
+``oynaiq_bot/data/sports.json`` is used unless
+:attr:`~oynaiq_bot.config.Settings.sports_catalog` points elsewhere.
+
+:data:`CATALOG` keeps the code -> label mapping (the same dict object is
+exported as :data:`~oynaiq_bot.utils.navigator.SPORTS` and updated in
+place), a label -> code index for reply keyboard answers, and keyboards
+built from the catalog, cached until the next :meth:`SportCatalog.reload`.
+A reload (``/reload_sports`` admin command) validates the new file first
+and keeps the current catalog if it is broken.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from oynaiq_bot.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG = Path(__file__).resolve().parent.parent / "data" / "sports.json"
+# Callback data is limited to 64 bytes; leave room for the prefix and ids
+MAX_CODE_BYTES = 32
+
+
+def parse_catalog(raw: Any) -> List[Tuple[str, str]]:
+    """
+    Validate a decoded catalog file.
+
+    Returns:
+        ``(code, label)`` pairs in catalog order.
+
+    Raises:
+        ValueError: If the catalog is empty, an entry is malformed or a
+            code or label is repeated.
+    """
+
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("catalog must be a non-empty list")
+    entries: List[Tuple[str, str]] = []
+    codes, labels = set(), set()
+    for index, item in enumerate(raw):
+        code = item.get("code") if isinstance(item, dict) else None
+        label = item.get("label") if isinstance(item, dict) else None
+        if not isinstance(code, str) or not isinstance(label, str) or not code or not label:
+            raise ValueError(f"entry {index} needs non-empty 'code' and 'label' strings")
+        if ":" in code or len(code.encode("utf-8")) > MAX_CODE_BYTES:
+            raise ValueError(f"code {code!r} must be short and contain no ':'")
+        if code in codes or label in labels:
+            raise ValueError(f"entry {index} repeats code {code!r} or label {label!r}")
+        codes.add(code)
+        labels.add(label)
+        entries.append((code, label))
+    return entries
+
+
+class SportCatalog:
+    """
+    Sports offered by the bot, with derived indexes and keyboards.
+
+    Args:
+        path: Catalog file.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CATALOG) -> None:
+        self.path = path
+        self.labels: Dict[str, str] = {}
+        self.version = 0
+        self._codes: Dict[str, str] = {}
+        self._keyboards: Dict[str, Any] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self.reload()
+
+    def reload(self, path: Optional[Path] = None) -> int:
+        """
+        Load the catalog file again and drop everything built from the
+        previous version.
+
+        Args:
+            path: New catalog file; the current one by default.
+
+        Returns:
+            Number of sports in the catalog.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If it is not a valid catalog; the current catalog
+                is kept then.
+        """
+
+        path = path or self.path
+        entries = parse_catalog(json.loads(path.read_text(encoding="utf-8")))
+
+        self.path = path
+        # In place, so modules holding SPORTS see the new catalog
+        self.labels.clear()
+        self.labels.update(entries)
+        self._codes = {label: code for code, label in entries}
+        self._keyboards = {}
+        self.version += 1
+        for listener in self._listeners:
+            listener()
+        logger.info("Loaded %d sports from %s (version %d)", len(entries), path, self.version)
+        return len(entries)
+
+    def code_for_label(self, label: str) -> Optional[str]:
+        """
+        Return the code of the sport whose label is exactly ``label``.
+        """
+
+        return self._codes.get(label)
+
+    def keyboard(self, name: str, build: Callable[[Dict[str, str]], Any]) -> Any:
+        """
+        Return the keyboard ``name``, building it from the catalog with
+        ``build(labels)`` on first use after a reload.
+        """
+
+        keyboard = self._keyboards.get(name)
+        if keyboard is None:
+            keyboard = self._keyboards[name] = build(self.labels)
+        return keyboard
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Call ``listener()`` after every reload, for caches holding labels.
+        """
+
+        self._listeners.append(listener)
+
+
+# Process-wide sport catalog
+CATALOG = SportCatalog()
+
+
+def setup_sports(settings: Settings) -> None:
+    """
+    Load :data:`CATALOG` from :attr:`Settings.sports_catalog`, if set.
+    """
+
+    if settings.sports_catalog:
+        CATALOG.reload(Path(settings.sports_catalog))
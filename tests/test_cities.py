@@ -0,0 +1,123 @@
+"""
+City partitions and city choices (:mod:`oynaiq_bot.data.cities`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+from oynaiq_bot.data import cities
+from oynaiq_bot.data.cities import CityPartition, MatchPartitions, UserCities
+from oynaiq_bot.data.matches import MOCK_MATCHES, Match, MatchChange
+from oynaiq_bot.data.recommendations import UserProfiles
+from oynaiq_bot.runtime.metrics import MetricsRegistry
+from oynaiq_bot.utils.navigator import DEFAULT_CITY
+
+
+FOOTBALL, _, BASKETBALL, _ = MOCK_MATCHES[:4]
+STORED: Dict[str, List[Match]] = {
+    "almaty": [
+        replace(FOOTBALL, id=900_001, city="almaty"),
+        replace(BASKETBALL, id=900_002, city="almaty"),
+    ],
+    "shymkent": [replace(FOOTBALL, id=900_003, city="shymkent")],
+}
+# Unbooked match of a weekly series in Almaty
+UNBOOKED = replace(FOOTBALL, id=900_004, city="almaty", location="Almaty Arena")
+
+
+@pytest.fixture
+def loaded() -> List[str]:
+    return []
+
+
+@pytest.fixture
+def partitions(loaded: List[str]) -> MatchPartitions:
+    def loader(city: str) -> List[Match]:
+        loaded.append(city)
+        return [replace(match) for match in STORED.get(city, [])]
+
+    return MatchPartitions(loader, idle_timeout=60.0, registry=MetricsRegistry())
+
+
+@pytest.fixture
+def with_sources(monkeypatch: pytest.MonkeyPatch) -> None:
+    def get_source_matches(sport: str, city: str) -> Tuple[Match, ...]:
+        return (UNBOOKED,) if (sport, city) == (UNBOOKED.sport, UNBOOKED.city) else ()
+
+    monkeypatch.setattr(cities, "get_source_matches", get_source_matches)
+
+
+def test_partition_is_loaded_once_and_only_for_its_city(
+    partitions: MatchPartitions, loaded: List[str]
+) -> None:
+    almaty = partitions.partition("almaty")
+
+    assert partitions.partition("almaty") is almaty
+    assert loaded == ["almaty"]
+    assert [match.id for match in almaty.matches_by_sport("football")] == [900_001]
+    assert "shymkent" not in partitions
+
+
+def test_idle_partition_is_evicted_and_reloaded(
+    partitions: MatchPartitions, loaded: List[str]
+) -> None:
+    partitions.partition("almaty")
+    assert partitions.evict_idle() == []
+
+    partitions.idle_timeout = 0.0
+    assert partitions.evict_idle() == ["almaty"]
+    assert "almaty" not in partitions
+
+    partitions.partition("almaty")
+    assert loaded == ["almaty", "almaty"]
+
+
+def test_changes_reach_only_loaded_partitions(
+    partitions: MatchPartitions, loaded: List[str]
+) -> None:
+    almaty = partitions.partition("almaty")
+    booked = replace(STORED["almaty"][0], players_current=9)
+
+    partitions.on_change(booked, MatchChange.SEAT_TAKEN)
+    partitions.on_change(STORED["shymkent"][0], MatchChange.SEAT_TAKEN)
+
+    assert almaty.matches_by_sport("football")[0].players_current == 9
+    assert loaded == ["almaty"]
+
+
+@pytest.mark.usefixtures("with_sources")
+def test_unbooked_matches_are_listed_found_and_recommended() -> None:
+    partition = CityPartition("almaty", STORED["almaty"], UserProfiles())
+
+    assert [match.id for match in partition.matches_by_sport("football")] == [900_001, 900_004]
+    assert partition.find("футбол") == (900_001, 900_004)
+    assert partition.find("almaty arena") == (900_004,)
+    assert {match.id for match in partition.recommend(None, "football", 5)} == {
+        900_001,
+        900_004,
+    }
+    assert partition.recommend(None, "basketball", 5) == [STORED["almaty"][1]]
+
+
+def test_city_choices_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "cities.jsonl"
+    choices = UserCities()
+    choices.open(path)
+
+    assert choices.get(1) == DEFAULT_CITY and choices.get(None) == DEFAULT_CITY
+    choices.set(1, "almaty")
+    choices.set(1, "shymkent")
+    with pytest.raises(ValueError):
+        choices.set(2, "paris")
+    asyncio.run(choices.close(1.0))
+
+    restored = UserCities()
+    restored.open(path)
+    assert restored.get(1) == "shymkent"
+    assert restored.get(2) == DEFAULT_CITY
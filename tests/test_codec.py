@@ -0,0 +1,66 @@
+"""
+Binary and JSON encodings of matches (:mod:`oynaiq_bot.data.codec`).
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from oynaiq_bot.data.codec import MATCH_CODEC
+from oynaiq_bot.data.matches import MOCK_MATCHES
+
+
+STARTS_AT = [
+    None,
+    datetime(2026, 10, 24, 19, 30),
+    datetime(2026, 10, 24, 19, 30, 15, 250, tzinfo=timezone(timedelta(hours=5))),
+    datetime(2026, 10, 24, 19, 30, tzinfo=ZoneInfo("Asia/Almaty")),
+]
+
+
+@pytest.mark.parametrize("starts_at", STARTS_AT)
+def test_binary_round_trip(starts_at: Optional[datetime]) -> None:
+    match = replace(MOCK_MATCHES[0], title="Футбол 5×5 🏟", starts_at=starts_at)
+
+    decoded, end = MATCH_CODEC.decode(MATCH_CODEC.encode(match))
+
+    assert decoded == match
+    assert end == len(MATCH_CODEC.encode(match))
+    if starts_at is not None:
+        assert decoded.starts_at.utcoffset() == starts_at.utcoffset()
+
+
+@pytest.mark.parametrize("starts_at", STARTS_AT)
+def test_json_round_trip(starts_at: Optional[datetime]) -> None:
+    match = replace(MOCK_MATCHES[0], starts_at=starts_at)
+
+    decoded = MATCH_CODEC.loads(MATCH_CODEC.dumps(match))
+
+    assert decoded == match
+    if starts_at is not None:
+        assert decoded.starts_at.utcoffset() == starts_at.utcoffset()
+
+
+def test_concatenated_records_decode_in_order() -> None:
+    out = bytearray()
+    for match in MOCK_MATCHES:
+        MATCH_CODEC.encode_into(out, match)
+
+    assert list(MATCH_CODEC.iter_decode(out)) == list(MOCK_MATCHES)
+
+
+def test_foreign_and_truncated_records_are_rejected() -> None:
+    record = MATCH_CODEC.encode(MOCK_MATCHES[0])
+    foreign = bytearray(record)
+    struct.pack_into("<I", foreign, 4, MATCH_CODEC.schema_id ^ 1)
+
+    with pytest.raises(ValueError, match="schema"):
+        MATCH_CODEC.decode(foreign)
+    with pytest.raises(ValueError, match="truncated"):
+        MATCH_CODEC.decode(record[:-1])
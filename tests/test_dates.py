@@ -0,0 +1,92 @@
+"""
+Parsing and display of match dates (:mod:`oynaiq_bot.utils.dates`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from oynaiq_bot.data.matches import MOCK_MATCHES
+from oynaiq_bot.utils.dates import (
+    DateSpec,
+    format_day,
+    parse_datetime,
+    parse_phrase,
+)
+
+
+ALMATY = ZoneInfo("Asia/Almaty")
+# A Wednesday evening
+NOW = datetime(2026, 10, 21, 20, 0, tzinfo=ALMATY)
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, day, hour, minute, tzinfo=ALMATY)
+
+
+@pytest.mark.parametrize(
+    ("text", "spec"),
+    [
+        ("завтра в 18:30", DateSpec(1, None, 18, 30)),
+        ("Послезавтра 20.00", DateSpec(2, None, 20, 0)),
+        ("в субботу 17:00", DateSpec(None, 5, 17, 0)),
+        ("пт в 19", DateSpec(None, 4, 19, 0)),
+        ("19 часов", DateSpec(None, None, 19, 0)),
+        ("бүгін сағат 20", DateSpec(0, None, 20, 0)),
+        ("сенбі күні 17:00", DateSpec(None, 5, 17, 0)),
+        ("завтра", None),
+        ("завтра 25:00", None),
+        ("завтра вечером в 19", None),
+    ],
+)
+def test_parse_phrase(text: str, spec: Optional[DateSpec]) -> None:
+    assert parse_phrase(text) == spec
+
+
+@pytest.mark.parametrize(
+    ("text", "moment"),
+    [
+        ("сегодня 21:15", at(21, 21, 15)),
+        ("сегодня 19:00", None),
+        ("  завтра   в 18:30 ", at(22, 18, 30)),
+        ("21:00", at(21, 21)),
+        ("19:00", at(22, 19)),
+        ("в субботу 17:00", at(24, 17)),
+        ("ср 21:00", at(21, 21)),
+        ("ср 19:00", at(28, 19)),
+        ("когда-нибудь", None),
+    ],
+)
+def test_parse_datetime(text: str, moment: Optional[datetime]) -> None:
+    assert parse_datetime(text, NOW) == moment
+
+
+def test_parsed_time_keeps_the_zone_of_now() -> None:
+    moment = parse_datetime("завтра 18:30", NOW)
+
+    assert moment is not None and moment.tzinfo is ALMATY
+
+
+@pytest.mark.parametrize(
+    ("moment", "label"),
+    [
+        (at(21, 23), "сегодня"),
+        (at(22, 7), "завтра"),
+        (at(23, 7), "послезавтра"),
+        (at(24, 17), "сб, 24.10"),
+    ],
+)
+def test_format_day(moment: datetime, label: str) -> None:
+    assert format_day(moment, NOW) == label
+
+
+def test_day_label_falls_back_to_the_typed_date() -> None:
+    match = replace(MOCK_MATCHES[0], date_human="в субботу", starts_at=None)
+
+    assert match.day_label(NOW) == "в субботу"
+    assert replace(match, starts_at=at(22, 19)).day_label(NOW) == "завтра"
@@ -0,0 +1,118 @@
+"""
+Idempotent actions and their persistent fallback (:mod:`oynaiq_bot.data.idempotency`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from oynaiq_bot.data.idempotency import IdempotencyCache, idempotency_key
+from oynaiq_bot.runtime.metrics import MetricsRegistry
+
+
+def counting(calls: List[str], result: str) -> Callable[[], str]:
+    def action() -> str:
+        calls.append(result)
+        return result
+
+    return action
+
+
+def test_once_runs_the_action_once() -> None:
+    cache = IdempotencyCache(registry=MetricsRegistry())
+    key = idempotency_key(1, 2, "confirm")
+    calls: List[str] = []
+
+    async def main() -> None:
+        assert await cache.once(key, counting(calls, "ok")) == ("ok", True)
+        assert await cache.once(key, counting(calls, "again")) == ("ok", False)
+
+    asyncio.run(main())
+    assert calls == ["ok"]
+
+
+def test_concurrent_calls_share_the_first_result() -> None:
+    cache = IdempotencyCache(registry=MetricsRegistry())
+    calls: List[str] = []
+
+    async def main() -> List[Tuple[str, bool]]:
+        key = idempotency_key(1, 2, "pay")
+        return await asyncio.gather(*(cache.once(key, counting(calls, "ok")) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls == ["ok"]
+    assert sorted(fresh for _, fresh in results) == [False] * 4 + [True]
+
+
+def test_forget_lets_the_action_run_again() -> None:
+    cache = IdempotencyCache(registry=MetricsRegistry())
+    key = idempotency_key(1, 2, "confirm")
+    calls: List[str] = []
+
+    async def main() -> None:
+        await cache.once(key, counting(calls, "first"))
+        cache.forget(key)
+        assert await cache.once(key, counting(calls, "second")) == ("second", True)
+
+    asyncio.run(main())
+    assert calls == ["first", "second"]
+
+
+def test_expired_result_runs_the_action_again() -> None:
+    cache = IdempotencyCache(ttl=-1.0, registry=MetricsRegistry())
+    key = idempotency_key(1, 2, "confirm")
+    calls: List[str] = []
+
+    async def main() -> None:
+        await cache.once(key, counting(calls, "first"))
+        await cache.once(key, counting(calls, "second"))
+
+    asyncio.run(main())
+    assert calls == ["first", "second"]
+
+
+def test_only_durable_results_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "idempotency.sqlite3"
+    pay = idempotency_key(1, 2, "pay")
+    confirm = idempotency_key(1, 2, "confirm")
+    calls: List[str] = []
+
+    async def run(durable_result: str, result: str) -> List[Tuple[str, bool]]:
+        cache = IdempotencyCache(registry=MetricsRegistry())
+        cache.open(path)
+        try:
+            return [
+                await cache.once(pay, counting(calls, durable_result), durable=True),
+                await cache.once(confirm, counting(calls, result)),
+            ]
+        finally:
+            await cache.close(1.0)
+
+    asyncio.run(run("queued", "booked"))
+    after_restart = asyncio.run(run("queued again", "booked again"))
+
+    assert after_restart == [("queued", False), ("booked again", True)]
+    assert calls == ["queued", "booked", "booked again"]
+
+
+def test_forget_removes_the_persisted_result(tmp_path: Path) -> None:
+    path = tmp_path / "idempotency.sqlite3"
+    key = idempotency_key(1, 2, "pay")
+    calls: List[str] = []
+
+    async def run(result: str, forget: bool) -> None:
+        cache = IdempotencyCache(registry=MetricsRegistry())
+        cache.open(path)
+        try:
+            await cache.once(key, counting(calls, result), durable=True)
+            if forget:
+                cache.forget(key)
+        finally:
+            await cache.close(1.0)
+
+    asyncio.run(run("failed", forget=True))
+    asyncio.run(run("retried", forget=False))
+
+    assert calls == ["failed", "retried"]
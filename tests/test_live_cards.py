@@ -0,0 +1,106 @@
+"""
+Live match cards and coalesced edits (:mod:`oynaiq_bot.data.live_cards`,
+:mod:`oynaiq_bot.runtime.edits`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Optional, Tuple
+
+from oynaiq_bot.data.live_cards import LiveCards
+from oynaiq_bot.data.matches import MOCK_MATCHES, MatchChange
+from oynaiq_bot.runtime.edits import DebouncedEditor, Render
+from oynaiq_bot.runtime.metrics import MetricsRegistry
+
+
+MATCH = MOCK_MATCHES[0]
+
+
+class _Bot:
+    def __init__(self) -> None:
+        self.edits: List[Tuple[int, int, str]] = []
+
+    async def edit_message_text(
+        self, text: str, chat_id: int, message_id: int, **kwargs: Any
+    ) -> None:
+        self.edits.append((chat_id, message_id, text))
+
+
+class _Editor:
+    def __init__(self) -> None:
+        self.scheduled: List[Tuple[int, int, Render]] = []
+
+    def schedule(self, bot: Any, chat_id: int, message_id: int, render: Render) -> None:
+        self.scheduled.append((chat_id, message_id, render))
+
+
+def text(value: str) -> Render:
+    def render() -> Optional[Tuple[str, None]]:
+        return value, None
+
+    return render
+
+
+def test_edits_within_the_interval_are_coalesced() -> None:
+    editor = DebouncedEditor(interval=0.05, rate=0, registry=MetricsRegistry())
+    bot = _Bot()
+
+    async def main() -> None:
+        for value in ("1", "2", "3"):
+            editor.schedule(bot, 10, 1, text(value))
+        editor.schedule(bot, 10, 2, text("other"))
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert sorted(bot.edits) == [(10, 1, "3"), (10, 2, "other")]
+
+
+def test_rate_limit_postpones_edits_until_flush() -> None:
+    editor = DebouncedEditor(interval=0.01, rate=1, registry=MetricsRegistry())
+    bot = _Bot()
+
+    async def main() -> int:
+        for message_id in range(3):
+            editor.schedule(bot, 10, message_id, text("card"))
+        await asyncio.sleep(0.1)
+        assert len(bot.edits) == 1
+        return await editor.flush(1.0)
+
+    assert asyncio.run(main()) == 0
+    assert sorted(message_id for _, message_id, _ in bot.edits) == [0, 1, 2]
+
+
+def test_seat_changes_refresh_every_card_of_the_match() -> None:
+    editor = _Editor()
+    cards = LiveCards(editor)  # type: ignore[arg-type]
+    cards.show(_Bot(), 10, 1, MATCH.id)
+    cards.show(_Bot(), 20, 5, MATCH.id)
+    cards.show(_Bot(), 30, 7, MOCK_MATCHES[2].id)
+
+    cards.on_change(MATCH, MatchChange.DEPOSIT_PAID)
+    assert editor.scheduled == []
+    cards.on_change(MATCH, MatchChange.SEAT_TAKEN)
+
+    assert sorted(key[:2] for key in editor.scheduled) == [(10, 1), (20, 5)]
+    rendered = editor.scheduled[0][2]()
+    assert rendered is not None and MATCH.title in rendered[0]
+
+
+def test_card_stops_refreshing_once_replaced_evicted_or_stale() -> None:
+    editor = _Editor()
+    cards = LiveCards(editor, max_cards=3)  # type: ignore[arg-type]
+    cards.show(_Bot(), 10, 1, MATCH.id)
+    cards.show(_Bot(), 10, 1, MOCK_MATCHES[2].id)
+    cards.show(_Bot(), 20, 1, MATCH.id)
+    cards.show(_Bot(), 30, 1, MATCH.id)
+    cards.show(_Bot(), 40, 1, MATCH.id)
+
+    cards.on_change(MATCH, MatchChange.SEAT_RELEASED)
+    assert len(cards) == 3
+    assert sorted(key[:2] for key in editor.scheduled) == [(20, 1), (30, 1), (40, 1)]
+
+    cards.ttl = -1.0
+    cards.on_change(MATCH, MatchChange.SEAT_RELEASED)
+    assert len(cards) == 0
+    assert len(editor.scheduled) == 3
@@ -0,0 +1,139 @@
+"""
+Top-k match recommendations (:mod:`oynaiq_bot.data.recommendations`).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import replace
+from typing import List, Optional
+
+import pytest
+
+from oynaiq_bot.data.matches import MOCK_MATCHES, Match, MatchChange
+from oynaiq_bot.data.recommendations import (
+    DEPOSIT_SCALE,
+    HISTORY_CAP,
+    PREF_DEPOSIT,
+    PREF_LEVEL,
+    W_DEPOSIT,
+    W_HISTORY,
+    W_LEVEL,
+    Recommender,
+    UserProfiles,
+    parse_level,
+    start_hours,
+    static_score,
+)
+
+
+LEVELS = ("новички", "любители", "новички/любители", "продвинутые", "профи")
+DAYS = ("сегодня", "завтра", "послезавтра", "в субботу")
+VENUES = ("Arena", "City Arena", "Центральный Спортзал", "Стадион")
+
+
+def random_matches(count: int, seed: int, first_id: int = 1) -> List[Match]:
+    rng = random.Random(seed)
+    matches = []
+    for match_id in range(first_id, first_id + count):
+        total = rng.choice((6, 10, 12))
+        matches.append(
+            replace(
+                MOCK_MATCHES[0],
+                id=match_id,
+                players_total=total,
+                players_current=rng.randint(0, total),
+                level=rng.choice(LEVELS),
+                deposit=rng.choice((0, 150, 200, 1000)),
+                location=rng.choice(VENUES),
+                date_human=rng.choice(DAYS),
+                time_human=rng.choice(("18:00", "19:30", "21:00")),
+            )
+        )
+    return matches
+
+
+def ranked(profiles: UserProfiles, user_id: Optional[int], matches: List[Match]) -> List[Match]:
+    """
+    Rank by scoring every match and sorting, the way ``top`` must agree with.
+    """
+
+    prefs = profiles.prefs(user_id)
+    history = profiles.history(user_id)
+
+    def score(match: Match) -> float:
+        free = max(match.players_total - match.players_current, 0)
+        value = static_score(free, start_hours(match))
+        value -= W_LEVEL * abs(parse_level(match.level) - prefs[PREF_LEVEL])
+        if match.deposit > prefs[PREF_DEPOSIT]:
+            value -= W_DEPOSIT / DEPOSIT_SCALE * (match.deposit - prefs[PREF_DEPOSIT])
+        if history:
+            venue = profiles.venue_id(match.location)
+            value += W_HISTORY / HISTORY_CAP * min(history.get(venue, 0), HISTORY_CAP)
+        return value
+
+    return sorted(matches, key=score, reverse=True)
+
+
+@pytest.fixture
+def profiles() -> UserProfiles:
+    profiles = UserProfiles()
+    for match in random_matches(5, seed=1):
+        profiles.record_confirmation(7, match)
+    return profiles
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 100])
+def test_top_agrees_with_a_full_sort(profiles: UserProfiles, k: int) -> None:
+    indexed = random_matches(60, seed=2)
+    extra = random_matches(20, seed=3, first_id=1000)
+    recommender = Recommender(indexed, profiles=profiles)
+
+    assert recommender.top(7, "football", k, extra) == ranked(profiles, 7, indexed + extra)[:k]
+
+
+def test_full_matches_come_after_bookable_ones() -> None:
+    free = replace(MOCK_MATCHES[0], id=1, players_current=0, date_human="в субботу")
+    full = replace(free, id=2, players_current=free.players_total, date_human="сегодня")
+    recommender = Recommender([full, free])
+
+    assert recommender.top(None, "football", 2) == [free, full]
+
+
+def test_seat_changes_update_the_ranking() -> None:
+    first, second = (
+        replace(MOCK_MATCHES[0], id=match_id, players_current=0, players_total=10)
+        for match_id in (1, 2)
+    )
+    recommender = Recommender([first, second])
+    assert recommender.top(None, "football", 1) == [first]
+
+    taken = replace(first, players_current=10)
+    recommender.on_change(taken, MatchChange.SEAT_TAKEN)
+
+    assert recommender.top(None, "football", 2) == [second, taken]
+
+
+def test_hours_are_recomputed_every_hour(monkeypatch: pytest.MonkeyPatch) -> None:
+    soon = replace(MOCK_MATCHES[0], id=1, players_current=0, date_human="сегодня")
+    later = replace(soon, id=2, date_human="послезавтра")
+    recommender = Recommender([soon, later])
+    assert recommender.top(None, "football", 2) == [soon, later]
+
+    # Swap the days; the order follows only once the hours are recomputed
+    monkeypatch.setattr(
+        "oynaiq_bot.data.recommendations.DAYS_AHEAD", {"сегодня": 2, "послезавтра": 0}
+    )
+    assert recommender.top(None, "football", 2) == [soon, later]
+
+    hour_later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: hour_later)
+    assert recommender.top(None, "football", 2) == [later, soon]
+
+
+def test_nothing_to_rank() -> None:
+    recommender = Recommender(MOCK_MATCHES[:1])
+
+    assert recommender.top(None, "tennis", 5) == []
+    assert recommender.top(None, "football", 0) == []
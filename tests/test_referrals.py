@@ -0,0 +1,64 @@
+"""
+Referral counting and the leaderboard (:mod:`oynaiq_bot.data.referrals`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from oynaiq_bot.data.referrals import Leaderboard, ReferralStore
+
+
+def test_leaderboard_orders_by_count_and_keeps_ties_in_order() -> None:
+    board = Leaderboard(size=3)
+    board.update("a", 1)
+    board.update("b", 1)
+    board.update("c", 2)
+    board.update("b", 3)
+
+    assert board.top() == [("b", 3), ("c", 2), ("a", 1)]
+    assert board.top(2) == [("b", 3), ("c", 2)]
+
+
+def test_leaderboard_replaces_the_last_entry_only_when_beaten() -> None:
+    board = Leaderboard(size=2)
+    board.update("a", 2)
+    board.update("b", 2)
+    board.update("c", 2)
+    assert board.top() == [("a", 2), ("b", 2)]
+
+    board.update("c", 5)
+    assert board.top() == [("c", 5), ("a", 2)]
+
+
+def test_only_the_first_referral_of_a_user_counts() -> None:
+    store = ReferralStore()
+
+    assert store.add(1, "@Alice")
+    assert not store.add(1, "bob")
+    assert not store.add(2, "carol", own_keys=("Carol", "2"))
+    assert store.add(3, "alice")
+
+    assert store.count("ALICE") == 2
+    assert store.count("bob") == 0
+    assert store.top() == [("alice", 2)]
+
+
+def test_referrals_survive_a_restart(tmp_path: Path) -> None:
+    path = tmp_path / "referrals.jsonl"
+
+    async def invite() -> None:
+        store = ReferralStore()
+        store.open(path)
+        for user_id in range(1, 4):
+            store.add(user_id, "alice")
+        store.add(4, "bob")
+        await store.close(1.0)
+
+    asyncio.run(invite())
+    store = ReferralStore()
+    store.open(path)
+
+    assert store.top() == [("alice", 3), ("bob", 1)]
+    assert not store.add(2, "bob")
@@ -0,0 +1,130 @@
+"""
+Weekly match series and their occurrences (:mod:`oynaiq_bot.data.series`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+from typing import List
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from oynaiq_bot.data.matches import (
+    MOCK_MATCHES,
+    MatchChange,
+    get_match_by_id,
+    get_source_matches,
+    take_seat,
+)
+from oynaiq_bot.data.series import (
+    MAX_OCCURRENCES,
+    OCCURRENCE_BASE,
+    SERIES,
+    MatchSeries,
+    SeriesStore,
+    is_occurrence_id,
+)
+
+
+ALMATY = ZoneInfo("Asia/Almaty")
+TEMPLATE = replace(MOCK_MATCHES[3], id=0, city="shymkent", players_current=0)
+
+
+@pytest.fixture
+def store() -> SeriesStore:
+    return SeriesStore("Asia/Almaty")
+
+
+def weekly(store: SeriesStore, weeks_ago: int = 2) -> MatchSeries:
+    first_day = store.today() - timedelta(weeks=weeks_ago)
+    return store.add(TEMPLATE, datetime.combine(first_day, time(19, 0, tzinfo=ALMATY)))
+
+
+def test_occurrence_ids_encode_series_and_week(store: SeriesStore) -> None:
+    weekly(store)
+    series = weekly(store)
+    match_id = series.occurrence_id(3)
+
+    assert is_occurrence_id(match_id) and not is_occurrence_id(TEMPLATE.id)
+    assert match_id == OCCURRENCE_BASE + 2 * MAX_OCCURRENCES + 3
+    assert store.find(match_id) == (series, 3)
+    assert store.find(series.occurrence_id(3) + MAX_OCCURRENCES) is None
+    assert store.find(MOCK_MATCHES[0].id) is None
+
+
+def test_occurrences_keep_the_local_start_time() -> None:
+    berlin = ZoneInfo("Europe/Berlin")
+    series = MatchSeries(1, TEMPLATE, datetime(2026, 3, 22, 19, 0, tzinfo=berlin))
+
+    match = series.occurrence(1)
+
+    assert match.starts_at == datetime(2026, 3, 29, 19, 0, tzinfo=berlin)
+    assert match.starts_at.utcoffset() == timedelta(hours=2)
+    assert (match.date_human, match.time_human) == ("вс, 29.03", "19:00")
+
+
+def test_upcoming_lists_the_games_of_the_week(store: SeriesStore) -> None:
+    series = weekly(store)
+    version = store.version(TEMPLATE.sport)
+
+    (match,) = store.upcoming(TEMPLATE.sport)
+
+    assert match.id == series.occurrence_id(2)
+    assert match.starts_at.date() == store.today()
+    assert store.upcoming(TEMPLATE.sport, "shymkent") == (match,)
+    assert store.upcoming(TEMPLATE.sport, "almaty") == ()
+    assert store.upcoming(TEMPLATE.sport) is store.upcoming(TEMPLATE.sport)
+    assert store.version(TEMPLATE.sport) == version
+
+
+def test_skipped_game_is_neither_listed_nor_found(store: SeriesStore) -> None:
+    series = weekly(store)
+    match_id = series.occurrence_id(2)
+    version = store.version(TEMPLATE.sport)
+    assert store.get(match_id) is store.get(match_id)
+
+    assert store.skip(match_id)
+
+    assert store.upcoming(TEMPLATE.sport) == ()
+    assert store.get(match_id) is None
+    assert store.version(TEMPLATE.sport) != version
+    assert not store.skip(match_id)
+    assert not store.skip(series.occurrence_id(MAX_OCCURRENCES))
+
+
+def test_booked_game_is_stored_and_no_longer_generated(store: SeriesStore) -> None:
+    series = weekly(store)
+    match = store.get(series.occurrence_id(2))
+    assert match is not None
+
+    store.on_change(match, MatchChange.CREATED)
+
+    assert store.is_booked(match.id)
+    assert store.get(match.id) is None
+    assert store.upcoming(TEMPLATE.sport) == ()
+    assert not store.skip(match.id)
+
+
+def test_first_booking_stores_the_occurrence() -> None:
+    def listed_ids() -> List[int]:
+        return [match.id for match in get_source_matches(TEMPLATE.sport, "shymkent")]
+
+    series = weekly(SERIES)
+    match_id = series.occurrence_id(2)
+    match = get_match_by_id(match_id)
+    assert match is not None
+    assert match_id in listed_ids()
+
+    assert take_seat(match, 1)
+
+    assert get_match_by_id(match_id) is match
+    assert match.players_current == 1
+    assert SERIES.is_booked(match_id)
+    assert match_id not in listed_ids()
+
+
+def test_naive_first_start_is_rejected(store: SeriesStore) -> None:
+    with pytest.raises(ValueError):
+        store.add(TEMPLATE, datetime(2026, 10, 24, 19, 0))
@@ -0,0 +1,67 @@
+"""
+Copy-on-write views of matches (:class:`oynaiq_bot.data.matches.SportSnapshots`).
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+
+from oynaiq_bot.data.matches import MOCK_MATCHES, MatchChange, SportSnapshots
+
+
+FOOTBALL, FOOTBALL_2, BASKETBALL, _ = MOCK_MATCHES[:4]
+
+
+def test_views_hold_copies_per_sport_in_storage_order() -> None:
+    snapshots = SportSnapshots([FOOTBALL, BASKETBALL, FOOTBALL_2])
+
+    view = snapshots.view("football")
+
+    assert [match.id for match in view] == [FOOTBALL.id, FOOTBALL_2.id]
+    assert view[0] == FOOTBALL and view[0] is not FOOTBALL
+    assert snapshots.view("tennis") == ()
+    assert len(snapshots) == 3
+
+
+def test_published_change_leaves_older_views_intact() -> None:
+    snapshots = SportSnapshots([FOOTBALL, FOOTBALL_2])
+    before = snapshots.view("football")
+    version = snapshots.version("football")
+
+    copy = snapshots.publish(replace(FOOTBALL_2, players_current=9), MatchChange.SEAT_TAKEN)
+
+    after = snapshots.view("football")
+    assert copy is not None and after[1] is copy
+    assert after[0] is before[0]
+    assert before[1].players_current == FOOTBALL_2.players_current
+    assert after[1].players_current == 9
+    assert snapshots.version("football") == version + 1
+
+
+def test_changes_that_do_not_alter_a_view_are_ignored() -> None:
+    snapshots = SportSnapshots([FOOTBALL])
+    version = snapshots.version("football")
+
+    assert snapshots.publish(FOOTBALL, MatchChange.DEPOSIT_PAID) is None
+    assert snapshots.publish(BASKETBALL, MatchChange.SEAT_TAKEN) is None
+    assert snapshots.version("football") == version
+    assert snapshots.version("basketball") == 0
+
+
+def test_concurrent_writers_lose_no_change() -> None:
+    snapshots = SportSnapshots()
+    matches = [replace(FOOTBALL, id=match_id) for match_id in range(400)]
+
+    def create(part: int) -> None:
+        for match in matches[part::4]:
+            snapshots.publish(match, MatchChange.CREATED)
+
+    threads = [threading.Thread(target=create, args=(part,)) for part in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(match.id for match in snapshots.view("football")) == list(range(400))
+    assert snapshots.version("football") == 400
@@ -0,0 +1,81 @@
+"""
+The sport catalog (:mod:`oynaiq_bot.utils.sports`).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from oynaiq_bot.utils.sports import DEFAULT_CATALOG, SportCatalog, parse_catalog
+
+
+def write_catalog(path: Path, entries: Any) -> Path:
+    path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        [],
+        {"code": "football", "label": "⚽ Футбол"},
+        [{"code": "football"}],
+        [{"code": "foot:ball", "label": "⚽ Футбол"}],
+        [{"code": "x" * 33, "label": "⚽ Футбол"}],
+        [{"code": "football", "label": "⚽"}, {"code": "football", "label": "🏟"}],
+        [{"code": "football", "label": "⚽"}, {"code": "soccer", "label": "⚽"}],
+    ],
+)
+def test_invalid_catalog_is_rejected(raw: Any) -> None:
+    with pytest.raises(ValueError):
+        parse_catalog(raw)
+
+
+def test_bundled_catalog_is_valid() -> None:
+    catalog = SportCatalog()
+
+    assert catalog.path == DEFAULT_CATALOG
+    assert catalog.labels
+    for code, label in catalog.labels.items():
+        assert catalog.code_for_label(label) == code
+
+
+def test_reload_replaces_labels_in_place_and_drops_keyboards(tmp_path: Path) -> None:
+    catalog = SportCatalog()
+    labels = catalog.labels
+    reloads: List[int] = []
+    catalog.add_reload_listener(lambda: reloads.append(catalog.version))
+    built: List[Dict[str, str]] = []
+
+    def build(labels: Dict[str, str]) -> str:
+        built.append(dict(labels))
+        return f"keyboard {len(built)}"
+
+    assert catalog.keyboard("sports", build) == catalog.keyboard("sports", build) == "keyboard 1"
+
+    path = write_catalog(tmp_path / "sports.json", [{"code": "padel", "label": "🎾 Падел"}])
+    assert catalog.reload(path) == 1
+
+    assert labels is catalog.labels and labels == {"padel": "🎾 Падел"}
+    assert catalog.code_for_label("🎾 Падел") == "padel"
+    assert catalog.keyboard("sports", build) == "keyboard 2"
+    assert built[-1] == {"padel": "🎾 Падел"}
+    assert reloads == [catalog.version]
+
+
+def test_broken_reload_keeps_the_current_catalog(tmp_path: Path) -> None:
+    catalog = SportCatalog()
+    labels, version = dict(catalog.labels), catalog.version
+
+    with pytest.raises(ValueError):
+        catalog.reload(write_catalog(tmp_path / "sports.json", [{"code": "padel"}]))
+    with pytest.raises(OSError):
+        catalog.reload(tmp_path / "missing.json")
+
+    assert catalog.labels == labels
+    assert catalog.version == version
+    assert catalog.path == DEFAULT_CATALOG
@@ -0,0 +1,35 @@
+"""
+Startup regression checks (:mod:`oynaiq_bot.runtime.startup`).
+"""
+
+from __future__ import annotations
+
+import os
+
+from oynaiq_bot.runtime.startup import profile_startup
+
+
+# Importing the bot and building the dispatcher, on top of importing
+# aiogram in the same interpreter (which alone takes most of a second or
+# more and varies with the machine); override on slow CI machines
+STARTUP_MARGIN_MS = float(os.getenv("STARTUP_MARGIN_MS", "500"))
+
+# Needed only when their setting is enabled, none of which is by default
+LAZY_MODULES = (
+    "oynaiq_bot.middlewares.recorder",
+    "oynaiq_bot.runtime.api_server",
+    "oynaiq_bot.runtime.metrics_server",
+    "oynaiq_bot.runtime.profiler",
+)
+
+
+def test_startup_within_margin_over_aiogram() -> None:
+    profile = profile_startup()
+
+    assert profile.own * 1000 <= STARTUP_MARGIN_MS, profile.format()
+
+
+def test_optional_modules_are_not_imported() -> None:
+    profile = profile_startup(repeat=1)
+
+    assert not set(LAZY_MODULES) & set(profile.loaded), profile.format()
@@ -0,0 +1,131 @@
+"""
+Waitlist promotion, expiry and decline (:mod:`oynaiq_bot.data.waitlist`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from dataclasses import replace
+from typing import Any, List
+
+import pytest
+
+from oynaiq_bot.data.matches import (
+    MOCK_MATCHES,
+    Match,
+    add_match,
+    holds_seat,
+    release_seat,
+    take_seat,
+)
+from oynaiq_bot.data.waitlist import WAITLIST
+
+
+_ids = itertools.count(800_000)
+
+
+@pytest.fixture
+def match() -> Match:
+    """
+    A stored match of two seats, taken by users 1 and 2.
+    """
+
+    match = replace(MOCK_MATCHES[0], id=next(_ids), players_current=0, players_total=2)
+    add_match(match)
+    assert take_seat(match, 1) and take_seat(match, 2)
+    return match
+
+
+def test_released_seat_is_held_for_the_head(match: Match) -> None:
+    WAITLIST.join(match.id, 3, chat_id=3)
+    WAITLIST.join(match.id, 4, chat_id=4)
+
+    assert release_seat(match, 1)
+
+    assert WAITLIST.is_held(match.id, 3) and holds_seat(match.id, 3)
+    assert match.players_current == 2
+    assert WAITLIST.position(match.id, 4) == 1
+
+
+def test_expired_hold_passes_the_seat_on(match: Match, monkeypatch: pytest.MonkeyPatch) -> None:
+    WAITLIST.join(match.id, 3, chat_id=3)
+    WAITLIST.join(match.id, 4, chat_id=4)
+    with monkeypatch.context() as patch:
+        patch.setattr(WAITLIST, "hold_seconds", 0.0)
+        release_seat(match, 1)
+
+    WAITLIST.expire(time.time())
+
+    assert not holds_seat(match.id, 3)
+    assert WAITLIST.is_held(match.id, 4)
+    assert holds_seat(match.id, 2)
+    assert match.players_current == 2
+
+
+def test_declined_hold_passes_the_seat_on(match: Match) -> None:
+    WAITLIST.join(match.id, 3, chat_id=3)
+    WAITLIST.join(match.id, 4, chat_id=4)
+    release_seat(match, 1)
+
+    assert WAITLIST.decline(match.id, 3)
+
+    assert WAITLIST.is_held(match.id, 4)
+    assert match.players_current == 2
+    assert not WAITLIST.decline(match.id, 3)
+
+
+def test_accepted_hold_survives_its_deadline(match: Match) -> None:
+    WAITLIST.join(match.id, 3, chat_id=3)
+    release_seat(match, 1)
+
+    assert WAITLIST.accept(match.id, 3)
+    WAITLIST.expire(time.time() + WAITLIST.hold_seconds + 1)
+
+    assert holds_seat(match.id, 3)
+    assert match.players_current == 2
+
+
+def test_seated_user_cannot_join(match: Match) -> None:
+    assert WAITLIST.join(match.id, 2, chat_id=2) == 0
+    assert WAITLIST.waiting(match.id) == 0
+
+
+def test_promotion_skips_users_who_got_a_seat(match: Match) -> None:
+    release_seat(match, 2)
+    WAITLIST.join(match.id, 3, chat_id=3)
+    WAITLIST.join(match.id, 4, chat_id=4)
+    assert take_seat(match, 3)
+
+    release_seat(match, 1)
+
+    assert WAITLIST.is_held(match.id, 4)
+    assert not WAITLIST.is_held(match.id, 3)
+    assert holds_seat(match.id, 3)
+    assert match.players_current == 2
+    assert WAITLIST.waiting(match.id) == 0
+
+
+class _Bot:
+    def __init__(self) -> None:
+        self.sent: List[str] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> None:
+        self.sent.append(text)
+
+
+def test_paid_hold_is_accepted_by_the_payment(match: Match) -> None:
+    from oynaiq_bot.payments.models import Payment, PaymentState
+    from oynaiq_bot.payments.worker import settle_payment
+
+    match.deposit = 200
+    WAITLIST.join(match.id, 3, chat_id=3)
+    release_seat(match, 1)
+    payment = Payment("w1", user_id=3, chat_id=3, match_id=match.id, amount=200, created=0.0)
+
+    asyncio.run(settle_payment(_Bot(), payment, PaymentState.PAID))
+    WAITLIST.expire(time.time() + WAITLIST.hold_seconds + 1)
+
+    assert holds_seat(match.id, 3)
+    assert match.players_current == 2